@@ -0,0 +1,388 @@
+"""Time driver operations against the simulated devices.
+
+Every case runs in a new process with the driver, the simulator is served from
+this one. Robot moves are immediate, so the time is spent by the driver and
+its sessions.
+
+Run: python -m benchmarks.driver_operations --output results.json
+Compare: python -m benchmarks.driver_operations --compare old.json new.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import yaml
+
+try:
+    import resource
+except ImportError:
+    # not available on Windows, the memory usage isn't measured there
+    resource = None
+
+from simulator.device import RobotTimingModel, RomeDevice
+from simulator.servers import SSHServer, TelnetServer
+
+ROOT_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUNTIME_CONFIG_PATH = os.path.join(ROOT_PATH, "w2w_rome_runtime_config.yml")
+# matrix of the resource: (simulator matrix type, letter of the address, hosts)
+MATRICES = {
+    "A": ("AB", "A", 1),
+    "B": ("AB", "B", 1),
+    "Q": ("Q", "Q", 1),
+    "XY": ("XY", "XY", 1),
+    "Q128": ("Q128", "Q", 2),
+}
+OPERATIONS = (
+    "login",
+    "get_resource_description",
+    "map_bidi",
+    "map_clear",
+    "map_uni",
+    "map_clear_to",
+)
+METRICS = ("wall_time", "cpu_time", "round_trips", "bytes_parsed", "peak_rss_kb")
+USERNAME = "admin"
+PASSWORD = "admin"
+
+
+def median(values):
+    values = sorted(values)
+    middle = len(values) // 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+
+def get_cpu_time():
+    """User and system CPU time of the process.
+
+    :rtype: float
+    """
+    return sum(os.times()[:2])
+
+
+def get_peak_rss_kb():
+    """High-water mark of the process memory, None if it can't be measured.
+
+    :rtype: int|None
+    """
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def get_session_counters(metrics):
+    """Data sent to and received from the devices by all sessions.
+
+    :type metrics: w2w_rome.helpers.metrics.MetricsRegistry
+    :return: round trips, bytes received
+    :rtype: tuple[int, int]
+    """
+    values = {"device_round_trips": 0, "device_bytes_received": 0}
+    for counter in metrics.get_metrics()["counters"]:
+        if counter["name"] in values:
+            values[counter["name"]] += counter["value"]
+    return values["device_round_trips"], values["device_bytes_received"]
+
+
+def get_port_addresses(response_info):
+    """Addresses of the first ports of every blade.
+
+    :type response_info: cloudshell.layer_one.core.response.response_info.ResourceDescriptionResponseInfo  # noqa: E501
+    :rtype: list[list[str]]
+    """
+    chassis = response_info.resource_info_list[0]
+    ports = []
+    for _, blade in sorted(chassis.child_resources.items()):
+        blade_ports = sorted(blade.child_resources.values(), key=lambda p: p.name)
+        ports.append([port.address for port in blade_ports[:3]])
+    return ports
+
+
+def run_case(case):
+    """Run operations of the case with the driver, in the child process.
+
+    :param case: address, config_path
+    :type case: dict
+    :return: metrics of the operations
+    :rtype: dict[str, dict]
+    """
+    from cloudshell.layer_one.core.helper.runtime_configuration import (
+        RuntimeConfiguration,
+    )
+
+    from w2w_rome.driver_commands import DriverCommands
+    from w2w_rome.helpers.errors import NotSupportedError
+    from w2w_rome.helpers.metrics import get_metrics
+
+    logger = logging.getLogger("benchmark")
+    logger.addHandler(logging.NullHandler())
+    driver_commands = DriverCommands(logger, RuntimeConfiguration(case["config_path"]))
+    # counters of the sessions are collected without the export to the file
+    metrics = get_metrics()
+    metrics.enabled = True
+    address = case["address"]
+    state = {}
+
+    def login():
+        driver_commands.login(address, USERNAME, PASSWORD)
+
+    def get_resource_description():
+        state["ports"] = get_port_addresses(
+            driver_commands.get_resource_description(address)
+        )
+        blade_ports = state["ports"]
+        # X and Y ports are connected with each other
+        state["src"] = blade_ports[0][0]
+        state["dst"] = blade_ports[-1][1]
+
+    operations = {
+        "login": login,
+        "get_resource_description": get_resource_description,
+        "map_bidi": lambda: driver_commands.map_bidi(state["src"], state["dst"]),
+        "map_clear": lambda: driver_commands.map_clear([state["src"], state["dst"]]),
+        "map_uni": lambda: driver_commands.map_uni(state["src"], [state["dst"]]),
+        "map_clear_to": lambda: driver_commands.map_clear_to(
+            state["src"], [state["dst"]]
+        ),
+    }
+    results = {}
+    for name in OPERATIONS:
+        round_trips, bytes_parsed = get_session_counters(metrics)
+        cpu_start = get_cpu_time()
+        start_time = time.time()
+        try:
+            operations[name]()
+        except NotSupportedError:
+            supported = False
+        else:
+            supported = True
+        if not supported:
+            if name == "map_uni":
+                # ports are mapped for map_clear_to anyway
+                operations["map_bidi"]()
+            continue
+        wall_time = time.time() - start_time
+        cpu_time = get_cpu_time() - cpu_start
+        end_round_trips, end_bytes_parsed = get_session_counters(metrics)
+        results[name] = {
+            "wall_time": wall_time,
+            "cpu_time": cpu_time,
+            "round_trips": end_round_trips - round_trips,
+            "bytes_parsed": end_bytes_parsed - bytes_parsed,
+            # high-water mark of the process after the operation
+            "peak_rss_kb": get_peak_rss_kb(),
+        }
+    return results
+
+
+def write_runtime_config(session_type, port):
+    """Runtime config of the driver connecting to the simulator.
+
+    :rtype: str
+    """
+    with open(RUNTIME_CONFIG_PATH) as config_file:
+        config = yaml.safe_load(config_file)
+    config["CLI"]["TYPE"] = [session_type]
+    config["CLI"]["PORTS"] = {session_type: port}
+    config["STATE_ID"] = {"ENABLED": False}
+    config["TRANSCRIPT"] = {"RECORD": False}
+    config_file, config_path = tempfile.mkstemp(suffix=".yml")
+    with os.fdopen(config_file, "w") as config_file:
+        yaml.safe_dump(config, config_file)
+    return config_path
+
+
+def start_devices(matrix, blade_size, session_type):
+    """Start simulated devices of the matrix on the same port.
+
+    :rtype: list[simulator.servers.SimulatorServer]
+    """
+    matrix_type, _, num_hosts = MATRICES[matrix]
+    server_class = SSHServer if session_type == "SSH" else TelnetServer
+    servers = []
+    port = 0
+    for host_id in range(1, num_hosts + 1):
+        device = RomeDevice(
+            "127.0.0.{}".format(host_id),
+            matrix_type,
+            timing_model=RobotTimingModel(time_scale=0),
+            blade_size=blade_size,
+        )
+        server = server_class(device, port, USERNAME, PASSWORD).start()
+        port = server.port
+        servers.append(server)
+    return servers
+
+
+def benchmark_case(matrix, blade_size, session_type, repeat):
+    """Run the case in new processes and aggregate metrics.
+
+    :return: rows with median times and the largest memory usage
+    :rtype: list[dict]
+    """
+    runs = []
+    for _ in range(repeat):
+        servers = start_devices(matrix, blade_size, session_type)
+        config_path = write_runtime_config(session_type, servers[0].port)
+        hosts = ":".join(server.device.address for server in servers)
+        case = {
+            "address": "{}:{}".format(hosts, MATRICES[matrix][1]),
+            "config_path": config_path,
+        }
+        try:
+            output = subprocess.check_output(
+                [
+                    sys.executable,
+                    "-m",
+                    "benchmarks.driver_operations",
+                    "--run-case",
+                    json.dumps(case),
+                ],
+                cwd=ROOT_PATH,
+            )
+        finally:
+            os.remove(config_path)
+            for server in servers:
+                server.stop()
+                server.device.stop()
+        runs.append(json.loads(output))
+
+    rows = []
+    for operation in OPERATIONS:
+        values = [run[operation] for run in runs if operation in run]
+        if not values:
+            continue  # not supported for the matrix
+        row = {"matrix": matrix, "blade_size": blade_size, "operation": operation}
+        for metric in METRICS:
+            aggregate = max if metric == "peak_rss_kb" else median
+            metric_values = [
+                value[metric] for value in values if value[metric] is not None
+            ]
+            row[metric] = aggregate(metric_values) if metric_values else None
+        rows.append(row)
+    return rows
+
+
+def write_rows(rows):
+    sys.stdout.write(
+        "{:<6} {:>6} {:<26} {:>10} {:>10} {:>7} {:>10} {:>10}\n".format(
+            "matrix",
+            "size",
+            "operation",
+            "wall, ms",
+            "cpu, ms",
+            "trips",
+            "bytes",
+            "rss, KB",
+        )
+    )
+    for row in rows:
+        sys.stdout.write(
+            "{matrix:<6} {blade_size:>6} {operation:<26} {wall:>10.1f} {cpu:>10.1f} "
+            "{round_trips:>7} {bytes_parsed:>10} {rss:>10}\n".format(
+                wall=row["wall_time"] * 1000,
+                cpu=row["cpu_time"] * 1000,
+                rss="n/a" if row["peak_rss_kb"] is None else row["peak_rss_kb"],
+                **row
+            )
+        )
+
+
+def compare(old_path, new_path):
+    """Print changes of the metrics between two result files."""
+    with open(old_path) as old_file:
+        old_rows = {
+            (row["matrix"], row["blade_size"], row["operation"]): row
+            for row in json.load(old_file)["results"]
+        }
+    with open(new_path) as new_file:
+        new_rows = json.load(new_file)["results"]
+
+    sys.stdout.write(
+        "{:<6} {:>6} {:<26} {:>10} {:>10} {:>7} {:>10}\n".format(
+            "matrix", "size", "operation", "wall", "cpu", "trips", "bytes"
+        )
+    )
+    for row in new_rows:
+        old_row = old_rows.get((row["matrix"], row["blade_size"], row["operation"]))
+        if old_row is None:
+            continue
+        changes = []
+        for metric in ("wall_time", "cpu_time"):
+            changes.append(
+                "{:+.0%}".format(row[metric] / old_row[metric] - 1)
+                if old_row[metric]
+                else "n/a"
+            )
+        sys.stdout.write(
+            "{:<6} {:>6} {:<26} {:>10} {:>10} {:>+7} {:>+10}\n".format(
+                row["matrix"],
+                row["blade_size"],
+                row["operation"],
+                changes[0],
+                changes[1],
+                row["round_trips"] - old_row["round_trips"],
+                row["bytes_parsed"] - old_row["bytes_parsed"],
+            )
+        )
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--matrix", action="append", choices=sorted(MATRICES), help="all if not set"
+    )
+    parser.add_argument(
+        "--blade-size",
+        action="append",
+        type=int,
+        help="sub ports with logical names on every blade, 32 and 128 if not set",
+    )
+    parser.add_argument("--session", choices=("SSH", "TELNET"), default="SSH")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="JSON file for the results")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    return parser.parse_args(args)
+
+
+def main():
+    args = parse_args()
+    if args.run_case:
+        sys.stdout.write(json.dumps(run_case(json.loads(args.run_case))))
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    rows = []
+    for matrix in args.matrix or ["A", "B", "Q", "XY", "Q128"]:
+        for blade_size in args.blade_size or [32, 128]:
+            rows.extend(benchmark_case(matrix, blade_size, args.session, args.repeat))
+    write_rows(rows)
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(
+                {
+                    "meta": {
+                        "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                        "python": platform.python_version(),
+                        "session": args.session,
+                        "repeat": args.repeat,
+                    },
+                    "results": rows,
+                },
+                output_file,
+                indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare removal of log lines from the whole output with the streaming filter.
+
+Run: python -m benchmarks.log_line_filter
+"""
+import re
+import sys
+import timeit
+
+from w2w_rome.cli.log_line_filter import LogLineFilter
+
+from tests.w2w_rome.base import PORT_SHOW_MATRIX_Q128_1
+
+# the pattern that was applied to the whole output of every command
+LOG_LINES = re.compile(
+    r"\n\d+-\d+-\d+\s\d+:\d+\s"
+    r"("
+    r"(connection \w+<->\w+\scompleted\s\w+ *)"
+    r"|(connection operation [\w( )]+:[\w\[\]]+<->[\w\[\]]+ OP:\w+ *)"
+    r")\n+",
+    re.IGNORECASE,
+)
+CHUNK_SIZE = 4096
+NUMBER = 20
+
+
+def remove_logs_from_output(chunks):
+    """Previous removal, the output is joined and scanned after the command."""
+    output = ""
+    for chunk in chunks:
+        output += chunk
+    return LOG_LINES.sub("", output)
+
+
+def filter_chunks(chunks):
+    log_filter = LogLineFilter()
+    output = "".join(log_filter.feed(chunk) for chunk in chunks)
+    return output + log_filter.flush()
+
+
+def main():
+    output = PORT_SHOW_MATRIX_Q128_1
+    chunks = [output[i : i + CHUNK_SIZE] for i in range(0, len(output), CHUNK_SIZE)]
+    if remove_logs_from_output(chunks) != filter_chunks(chunks):
+        raise AssertionError("Outputs are different")
+
+    sys.stdout.write(
+        "{:>8} {:>7} {:>12} {:>12} {:>6}\n".format(
+            "size", "chunks", "regex, ms", "filter, ms", "gain"
+        )
+    )
+    regex_time = timeit.timeit(lambda: remove_logs_from_output(chunks), number=NUMBER)
+    filter_time = timeit.timeit(lambda: filter_chunks(chunks), number=NUMBER)
+    sys.stdout.write(
+        "{:>8} {:>7} {:>12.3f} {:>12.3f} {:>5.0%}\n".format(
+            len(output),
+            len(chunks),
+            regex_time / NUMBER * 1000,
+            filter_time / NUMBER * 1000,
+            1 - filter_time / regex_time,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Compare robot travel of the disconnect orders on the simulated move model.
+
+Run: python -m benchmarks.move_order
+"""
+import random
+import sys
+
+from w2w_rome.helpers.move_order import RobotMoveModel, order_by_robot_travel
+
+NUM_PORTS = 130
+NUM_RUNS = 20
+
+
+def get_reservation(rnd, num_pairs):
+    """Random bidi connections of the logical ports.
+
+    :rtype: set[tuple[str, str]]
+    """
+    port_ids = rnd.sample(range(1, NUM_PORTS + 1), num_pairs * 2)
+    return {
+        ("A{}".format(src_id), "A{}".format(dst_id))
+        for src_id, dst_id in zip(port_ids[::2], port_ids[1::2])
+    }
+
+
+def get_logical_moves(pair):
+    src_id, dst_id = (int(name[1:]) for name in pair)
+    return [(src_id, dst_id), (dst_id, src_id)]
+
+
+def get_sub_port_moves(pair):
+    e_name, w_name = pair
+    return [(int(e_name[1:]), int(w_name[1:]))]
+
+
+def run_scenario(model, num_pairs):
+    """Simulated time of the current and the optimized orders.
+
+    :rtype: dict[str, float]
+    """
+    rnd = random.Random(num_pairs)
+    results = {"bidi": [0, 0], "uni": [0, 0]}
+    for _ in range(NUM_RUNS):
+        reservation = get_reservation(rnd, num_pairs)
+        # bidi disconnects were sent in the order of the set
+        bidi_current = [get_logical_moves(pair) for pair in reservation]
+        bidi_ordered = [
+            get_logical_moves(pair)
+            for pair in order_by_robot_travel(sorted(reservation), get_logical_moves)
+        ]
+        # uni disconnects were sorted by sub port names
+        sub_port_pairs = [
+            ("E{}".format(e_id), "W{}".format(w_id))
+            for pair in reservation
+            for e_id, w_id in get_logical_moves(pair)
+        ]
+        uni_current = [get_sub_port_moves(pair) for pair in sorted(sub_port_pairs)]
+        uni_ordered = [
+            get_sub_port_moves(pair)
+            for pair in order_by_robot_travel(
+                sorted(sub_port_pairs, key=get_sub_port_moves), get_sub_port_moves
+            )
+        ]
+        results["bidi"][0] += model.total_time(bidi_current) / NUM_RUNS
+        results["bidi"][1] += model.total_time(bidi_ordered) / NUM_RUNS
+        results["uni"][0] += model.total_time(uni_current) / NUM_RUNS
+        results["uni"][1] += model.total_time(uni_ordered) / NUM_RUNS
+    return results
+
+
+def main():
+    model = RobotMoveModel()
+    sys.stdout.write(
+        "{:>6} {:>5} {:>12} {:>12} {:>6}\n".format(
+            "pairs", "mode", "current, s", "ordered, s", "gain"
+        )
+    )
+    for num_pairs in (4, 16, 65):
+        results = run_scenario(model, num_pairs)
+        for mode in ("bidi", "uni"):
+            current, ordered = results[mode]
+            sys.stdout.write(
+                "{:>6} {:>5} {:>12.1f} {:>12.1f} {:>5.0%}\n".format(
+                    num_pairs, mode, current, ordered, 1 - ordered / current
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Compare checks of the pending connections with the previous per pair search.
+
+Run: python -m benchmarks.pending_connections
+"""
+import re
+import sys
+import timeit
+
+from w2w_rome.command_actions.mapping_actions import parse_pending_connections
+
+HEADER = """ROME[TECH]# connection show pending
+Connection execution status: delayed due to command in process
+
+Command in process:
+connect, ports: A1-A2, status: in process with payload
+
+======= ========= ========= ================== ======= ===================
+Request Port1     Port2     Command            Source  User
+======= ========= ========= ================== ======= ===================
+"""
+NUMBER = 200
+
+
+def get_output(num_pending):
+    rows = "".join(
+        "{:<8}A{:<9}A{:<9}connect            CLI     admin\n".format(
+            700 + i, 2 * i + 3, 2 * i + 4
+        )
+        for i in range(num_pending)
+    )
+    return HEADER + rows + "\nROME[TECH]# "
+
+
+def in_pending_with_search(output, ports):
+    """Previous check, builds and runs two patterns for every pair."""
+    for src, dst in ports:
+        match = re.search(r"ports:\s+{}-{}\D".format(src, dst), output, re.I)
+        match = match or re.search(
+            r"\w+\s+{}\s+{}\s+\w+".format(src, dst), output, re.I
+        )
+        if match:
+            return True
+    return False
+
+
+def in_pending_with_set(output, ports):
+    pending_pairs = parse_pending_connections(output)
+    return any((src.upper(), dst.upper()) in pending_pairs for src, dst in ports)
+
+
+def main():
+    sys.stdout.write(
+        "{:>8} {:>6} {:>12} {:>12} {:>6}\n".format(
+            "pending", "pairs", "search, ms", "set, ms", "gain"
+        )
+    )
+    for num_pending in (0, 10, 60):
+        output = get_output(num_pending)
+        # the last pairs are checked on every poll when nothing is pending
+        ports = [("B{}".format(i), "B{}".format(i + 1)) for i in range(1, 64, 2)]
+        for pairs in (ports, [("a3", "a4")]):
+            if in_pending_with_search(output, pairs) != in_pending_with_set(
+                output, pairs
+            ):
+                raise AssertionError("Checks return different results")
+
+        search_time = timeit.timeit(
+            lambda: in_pending_with_search(output, ports), number=NUMBER
+        )
+        set_time = timeit.timeit(
+            lambda: in_pending_with_set(output, ports), number=NUMBER
+        )
+        sys.stdout.write(
+            "{:>8} {:>6} {:>12.3f} {:>12.3f} {:>5.0%}\n".format(
+                num_pending,
+                len(ports),
+                search_time / NUMBER * 1000,
+                set_time / NUMBER * 1000,
+                1 - set_time / search_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Compare parsing of the "port show" output with the previous parser.
+
+Run: python -m benchmarks.port_show_parser
+"""
+import sys
+import timeit
+
+from w2w_rome.helpers.port_table_parser import (
+    PORT_SHOW_V1,
+    PORT_SHOW_V2,
+    PortShowParser,
+)
+
+from tests.w2w_rome.base import (
+    PORT_SHOW_MATRIX_A,
+    PORT_SHOW_MATRIX_A_Q,
+    PORT_SHOW_MATRIX_Q128_1,
+    PORT_SHOW_MATRIX_Q_BROKEN_TABLE_OUTPUT,
+    PORT_SHOW_MATRIX_XY,
+)
+
+FIXTURES = (
+    ("132 ports", PORT_SHOW_MATRIX_A),
+    ("132 ports v2", PORT_SHOW_MATRIX_A_Q),
+    ("XY", PORT_SHOW_MATRIX_XY),
+    ("Q128", PORT_SHOW_MATRIX_Q128_1),
+    ("broken Q", PORT_SHOW_MATRIX_Q_BROKEN_TABLE_OUTPUT),
+)
+NUMBER = 200
+
+
+def parse_with_full_scan(output):
+    """Previous parser, scans whole output with every format."""
+    matches = list(PORT_SHOW_V1.row.finditer(output))
+    if not matches:
+        matches = list(PORT_SHOW_V2.row.finditer(output))
+    return [match.groupdict() for match in matches]
+
+
+def main():
+    parser = PortShowParser()
+    sys.stdout.write(
+        "{:>14} {:>5} {:>14} {:>14} {:>6}\n".format(
+            "fixture", "rows", "full scan, ms", "by lines, ms", "gain"
+        )
+    )
+    for name, output in FIXTURES:
+        rows = parser.parse(output, name)
+        if rows != parse_with_full_scan(output):
+            raise AssertionError("Parsers return different rows for " + name)
+
+        full_scan_time = timeit.timeit(
+            lambda: parse_with_full_scan(output), number=NUMBER
+        )
+        by_lines_time = timeit.timeit(lambda: parser.parse(output, name), number=NUMBER)
+        sys.stdout.write(
+            "{:>14} {:>5} {:>14.3f} {:>14.3f} {:>5.0%}\n".format(
+                name,
+                len(rows),
+                full_scan_time / NUMBER * 1000,
+                by_lines_time / NUMBER * 1000,
+                1 - by_lines_time / full_scan_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Compare prompt matching of the regex with the line based prompt detector.
+
+Run: python -m benchmarks.prompt_detector
+"""
+import re
+import sys
+import timeit
+
+from w2w_rome.cli.prompt_detector import PromptDetector
+from w2w_rome.cli.rome_command_modes import DefaultCommandMode
+
+LOG_LINE = (
+    "08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E{0}[1AE{0}]<->W{1}[1AW{1}] "
+    "OP:connect\n"
+)
+NUMBER = 20
+
+
+def get_output(num_log_lines, with_prompt):
+    output = "connection create Q1 to Q2\n"
+    output += "OK - request added to pending queue (Q1-Q2)\n"
+    output += "ROME[TECH]# 08-06-2019 09:01 CONNECTING...\n"
+    output += "".join(LOG_LINE.format(i, i + 1) for i in range(num_log_lines))
+    if with_prompt:
+        output += "08-06-2019 09:01 Connection Q1<->Q2 completed successfully\n"
+    else:
+        # the expect loop checks the buffer while the next log line comes
+        output += "08-06-2019 09:01 CONNECTION OPERATION SUCC"
+    return output
+
+
+def main():
+    prompt_regex = re.compile(DefaultCommandMode.PROMPT, re.DOTALL)
+    detector = PromptDetector()
+    sys.stdout.write(
+        "{:>6} {:>7} {:>12} {:>12} {:>6}\n".format(
+            "lines", "prompt", "regex, ms", "detector, ms", "gain"
+        )
+    )
+    for num_log_lines in (4, 16, 64):
+        for with_prompt in (True, False):
+            output = get_output(num_log_lines, with_prompt)
+            if bool(prompt_regex.search(output)) != detector.match(output):
+                raise AssertionError("Matches are different")
+
+            regex_time = timeit.timeit(
+                lambda: prompt_regex.search(output), number=NUMBER
+            )
+            detector_time = timeit.timeit(lambda: detector.match(output), number=NUMBER)
+            sys.stdout.write(
+                "{:>6} {:>7} {:>12.3f} {:>12.3f} {:>5.0%}\n".format(
+                    num_log_lines,
+                    str(with_prompt),
+                    regex_time / NUMBER * 1000,
+                    detector_time / NUMBER * 1000,
+                    1 - detector_time / regex_time,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,13 @@ import sys
 from datetime import datetime
 
 from cloudshell.core.logger.qs_logger import get_qs_logger
-from cloudshell.layer_one.core.command_executor import CommandExecutor
 from cloudshell.layer_one.core.driver_listener import DriverListener
 from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
 from cloudshell.layer_one.core.helper.xml_logger import XMLLogger
 
+from w2w_rome.command_executor import RomeCommandExecutor
+from w2w_rome.helpers.profiling import ProfilingCommandExecutor
+
 
 class Main(object):
     def __init__(self, file_path=None, port=1024, log_path=None):
@@ -52,8 +54,19 @@ class Main(object):
         )
         driver_instance = driver_commands.DriverCommands(command_logger, runtime_config)
 
-        # Creating command executor instance
-        command_executor = CommandExecutor(driver_instance, command_logger)
+        # Creating command executor instance, profiling commands if it's enabled
+        profiling_mode = runtime_config.read_key("PROFILING.MODE", None)
+        if profiling_mode:
+            command_executor = ProfilingCommandExecutor(
+                driver_instance,
+                command_logger,
+                os.path.join(self._log_path, driver_name, "Profiles"),
+                profiling_mode,
+                runtime_config.read_key("PROFILING.SAMPLE_WINDOW", 300),
+                runtime_config.read_key("PROFILING.SAMPLE_INTERVAL", 0.01),
+            )
+        else:
+            command_executor = RomeCommandExecutor(driver_instance, command_logger)
 
         # Creating listener instance
         server = DriverListener(command_executor, xml_logger, command_logger)
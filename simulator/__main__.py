@@ -0,0 +1,97 @@
+"""Run the Rome device simulator on the local addresses.
+
+Run: python -m simulator --matrix Q128 --address 127.0.0.1 --address 127.0.0.2
+Set CLI.PORTS of the driver's runtime config to the simulator ports.
+"""
+import argparse
+import sys
+import time
+
+from simulator.device import RobotTimingModel, RomeDevice
+from simulator.matrix import BLADE_SIZE, MATRIX_TYPES
+from simulator.servers import SSHServer, TelnetServer
+
+
+def parse_args(args=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--address",
+        action="append",
+        help="address of the device, a few for the dual host Q128 matrix",
+    )
+    parser.add_argument("--matrix", choices=MATRIX_TYPES, default="AB")
+    parser.add_argument("--ssh-port", type=int, default=2222)
+    parser.add_argument("--telnet-port", type=int, default=2323)
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin")
+    parser.add_argument("--prompt", default="ROME[OPER]#")
+    parser.add_argument("--table-format", choices=("v1", "v2"), default="v1")
+    parser.add_argument(
+        "--blade-size",
+        type=int,
+        default=BLADE_SIZE,
+        help="sub ports with logical names on every blade",
+    )
+    parser.add_argument(
+        "--operation-time",
+        type=float,
+        default=2.0,
+        help="seconds to plug or unplug a fiber",
+    )
+    parser.add_argument(
+        "--time-scale",
+        type=float,
+        default=1.0,
+        help="multiplies robot move durations, 0 makes moves immediate",
+    )
+    return parser.parse_args(args)
+
+
+def start_simulator(args):
+    """Start devices and their servers.
+
+    :return: started servers
+    :rtype: list[simulator.servers.SimulatorServer]
+    """
+    servers = []
+    for address in args.address or ["127.0.0.1"]:
+        device = RomeDevice(
+            address,
+            args.matrix,
+            timing_model=RobotTimingModel(args.operation_time, args.time_scale),
+            prompt=args.prompt,
+            table_format=args.table_format,
+            blade_size=args.blade_size,
+        )
+        if args.ssh_port is not None:
+            servers.append(
+                SSHServer(device, args.ssh_port, args.username, args.password).start()
+            )
+        if args.telnet_port is not None:
+            servers.append(
+                TelnetServer(
+                    device, args.telnet_port, args.username, args.password
+                ).start()
+            )
+    return servers
+
+
+def main():
+    args = parse_args()
+    servers = start_simulator(args)
+    for server in servers:
+        sys.stdout.write(
+            "{} {} on {}:{}\n".format(
+                args.matrix, type(server).__name__, server.device.address, server.port
+            )
+        )
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        for server in servers:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
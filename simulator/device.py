@@ -0,0 +1,310 @@
+import itertools
+import re
+import time
+from collections import deque
+from threading import Condition, Lock, Thread
+
+from simulator.matrix import (
+    BLADE_SIZE,
+    E_SPARE_PORTS,
+    MATRIX_Q128,
+    W_SPARE_PORTS,
+    RomeMatrix,
+    SimulatorError,
+)
+
+from w2w_rome.helpers.move_order import RobotMoveModel
+
+SHOW_BOARD = """CURR SW VERSION  creationDate(Feb 21 2019, 19:51:00)
+ROME STATUS      adminStatus(enabled) operStatus(enabled) alarmState(Cleared)
+ROME STATE       OPER
+ROME NAME        ROME
+ACTIVE UNITS     1
+ROME TYPE        {model}
+RTOS             VxWorks (6.8)
+BOARD            ver(LCU-100) rev(3) S/N({serial_number})
+MATRIX SIZE:
+                 Matrix A: Male/West 1..{west_size}, Female/East 1..{east_size}
+                 Matrix B: Male/West 1..{west_size}, Female/East 1..{east_size}
+
+IP               IP addr({address}) subnet(255.255.255.0/0xffffff00)
+ACTIVE SW BANK   1
+ACTIVE SW VER    {sw_version}
+UP TIME          {up_time}
+CONNECTIONS      connection execution is enabled
+OPERATION COUNT  {operation_count}
+TIME SOURCE      MANUAL
+AUTHENTICATION   local
+CONNECTION TYPE  ssh and telnet
+"""
+PENDING_TABLE = """
+======= ========= ========= ================== ======= ===================
+Request Port1     Port2     Command            Source  User
+======= ========= ========= ================== ======= ===================
+"""
+COMMANDS = (
+    (re.compile(r"^$"), "_empty"),
+    (re.compile(r"^show\s+board$", re.I), "_show_board"),
+    (re.compile(r"^port\s+show$", re.I), "_port_show"),
+    (re.compile(r"^port\s+show\s+(?P<port>\w+)$", re.I), "_port_show"),
+    (
+        re.compile(r"^connection\s+create\s+(?P<src>\w+)\s+to\s+(?P<dst>\w+)$", re.I),
+        "_connection_create",
+    ),
+    (
+        re.compile(
+            r"^connection\s+disconnect\s+(?P<src>\w+)\s+from\s+(?P<dst>\w+)$", re.I
+        ),
+        "_connection_disconnect",
+    ),
+    (re.compile(r"^connection\s+show\s+pending$", re.I), "_connection_show_pending"),
+)
+
+
+def log_time():
+    return time.strftime("%m-%d-%Y %H:%M")
+
+
+class RobotTimingModel(object):
+    """Duration of the robot moves.
+
+    The robot travels to the E sub port and then to the W sub port, like in the
+    driver's move model, and spends time to plug or unplug the fiber.
+    """
+
+    def __init__(self, operation_time=2.0, time_scale=1.0, move_model=None):
+        """Robot timing model.
+
+        :param operation_time: seconds to plug or unplug the fiber
+        :type operation_time: float
+        :param time_scale: multiplies all durations, 0 makes moves immediate
+        :type time_scale: float
+        :type move_model: RobotMoveModel
+        """
+        self.operation_time = operation_time
+        self.time_scale = time_scale
+        self.move_model = move_model or RobotMoveModel()
+        self.position = RobotMoveModel.START_POSITION
+
+    def move_time(self, e_port, w_port):
+        """Time of the move, the robot stays at the W sub port after it.
+
+        :type e_port: simulator.matrix.SubPort
+        :type w_port: simulator.matrix.SubPort
+        :rtype: float
+        """
+        travel_time, self.position = self.move_model.moves_time(
+            self.position, [(e_port.port_id, w_port.port_id)]
+        )
+        return (travel_time + self.operation_time) * self.time_scale
+
+
+class ConnectionRequest(object):
+    __slots__ = ("request_id", "command", "src", "dst", "moves", "session")
+
+    def __init__(self, request_id, command, src, dst, moves, session):
+        self.request_id = request_id
+        self.command = command
+        self.src = src
+        self.dst = dst
+        self.moves = moves
+        self.session = session
+
+    def pending_row(self):
+        return "{:<8}{:<10}{:<10}{:<19}{:<8}{}".format(
+            self.request_id, self.src, self.dst, self.command, "CLI", "admin"
+        )
+
+
+class RomeDevice(object):
+    """State of the simulated device and the commands it answers.
+
+    Connection requests are added to the pending queue and the robot thread
+    executes them one by one, writing log lines into the session of the request.
+    """
+
+    def __init__(
+        self,
+        address="127.0.0.1",
+        matrix_type="AB",
+        serial_number=None,
+        timing_model=None,
+        prompt="ROME[OPER]#",
+        table_format="v1",
+        blade_size=BLADE_SIZE,
+    ):
+        """Rome device.
+
+        :type address: str
+        :type matrix_type: str
+        :type serial_number: str
+        :type timing_model: RobotTimingModel
+        :type prompt: str
+        :param table_format: format of the "port show" rows, v1 or v2
+        :type table_format: str
+        :param blade_size: sub ports with logical names on every blade
+        :type blade_size: int
+        """
+        self.address = address
+        self.matrix = RomeMatrix(matrix_type, blade_size)
+        self.serial_number = serial_number or "9727-4733-{:04d}".format(
+            sum(int(part) for part in re.findall(r"\d+", address)) % 10000
+        )
+        self.timing_model = timing_model or RobotTimingModel()
+        self.prompt = prompt
+        self.table_format = table_format
+        self.operation_count = 0
+        self.start_time = time.time()
+
+        self._lock = Lock()
+        self._queue_condition = Condition(self._lock)
+        self._pending = deque()  # <ConnectionRequest>
+        self._in_process = None  # <ConnectionRequest>
+        self._request_ids = itertools.count(700)
+        self._stopped = False
+        self._robot = Thread(target=self._run_robot, name="Robot-{}".format(address))
+        self._robot.daemon = True
+        self._robot.start()
+
+    def stop(self):
+        with self._queue_condition:
+            self._stopped = True
+            self._queue_condition.notify_all()
+
+    def wait_idle(self, timeout=None):
+        """Wait till all connection requests are executed.
+
+        :type timeout: float
+        :rtype: bool
+        """
+        end_time = None if timeout is None else time.time() + timeout
+        with self._queue_condition:
+            while self._pending or self._in_process:
+                time_left = None if end_time is None else end_time - time.time()
+                if time_left is not None and time_left <= 0:
+                    return False
+                self._queue_condition.wait(time_left)
+        return True
+
+    def execute(self, command, session=None):
+        """Answer the command line.
+
+        :type command: str
+        :param session: receives log lines of the connection requests
+        :type session: simulator.servers.ShellSession
+        :return: output without the prompt
+        :rtype: str
+        """
+        command = command.strip()
+        for pattern, method_name in COMMANDS:
+            match = pattern.match(command)
+            if match:
+                try:
+                    return getattr(self, method_name)(session, **match.groupdict())
+                except SimulatorError as e:
+                    return "ERROR - {}\n".format(e)
+        return "ERROR - Unknown command: {}\n".format(command)
+
+    def _empty(self, session):
+        return ""
+
+    def _show_board(self, session):
+        up_time = int(time.time() - self.start_time)
+        return SHOW_BOARD.format(
+            model="ROME500" if self.matrix.matrix_type != MATRIX_Q128 else "ROME1000",
+            serial_number=self.serial_number,
+            address=self.address,
+            west_size=self.matrix.blade_size + W_SPARE_PORTS,
+            east_size=self.matrix.blade_size + E_SPARE_PORTS,
+            sw_version="1.10.2.10",
+            up_time="0 days,0 hours,{} minutes and {} seconds".format(
+                up_time // 60, up_time % 60
+            ),
+            operation_count=self.operation_count,
+        )
+
+    def _port_show(self, session, port=None):
+        with self._lock:
+            return self.matrix.port_table(port, self.table_format) + "\n"
+
+    def _add_request(self, command, src, dst, session):
+        moves = self.matrix.get_moves(src, dst)
+        with self._queue_condition:
+            request = ConnectionRequest(
+                next(self._request_ids), command, src, dst, moves, session
+            )
+            self._pending.append(request)
+            self._queue_condition.notify_all()
+        return "OK - request added to pending queue ({}-{})\n".format(src, dst)
+
+    def _connection_create(self, session, src, dst):
+        return self._add_request("connect", src, dst, session)
+
+    def _connection_disconnect(self, session, src, dst):
+        return self._add_request("disconnect", src, dst, session)
+
+    def _connection_show_pending(self, session):
+        with self._lock:
+            in_process = self._in_process
+            pending = list(self._pending)
+        if in_process is None:
+            output = "Connection execution status: enabled\n\nno request in process\n"
+        else:
+            output = (
+                "Connection execution status: delayed due to command in process\n\n"
+                "Command in process:\n"
+                "{0.command}, ports: {0.src}-{0.dst}, status: in process with payload\n"
+            ).format(in_process)
+        output += PENDING_TABLE
+        output += "".join(request.pending_row() + "\n" for request in pending)
+        return output + "\n"
+
+    @staticmethod
+    def _log(request, message):
+        if request.session is not None:
+            request.session.write_log("{} {}\n".format(log_time(), message))
+
+    def _run_robot(self):
+        while True:
+            with self._queue_condition:
+                while not self._pending and not self._stopped:
+                    self._queue_condition.wait()
+                if self._stopped:
+                    return
+                request = self._in_process = self._pending.popleft()
+
+            self._execute_request(request)
+
+            with self._queue_condition:
+                self._in_process = None
+                self._queue_condition.notify_all()
+
+    def _execute_request(self, request):
+        is_connect = request.command == "connect"
+        self._log(request, "CONNECTING..." if is_connect else "DISCONNECTING...")
+        succeeded = True
+        for e_port, w_port in request.moves:
+            time.sleep(self.timing_model.move_time(e_port, w_port))
+            with self._lock:
+                if is_connect:
+                    status = self.matrix.connect(e_port, w_port)
+                else:
+                    status = self.matrix.disconnect(e_port, w_port)
+                if status == "SUCCEEDED":
+                    self.operation_count += 1
+            succeeded = succeeded and not status.startswith("FAILED")
+            self._log(
+                request,
+                "CONNECTION OPERATION {}:{}<->{} OP:{}".format(
+                    status, e_port.row_name, w_port.row_name, request.command
+                ),
+            )
+        if is_connect:
+            self._log(
+                request,
+                "Connection {}<->{} completed {}".format(
+                    request.src,
+                    request.dst,
+                    "successfully" if succeeded else "unsuccessfully",
+                ),
+            )
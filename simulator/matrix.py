@@ -0,0 +1,296 @@
+import re
+
+from w2w_rome.helpers.errors import BaseRomeException
+
+MATRIX_AB = "AB"
+MATRIX_Q = "Q"
+MATRIX_XY = "XY"
+MATRIX_Q128 = "Q128"
+MATRIX_TYPES = (MATRIX_AB, MATRIX_Q, MATRIX_XY, MATRIX_Q128)
+
+BLADES = ("A", "B")
+# sub ports with logical names on every blade and spare ones after them
+BLADE_SIZE = 128
+E_SPARE_PORTS = 2
+W_SPARE_PORTS = 4
+
+ROW_FORMAT = "{:<17}{:<13}{:<12}{:<14}{:<8}{:<15}{:<8}"
+TABLE_SEPARATOR = (
+    "================ ============ =========== ============= ======= "
+    "============== ========"
+)
+TABLE_HEADER = ROW_FORMAT.format(
+    "Port",
+    "Admin Status",
+    "Oper Status",
+    "Port Status",
+    "Counter",
+    "ConnectedTo",
+    "Logical",
+).rstrip()
+SUB_PORT_NAME_PATTERN = re.compile(r"^(?P<direction>[EW])(?P<port_id>\d+)$", re.I)
+
+
+class SimulatorError(BaseRomeException):
+    """Request that the device rejects."""
+
+
+def get_logical_name(
+    matrix_type, direction, blade, blade_port_id, blade_size=BLADE_SIZE
+):
+    """Logical name of the sub port in the matrix.
+
+    :type matrix_type: str
+    :param direction: E or W
+    :type direction: str
+    :param blade: A or B
+    :type blade: str
+    :param blade_port_id: ID of the sub port on the blade
+    :type blade_port_id: int
+    :param blade_size: sub ports with logical names on the blade
+    :type blade_size: int
+    :rtype: str|None
+    """
+    if blade_port_id > blade_size:
+        return None
+    if matrix_type == MATRIX_AB:
+        port_id = blade_port_id if blade == "A" else blade_size + blade_port_id
+        return "{}{}".format(blade, port_id)
+    if matrix_type == MATRIX_Q:
+        # two neighbour sub ports on both blades
+        return "Q{}".format((blade_port_id + 1) // 2)
+    if matrix_type == MATRIX_Q128:
+        return "P{}".format(blade_port_id)
+    # Y1 - E1 on the blade A and W1 on the blade B, X1 - W1 on A and E1 on B
+    letter = "Y" if (direction == "E") == (blade == "A") else "X"
+    return "{}{}".format(letter, blade_port_id)
+
+
+class SubPort(object):
+    """Sub port of the matrix with the fiber connection."""
+
+    __slots__ = (
+        "direction",
+        "blade",
+        "blade_port_id",
+        "blade_size",
+        "logical_name",
+        "connected_to",
+        "counter",
+    )
+
+    def __init__(
+        self, direction, blade, blade_port_id, logical_name, blade_size=BLADE_SIZE
+    ):
+        self.direction = direction
+        self.blade = blade
+        self.blade_port_id = blade_port_id
+        self.blade_size = blade_size
+        self.logical_name = logical_name
+        self.connected_to = None  # <SubPort>
+        self.counter = 0
+
+    def __repr__(self):
+        return "<SubPort {}>".format(self.row_name)
+
+    @property
+    def port_id(self):
+        """ID of the sub port in the device, None for spare sub ports.
+
+        :rtype: int|None
+        """
+        if self.blade_port_id > self.blade_size:
+            return None
+        return self.blade_port_id + BLADES.index(self.blade) * self.blade_size
+
+    @property
+    def name(self):
+        return "{}{}".format(self.direction, self.port_id)  # E12
+
+    @property
+    def full_name(self):
+        return "1{}{}{}".format(self.blade, self.direction, self.blade_port_id)
+
+    @property
+    def row_name(self):
+        if self.port_id is None:
+            return self.full_name  # 1AE129
+        return "{}[{}]".format(self.name, self.full_name)  # E12[1AE12]
+
+    def table_row(self, table_format="v1"):
+        """Row of the "port show" table.
+
+        :param table_format: v1 - E1[1AE1] ... A1, v2 - 1AE1 ... E1,A1
+        :type table_format: str
+        :rtype: str
+        """
+        logical_name = self.logical_name or ""
+        port_name = self.row_name
+        if table_format == "v2":
+            port_name = self.full_name
+            if self.logical_name:
+                logical_name = "{},{}".format(self.name, self.logical_name)
+        return ROW_FORMAT.format(
+            port_name,
+            "Unlocked",
+            "Enabled",
+            "Connected" if self.connected_to else "Disconnected",
+            self.counter,
+            self.connected_to.row_name if self.connected_to else "",
+            logical_name,
+        )
+
+
+class RomeMatrix(object):
+    """Sub ports of both blades of the device and connections between them."""
+
+    def __init__(self, matrix_type=MATRIX_AB, blade_size=BLADE_SIZE):
+        """Rome matrix.
+
+        :param matrix_type: AB, Q, XY or Q128, defines logical names of sub ports
+        :type matrix_type: str
+        :param blade_size: sub ports with logical names on every blade
+        :type blade_size: int
+        """
+        if matrix_type not in MATRIX_TYPES:
+            raise ValueError("Unknown matrix type {}".format(matrix_type))
+        self.matrix_type = matrix_type
+        self.blade_size = blade_size
+        self.sub_ports = []
+        self._sub_ports_map = {}  # <E12>: <SubPort>
+        self._logical_ports = {}  # <A12>: [<SubPort>]
+        for direction, spare_ports in (("E", E_SPARE_PORTS), ("W", W_SPARE_PORTS)):
+            for blade in BLADES:
+                for blade_port_id in range(1, blade_size + spare_ports + 1):
+                    self._add_sub_port(direction, blade, blade_port_id)
+
+    def _add_sub_port(self, direction, blade, blade_port_id):
+        logical_name = get_logical_name(
+            self.matrix_type, direction, blade, blade_port_id, self.blade_size
+        )
+        sub_port = SubPort(
+            direction, blade, blade_port_id, logical_name, self.blade_size
+        )
+        self.sub_ports.append(sub_port)
+        if sub_port.port_id is not None:
+            self._sub_ports_map[sub_port.name] = sub_port
+            self._logical_ports.setdefault(logical_name, []).append(sub_port)
+
+    @property
+    def logical_names(self):
+        return sorted(self._logical_ports, key=lambda name: (name[0], int(name[1:])))
+
+    def get_sub_port(self, name):
+        """Get sub port by name, e.g. E12.
+
+        :type name: str
+        :rtype: SubPort
+        """
+        try:
+            return self._sub_ports_map[name.upper()]
+        except KeyError:
+            raise SimulatorError("Port {} does not exist".format(name))
+
+    def get_logical_sub_ports(self, logical_name):
+        """Sub ports of the logical port.
+
+        :type logical_name: str
+        :rtype: list[SubPort]
+        """
+        try:
+            return self._logical_ports[logical_name.upper()]
+        except KeyError:
+            raise SimulatorError("Port {} does not exist".format(logical_name))
+
+    def _logical_moves(self, src_name, dst_name):
+        """E sub ports of the source to W sub ports of the destination.
+
+        Sub ports are connected on the same blade, in the reverse order of the
+        W sub ports like the device does for Q ports.
+        """
+        src_ports = self.get_logical_sub_ports(src_name)
+        dst_ports = self.get_logical_sub_ports(dst_name)
+        moves = []
+        for blade in BLADES:
+            e_ports = [p for p in src_ports if p.direction == "E" and p.blade == blade]
+            w_ports = [p for p in dst_ports if p.direction == "W" and p.blade == blade]
+            if len(e_ports) != len(w_ports):
+                raise SimulatorError("Ports are not of the same matrix")
+            moves.extend(zip(e_ports, reversed(w_ports)))
+        return moves
+
+    def get_moves(self, src_name, dst_name):
+        """Sub port connections that the request makes or removes.
+
+        Logical ports are connected in both directions, sub ports in one.
+        :param src_name: logical or sub port name, e.g. A1 or E1
+        :type src_name: str
+        :type dst_name: str
+        :rtype: list[tuple[SubPort, SubPort]]
+        """
+        if SUB_PORT_NAME_PATTERN.match(src_name) and SUB_PORT_NAME_PATTERN.match(
+            dst_name
+        ):
+            e_port = self.get_sub_port(src_name)
+            w_port = self.get_sub_port(dst_name)
+            if (e_port.direction, w_port.direction) != ("E", "W"):
+                raise SimulatorError("Connection should be from E to W port")
+            if e_port.blade != w_port.blade:
+                raise SimulatorError("Ports are not of the same matrix")
+            return [(e_port, w_port)]
+
+        if src_name.upper() == dst_name.upper():
+            raise SimulatorError("Cannot connect port to itself")
+        return self._logical_moves(src_name, dst_name) + self._logical_moves(
+            dst_name, src_name
+        )
+
+    @staticmethod
+    def connect(e_port, w_port):
+        """Connect sub ports.
+
+        :type e_port: SubPort
+        :type w_port: SubPort
+        :return: status of the operation
+        :rtype: str
+        """
+        if e_port.connected_to is w_port:
+            return "SKIPPED(already done)"
+        if e_port.connected_to or w_port.connected_to:
+            return "FAILED(port is busy)"
+        e_port.connected_to = w_port
+        w_port.connected_to = e_port
+        e_port.counter += 1
+        w_port.counter += 1
+        return "SUCCEEDED"
+
+    @staticmethod
+    def disconnect(e_port, w_port):
+        """Disconnect sub ports.
+
+        :type e_port: SubPort
+        :type w_port: SubPort
+        :return: status of the operation
+        :rtype: str
+        """
+        if e_port.connected_to is not w_port:
+            return "SKIPPED(already done)"
+        e_port.connected_to = None
+        w_port.connected_to = None
+        return "SUCCEEDED"
+
+    def port_table(self, logical_name=None, table_format="v1"):
+        """Output of "port show" or "port show <logical name>".
+
+        :type logical_name: str
+        :type table_format: str
+        :rtype: str
+        """
+        if logical_name is None:
+            sub_ports = self.sub_ports
+        else:
+            logical_ports = set(self.get_logical_sub_ports(logical_name))
+            sub_ports = [port for port in self.sub_ports if port in logical_ports]
+        rows = [TABLE_SEPARATOR, TABLE_HEADER, TABLE_SEPARATOR]
+        rows.extend(port.table_row(table_format) for port in sub_ports)
+        return "\n".join(rows) + "\n"
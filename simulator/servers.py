@@ -0,0 +1,279 @@
+import socket
+import threading
+
+import paramiko
+
+# telnet commands that are skipped in the input
+IAC = "\xff"
+SB = "\xfa"
+SE = "\xf0"
+
+
+class ShellSession(object):
+    """Command line session to the simulated device.
+
+    Lines are echoed back like the device's terminal does, the answer is
+    followed by the prompt. Log lines of the connection requests can be
+    written at any time. Lines are sent with CRLF like the terminal of the
+    device does.
+    """
+
+    BANNER = "\nWelcome to ROME\n\n"
+
+    def __init__(self, device, channel):
+        """Shell session.
+
+        :type device: simulator.device.RomeDevice
+        :param channel: socket or SSH channel
+        """
+        self._device = device
+        self._channel = channel
+        # log lines of the request are written after the answer to it
+        self._write_lock = threading.RLock()
+        self._closed = False
+        self._input = ""
+        self._last_char = ""
+
+    def write(self, data):
+        with self._write_lock:
+            if self._closed:
+                return
+            try:
+                self._channel.sendall(data.replace("\n", "\r\n"))
+            except (socket.error, EOFError):
+                self._closed = True
+
+    def write_log(self, data):
+        self.write(data)
+
+    def _prompt(self):
+        return "{} ".format(self._device.prompt)
+
+    def _filter_input(self, data):
+        return data
+
+    def _read_lines(self):
+        while not self._closed:
+            while "\n" in self._input:
+                line, self._input = self._input.split("\n", 1)
+                yield line
+            try:
+                data = self._channel.recv(4096)
+            except (socket.error, EOFError):
+                return
+            if not data:
+                return
+            data = self._filter_input(data).replace("\x00", "")
+            if not data:
+                continue
+            if self._last_char == "\r" and data[0] == "\n":
+                # the end of the line is split between packets
+                data = data[1:]
+            self._last_char = data[-1:]
+            data = data.replace("\r\n", "\n").replace("\r", "\n")
+            self._input += data
+
+    def run(self):
+        self.write(self.BANNER + self._prompt())
+        for line in self._read_lines():
+            if line.strip().lower() in ("exit", "logout"):
+                break
+            with self._write_lock:
+                output = self._device.execute(line, self)
+                if output and not output.endswith("\n"):
+                    output += "\n"
+                self.write("{}\n{}{}".format(line, output, self._prompt()))
+        self.close()
+
+    def close(self):
+        with self._write_lock:
+            self._closed = True
+        try:
+            self._channel.close()
+        except (socket.error, EOFError):
+            pass
+
+
+class TelnetShellSession(ShellSession):
+    """Session with the telnet login and without option negotiation."""
+
+    def __init__(self, device, channel, username, password):
+        super(TelnetShellSession, self).__init__(device, channel)
+        self._username = username
+        self._password = password
+        self._in_command = False
+
+    def _filter_input(self, data):
+        output = []
+        i = 0
+        while i < len(data):
+            char = data[i]
+            if self._in_command:
+                if char == SE:
+                    self._in_command = False
+                i += 1
+            elif char == IAC and i + 1 < len(data):
+                command = data[i + 1]
+                if command == SB:
+                    self._in_command = True
+                    i += 2
+                elif command == IAC:
+                    output.append(IAC)
+                    i += 2
+                else:
+                    # WILL, WONT, DO, DONT have an option byte
+                    i += 3 if "\xfb" <= command <= "\xfe" else 2
+            else:
+                output.append(char)
+                i += 1
+        return "".join(output)
+
+    def _login(self):
+        lines = self._read_lines()
+        self.write("Username: ")
+        username = next(lines, None)
+        self.write("Password: ")
+        password = next(lines, None)
+        if (username, password) != (self._username, self._password):
+            self.write("\nInvalid username or password\n")
+            return False
+        return True
+
+    def run(self):
+        if self._login():
+            super(TelnetShellSession, self).run()
+        else:
+            self.close()
+
+
+class _SSHServerInterface(paramiko.ServerInterface):
+    def __init__(self, username, password):
+        self._username = username
+        self._password = password
+        self.shell_requested = threading.Event()
+
+    def check_auth_password(self, username, password):
+        if (username, password) == (self._username, self._password):
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_pty_request(self, *args):
+        return True
+
+    def check_channel_shell_request(self, channel):
+        self.shell_requested.set()
+        return True
+
+
+class SimulatorServer(object):
+    """TCP server that runs a shell session for every client in a thread."""
+
+    def __init__(self, device, port, username="admin", password="admin"):
+        """Simulator server.
+
+        :type device: simulator.device.RomeDevice
+        :param port: 0 to take a free port
+        :type port: int
+        :type username: str
+        :type password: str
+        """
+        self.device = device
+        self.username = username
+        self.password = password
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((device.address, port))
+        self._socket.listen(16)
+        self.port = self._socket.getsockname()[1]
+        self._thread = None
+        self._clients = {}  # <thread>: <client socket>
+        self._clients_lock = threading.Lock()
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._serve, name="{}-{}".format(type(self).__name__, self.port)
+        )
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=5):
+        """Stop accepting clients and close connected ones.
+
+        :param timeout: seconds to wait for every thread to finish
+        :type timeout: float
+        """
+        for sock in [self._socket] + self._get_clients():
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except socket.error:
+                pass
+            sock.close()
+        for thread in [self._thread] + list(self._clients):
+            if thread is not None:
+                thread.join(timeout)
+
+    def _get_clients(self):
+        with self._clients_lock:
+            return list(self._clients.values())
+
+    def _serve(self):
+        while True:
+            try:
+                client, _ = self._socket.accept()
+            except socket.error:
+                return
+            thread = threading.Thread(target=self._run_client, args=(client,))
+            thread.daemon = True
+            with self._clients_lock:
+                self._clients[thread] = client
+            thread.start()
+
+    def _run_client(self, client):
+        try:
+            self._handle_client(client)
+        finally:
+            with self._clients_lock:
+                self._clients.pop(threading.current_thread(), None)
+
+    def _handle_client(self, client):
+        raise NotImplementedError
+
+
+class TelnetServer(SimulatorServer):
+    def _handle_client(self, client):
+        TelnetShellSession(self.device, client, self.username, self.password).run()
+
+
+class SSHServer(SimulatorServer):
+    def __init__(self, device, port, username="admin", password="admin", host_key=None):
+        """SSH server.
+
+        :param host_key: generated if not set
+        :type host_key: paramiko.PKey
+        """
+        super(SSHServer, self).__init__(device, port, username, password)
+        self.host_key = host_key or paramiko.RSAKey.generate(2048)
+
+    def _handle_client(self, client):
+        transport = paramiko.Transport(client)
+        transport.add_server_key(self.host_key)
+        server = _SSHServerInterface(self.username, self.password)
+        try:
+            transport.start_server(server=server)
+        except (paramiko.SSHException, EOFError, socket.error):
+            return
+        channel = transport.accept(30)
+        if channel is None or not server.shell_requested.wait(30):
+            transport.close()
+            return
+        ShellSession(self.device, channel).run()
+        transport.close()
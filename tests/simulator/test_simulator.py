@@ -0,0 +1,158 @@
+import socket
+import telnetlib
+import time
+from unittest import TestCase
+
+import pytest
+from mock import MagicMock
+
+from simulator.device import RobotTimingModel, RomeDevice
+from simulator.matrix import RomeMatrix
+from simulator.servers import TelnetServer
+
+from w2w_rome.helpers.port_entity import PortTable
+
+
+@pytest.mark.parametrize(
+    ("matrix_type", "blade_size", "num_ports", "port_name"),
+    (
+        ("AB", 128, 256, "B129"),
+        ("Q", 128, 64, "Q64"),
+        ("XY", 128, 256, "X128"),
+        ("Q128", 128, 128, "Q1"),
+        ("AB", 16, 32, "B17"),
+        ("Q", 16, 8, "Q8"),
+    ),
+)
+def test_port_table_is_parsed_by_driver(matrix_type, blade_size, num_ports, port_name):
+    for table_format in ("v1", "v2"):
+        output = RomeMatrix(matrix_type, blade_size).port_table(
+            table_format=table_format
+        )
+        port_table = PortTable.from_output(output, "127.0.0.1")
+
+        assert num_ports == len(port_table.logical_ports)
+        assert port_table[port_name] is not None
+
+
+class TestRomeDevice(TestCase):
+    def setUp(self):
+        self.device = RomeDevice(
+            matrix_type="Q", timing_model=RobotTimingModel(time_scale=0)
+        )
+        self.logs = []
+        self.session = MagicMock(write_log=self.logs.append)
+
+    def tearDown(self):
+        self.device.stop()
+
+    def test_connect_logical_ports(self):
+        output = self.device.execute("connection create Q3 to Q4", self.session)
+
+        self.assertEqual("OK - request added to pending queue (Q3-Q4)\n", output)
+        self.assertTrue(self.device.wait_idle(5))
+        self.assertEqual(10, len(self.logs))
+        self.assertIn(
+            "CONNECTION OPERATION SUCCEEDED:E5[1AE5]<->W8[1AW8] OP:connect",
+            self.logs[1],
+        )
+        self.assertIn("Connection Q3<->Q4 completed successfully", self.logs[-1])
+        self.assertEqual(8, self.device.operation_count)
+
+        port_table = PortTable.from_output(
+            self.device.execute("port show Q3"), "127.0.0.1"
+        )
+        self.assertEqual(
+            {"W8", "W7", "W136", "W135", "E8", "E7", "E136", "E135"},
+            {
+                sub_port.connected_to_sub_port_name
+                for rome_port in port_table["Q3"]
+                for sub_port in (rome_port.e_port, rome_port.w_port)
+            },
+        )
+
+    def test_connect_busy_port(self):
+        self.device.execute("connection create E5 to W8", self.session)
+        self.device.execute("connection create E5 to W7", self.session)
+        self.device.wait_idle(5)
+
+        self.assertIn("FAILED(port is busy)", self.logs[-2])
+        self.assertIn("Connection E5<->W7 completed unsuccessfully", self.logs[-1])
+
+        self.device.execute("connection disconnect E5 from W8", self.session)
+        self.device.wait_idle(5)
+
+        self.assertIn("SUCCEEDED:E5[1AE5]<->W8[1AW8] OP:disconnect", self.logs[-1])
+
+    def test_pending_connections(self):
+        device = RomeDevice(timing_model=RobotTimingModel(time_scale=1))
+        try:
+            device.execute("connection create A1 to A2")
+            device.execute("connection create A3 to A4")
+            # the robot takes the first request in a moment
+            end_time = time.time() + 5
+            output = device.execute("connection show pending")
+            while "in process with" not in output and time.time() < end_time:
+                time.sleep(0.01)
+                output = device.execute("connection show pending")
+        finally:
+            device.stop()
+
+        self.assertIn("connect, ports: A1-A2, status: in process", output)
+        self.assertIn("701     A3        A4        connect", output)
+
+    def test_errors(self):
+        self.assertEqual(
+            "ERROR - Port Q65 does not exist\n",
+            self.device.execute("connection create Q1 to Q65"),
+        )
+        self.assertEqual(
+            "ERROR - Unknown command: port delete\n",
+            self.device.execute("port delete"),
+        )
+        device = RomeDevice(matrix_type="AB")
+        try:
+            self.assertEqual(
+                "ERROR - Ports are not of the same matrix\n",
+                device.execute("connection create A1 to B130"),
+            )
+        finally:
+            device.stop()
+
+
+class TestTelnetServer(TestCase):
+    def test_telnet_session(self):
+        device = RomeDevice(timing_model=RobotTimingModel(time_scale=0))
+        server = TelnetServer(device, 0, "user", "password").start()
+        client = telnetlib.Telnet("127.0.0.1", server.port, timeout=5)
+        try:
+            client.read_until("Username: ")
+            client.write("user\r")
+            client.read_until("Password: ")
+            client.write("password\r")
+            client.read_until("ROME[OPER]# ")
+            client.write("connection create A1 to A2\r")
+            output = client.read_until("completed successfully\r\n", 5)
+        finally:
+            client.close()
+            server.stop()
+            device.stop()
+
+        self.assertIn("OK - request added to pending queue (A1-A2)\r\n", output)
+        self.assertIn("Connection A1<->A2 completed successfully\r\n", output)
+
+    def test_wrong_password(self):
+        device = RomeDevice(timing_model=RobotTimingModel(time_scale=0))
+        server = TelnetServer(device, 0, "user", "password").start()
+        client = telnetlib.Telnet("127.0.0.1", server.port, timeout=5)
+        try:
+            client.write("user\rwrong\r")
+            output = client.read_all()
+        except socket.error:
+            output = ""
+        finally:
+            client.close()
+            server.stop()
+            device.stop()
+
+        self.assertIn("Invalid username or password", output)
@@ -52,7 +52,7 @@ class TestMain(TestCase):
     @patch("main.RuntimeConfiguration")
     @patch("main.XMLLogger")
     @patch("main.get_qs_logger")
-    @patch("main.CommandExecutor")
+    @patch("main.RomeCommandExecutor")
     @patch("main.DriverListener")
     def test_run_driver(
         self,
@@ -70,7 +70,7 @@ class TestMain(TestCase):
         os_mod.path.join.side_effect = [config_path, xml_log_path]
         runtime_config_instance = Mock()
         log_level = Mock()
-        runtime_config_instance.read_key.return_value = log_level
+        runtime_config_instance.read_key.side_effect = [log_level, None]
         runtime_configuration_class.return_value = runtime_config_instance
         xml_logger_inst = Mock()
         xml_logger_class.return_value = xml_logger_inst
@@ -108,8 +108,8 @@ class TestMain(TestCase):
             log_file_prefix=driver_name + "_commands",
             log_category="COMMANDS",
         )
-        runtime_config_instance.read_key.assert_called_once_with(
-            "LOGGING.LEVEL", "INFO"
+        runtime_config_instance.read_key.assert_has_calls(
+            [call("LOGGING.LEVEL", "INFO"), call("PROFILING.MODE", None)]
         )
         command_logger.setLevel.assert_called_once_with(log_level)
         importlib_mod.import_module.assert_called_once_with(
@@ -125,3 +125,48 @@ class TestMain(TestCase):
             command_executor_inst, xml_logger_inst, command_logger
         )
         server_inst.start_listening.assert_called_once_with(port=self._port)
+
+    @patch("main.os")
+    @patch("main.importlib")
+    @patch("main.RuntimeConfiguration")
+    @patch("main.XMLLogger")
+    @patch("main.get_qs_logger")
+    @patch("main.RomeCommandExecutor")
+    @patch("main.ProfilingCommandExecutor")
+    @patch("main.DriverListener")
+    def test_run_driver_profiling(
+        self,
+        driver_listener_class,
+        profiling_command_executor_class,
+        command_executor_class,
+        get_qs_logger_mod,
+        xml_logger_class,
+        runtime_configuration_class,
+        importlib_mod,
+        os_mod,
+    ):
+        profile_dir = Mock()
+        os_mod.path.join.side_effect = [Mock(), Mock(), profile_dir]
+        runtime_config_instance = Mock()
+        runtime_config_instance.read_key.side_effect = ["INFO", "REQUEST", 60, 0.1]
+        runtime_configuration_class.return_value = runtime_config_instance
+        command_logger = Mock()
+        get_qs_logger_mod.return_value = command_logger
+        driver_commands_inst = Mock()
+        importlib_mod.import_module.return_value = Mock(
+            DriverCommands=Mock(return_value=driver_commands_inst)
+        )
+        command_executor_inst = Mock()
+        profiling_command_executor_class.return_value = command_executor_inst
+        driver_name = "test driver"
+
+        self._instance.run_driver(driver_name)
+
+        os_mod.path.join.assert_called_with(self._log_path, driver_name, "Profiles")
+        profiling_command_executor_class.assert_called_once_with(
+            driver_commands_inst, command_logger, profile_dir, "REQUEST", 60, 0.1
+        )
+        command_executor_class.assert_not_called()
+        driver_listener_class.assert_called_once_with(
+            command_executor_inst, xml_logger_class.return_value, command_logger
+        )
@@ -1,8 +1,10 @@
 import os
 import re
+import time
 from collections import deque
 from unittest import TestCase
 
+from cloudshell.cli.session.session_exceptions import SessionReadTimeout
 from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
 from mock import MagicMock, patch
 
@@ -6475,6 +6477,11 @@ class CliEmulator(object):
             raise ValueError("Not executed commands: \n{}".format(commands))
 
 
+def receive_nothing(timeout, logger):
+    time.sleep(timeout)
+    raise SessionReadTimeout()
+
+
 def create_patched_sessions(send_line_func_map, receive_all_func_map):
     def wrapped(host, *args, **kwargs):
         session = RomeSSHSession(host, *args, **kwargs)
@@ -6482,8 +6489,17 @@ def create_patched_sessions(send_line_func_map, receive_all_func_map):
         session.send_line = MagicMock(
             name=name.format("send_line"), side_effect=send_line_func_map[host]
         )
+
+        def receive_all(timeout, logger):
+            data = receive_all_func_map[host](timeout, logger)
+            return session._on_data_received(data)
+
         session._receive_all = MagicMock(
-            name=name.format("_receive_all"), side_effect=receive_all_func_map[host]
+            name=name.format("_receive_all"), side_effect=receive_all
+        )
+        # nothing is sent by the device between commands
+        session._receive_from_device = MagicMock(
+            name=name.format("_receive_from_device"), side_effect=receive_nothing
         )
         return session
 
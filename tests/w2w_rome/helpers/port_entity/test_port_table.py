@@ -0,0 +1,124 @@
+import pytest
+
+from w2w_rome.helpers.errors import ConnectedToDifferentPortsError
+from w2w_rome.helpers.port_entity import PortTable, SubPort
+
+PORT_SHOW = """
+E1[1AE1]         Unlocked     Enabled     Connected     2       W2[1AW2]       A1
+E2[1AE2]         Unlocked     Enabled     Connected     2       W1[1AW1]       A2
+E3[1AE3]         Unlocked     Enabled     Disconnected  0                      A3
+W1[1AW1]         Unlocked     Enabled     Connected     2       E2[1AE2]       A1
+W2[1AW2]         Unlocked     Enabled     Connected     2       E1[1AE1]       A2
+W3[1AW3]         Unlocked     Enabled     Disconnected  0                      A3
+"""
+PORT_SHOW_Q = """
+E1[1AE1]         Unlocked     Enabled     Connected     2       W3[1AW3]       Q1
+E2[1AE2]         Unlocked     Enabled     Connected     2       W5[1AW5]       Q1
+E3[1AE3]         Unlocked     Enabled     Disconnected  0                      Q2
+E4[1AE4]         Unlocked     Enabled     Disconnected  0                      Q2
+E5[1AE5]         Unlocked     Enabled     Disconnected  0                      Q3
+E6[1AE6]         Unlocked     Enabled     Disconnected  0                      Q3
+W1[1AW1]         Unlocked     Enabled     Disconnected  0                      Q1
+W2[1AW2]         Unlocked     Enabled     Disconnected  0                      Q1
+W3[1AW3]         Unlocked     Enabled     Connected     2       E1[1AE1]       Q2
+W4[1AW4]         Unlocked     Enabled     Disconnected  0                      Q2
+W5[1AW5]         Unlocked     Enabled     Connected     2       E2[1AE2]       Q3
+W6[1AW6]         Unlocked     Enabled     Disconnected  0                      Q3
+"""
+
+
+def test_connected_ports():
+    port_table = PortTable.from_output(PORT_SHOW, "host")
+    a1, a2, a3 = port_table["A1"], port_table["A2"], port_table["A3"]
+
+    assert port_table.get_connected_to_port(a1) is a2
+    assert port_table.get_connected_from_port(a1) is a2
+    assert port_table.get_connected_to_port(a3) is None
+    assert port_table.get_connected_from_port(a3) is None
+    assert port_table.is_connected(a1, a2, bidi=True)
+    assert port_table.get_connected_port_pairs(["A1"]) == {(a1, a2)}
+
+
+def test_partially_mapped_port_raises_on_request():
+    port_table = PortTable.from_output(PORT_SHOW_Q, "host")
+
+    with pytest.raises(ConnectedToDifferentPortsError):
+        port_table.get_connected_to_port(port_table["Q1"])
+    assert port_table.get_connected_to_port(port_table["Q2"]) is None
+
+
+def test_connections_are_updated_with_sub_ports():
+    port_table = PortTable.from_output(PORT_SHOW, "host")
+    a1, a3 = port_table["A1"], port_table["A3"]
+
+    port_table.update_sub_ports(
+        SubPort.parse_sub_ports(
+            PORT_SHOW.replace(
+                "Connected     2       W2[1AW2]", "Connected     2       W3[1AW3]"
+            ),  # noqa: E501
+            "host",
+        )[:1]
+    )
+
+    assert port_table.get_connected_to_port(a1) is a3
+
+
+def test_connected_sub_ports():
+    port_table = PortTable.from_output(PORT_SHOW, "host")
+    a1, a2 = port_table["A1"], port_table["A2"]
+
+    [(e_port, w_port)] = port_table.get_connected_sub_ports(a1, a2)
+
+    assert e_port.sub_port_name == "E1"
+    assert w_port.sub_port_name == "W2"
+    assert port_table.get_connected_sub_ports(a1, port_table["A3"]) == set()
+
+
+def test_connected_sub_ports_are_updated_with_sub_ports():
+    port_table = PortTable.from_output(PORT_SHOW, "host")
+    a1, a2, a3 = port_table["A1"], port_table["A2"], port_table["A3"]
+
+    port_table.update_sub_ports(
+        SubPort.parse_sub_ports(
+            PORT_SHOW.replace(
+                "Connected     2       W2[1AW2]", "Connected     2       W3[1AW3]"
+            ),  # noqa: E501
+            "host",
+        )[:1]
+    )
+
+    assert port_table.get_connected_sub_ports(a1, a2) == set()
+    [(e_port, w_port)] = port_table.get_connected_sub_ports(a1, a3)
+    assert w_port.sub_port_name == "W3"
+
+
+def test_merge_port_tables():
+    port_tables = [
+        PortTable.from_output(PORT_SHOW, "host1"),
+        PortTable.from_output(PORT_SHOW, "host2"),
+        PortTable.from_output(PORT_SHOW, "host3"),
+    ]
+
+    port_table = PortTable.merge(port_tables)
+
+    a1 = port_table["A1"]
+    assert len(a1.rome_ports) == 3
+    assert {rome_port.port_resource for rome_port in a1} == {
+        "host1",
+        "host2",
+        "host3",
+    }
+    # sub ports are not copied
+    sub_port = port_tables[0]["A1"].e_sub_ports[0]
+    assert any(sub_port is e_port for e_port in a1.e_sub_ports)
+    assert port_table.get_connected_to_port(a1) is port_table["A2"]
+
+
+def test_merge_port_tables_with_different_ports():
+    port_tables = [
+        PortTable.from_output(PORT_SHOW, "host1"),
+        PortTable.from_output(PORT_SHOW_Q, "host2"),
+    ]
+
+    with pytest.raises(ValueError):
+        PortTable.merge(port_tables)
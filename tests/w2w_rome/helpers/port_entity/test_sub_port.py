@@ -176,3 +176,28 @@ def test_sub_port_x(line):
     assert port.logical == "X2"
     assert port.port_name == "X2"
     assert port.original_logical_name == port.logical
+
+
+def test_sub_ports_order_by_port_id():
+    lines = (
+        "W2[1AW2]         Unlocked     Enabled     Connected  2       E1[1AE1]       A2",
+        "E10[1AE10]       Unlocked     Enabled     Disconnected  0                   A10",
+        "E9[1AE9]         Unlocked     Enabled     Disconnected  0                   A9",
+    )
+    ports = SubPort.parse_sub_ports("\n".join(lines), "")
+
+    assert [port.sub_port_name for port in sorted(ports)] == ["E9", "E10", "W2"]
+    assert ports[1].sub_port_number == 10
+    assert ports[1] == SubPort.parse_sub_ports(lines[1], "")[0]
+    assert ports[1] != ports[2]
+
+
+def test_sub_port_has_no_dict():
+    line = (
+        "E1[1AE1]         Unlocked     Enabled     Connected  2       W2[1AW2]       A1"
+    )
+    port = SubPort.parse_sub_ports(line, "")[0]
+
+    assert not hasattr(port, "__dict__")
+    with pytest.raises(AttributeError):
+        port.unknown_attribute = True
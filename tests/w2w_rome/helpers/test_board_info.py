@@ -0,0 +1,47 @@
+from mock import patch
+
+from w2w_rome.helpers.board_info import BoardInfo, BoardInfoCache
+
+from tests.w2w_rome.base import SHOW_BOARD
+
+HOST = "192.168.122.10"
+
+
+def test_parse_show_board():
+    board_info = BoardInfo.from_output(SHOW_BOARD)
+
+    assert board_info.serial_number == "9727-4733-2222"
+    assert board_info.model_name == "ROME500"
+    assert board_info.sw_version == "1.10.2.10"
+    assert board_info.operation_count == "7766"
+    assert board_info.matrix_sizes == {"A": (132, 130), "B": (132, 130)}
+
+
+def test_parse_empty_output():
+    board_info = BoardInfo.from_output("")
+
+    assert board_info.serial_number is None
+    assert board_info.model_name == "Rome"
+    assert board_info.matrix_sizes == {}
+
+
+@patch("w2w_rome.helpers.board_info.time.time")
+def test_cache_expires(time_mock):
+    time_mock.return_value = 100
+    cache = BoardInfoCache(max_age=60)
+    board_info = BoardInfo.from_output(SHOW_BOARD)
+    cache.put(HOST, board_info)
+
+    time_mock.return_value = 150
+    assert cache.get(HOST) is board_info
+    time_mock.return_value = 161
+    assert cache.get(HOST) is None
+
+
+def test_cache_invalidate():
+    cache = BoardInfoCache()
+    cache.put(HOST, BoardInfo.from_output(SHOW_BOARD))
+
+    cache.invalidate(HOST)
+
+    assert cache.get(HOST) is None
@@ -0,0 +1,92 @@
+import json
+import os
+import shutil
+import tempfile
+
+import pytest
+from mock import MagicMock, patch
+
+from w2w_rome.helpers.metrics import MetricsExporter, MetricsRegistry
+
+from tests.w2w_rome.base import BaseRomeTestCase, CliEmulator
+
+
+def test_timers_and_counters():
+    registry = MetricsRegistry()
+    with registry.timer("cli_command", host="host", command="port show"):
+        pass
+    with pytest.raises(ValueError):
+        with registry.timer("cli_command", host="host", command="port show"):
+            raise ValueError()
+    registry.increment("device_bytes_received", 10, host="host")
+    registry.increment("device_bytes_received", 5, host="host")
+
+    metrics = registry.get_metrics()
+
+    timer = metrics["timers"][0]
+    assert (timer["name"], timer["host"], timer["command"]) == (
+        "cli_command",
+        "host",
+        "port show",
+    )
+    assert (timer["count"], timer["errors"]) == (2, 1)
+    assert timer["time_max"] >= 0
+    assert metrics["counters"] == [
+        {"name": "device_bytes_received", "host": "host", "value": 15}
+    ]
+
+
+def test_disabled_registry_collects_nothing():
+    registry = MetricsRegistry(enabled=False)
+    with registry.timer("cli_command"):
+        registry.increment("device_round_trips")
+
+    assert registry.get_metrics() == {"timers": [], "counters": []}
+
+
+def test_exporter_writes_json_lines():
+    tmp_dir = tempfile.mkdtemp()
+    file_path = os.path.join(tmp_dir, "w2w_rome_metrics.jsonl")
+    registry = MetricsRegistry()
+    registry.increment("pending_polls", host="host")
+    executor = MagicMock(get_metrics=MagicMock(return_value={"queue_depth": 0}))
+    try:
+        exporter = MetricsExporter(registry, file_path, MagicMock())
+        with patch("w2w_rome.helpers.metrics.get_executor", return_value=executor):
+            exporter.write()
+            exporter.write()
+
+        with open(file_path) as metrics_file:
+            lines = [json.loads(line) for line in metrics_file]
+    finally:
+        shutil.rmtree(tmp_dir)
+
+    assert len(lines) == 2
+    assert lines[0]["counters"] == [
+        {"name": "pending_polls", "host": "host", "value": 1}
+    ]
+    assert "queue_depth" in lines[0]["threads"]
+
+
+@patch("cloudshell.cli.session.ssh_session.paramiko", MagicMock())
+class TestDriverMetrics(BaseRomeTestCase):
+    def test_login_is_measured(self):
+        host = "192.168.122.10"
+        emu = CliEmulator()
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+        registry = MetricsRegistry()
+
+        with patch("w2w_rome.helpers.metrics._metrics", registry):
+            self.driver_commands.login("{}:A".format(host), "user", "password")
+
+        emu.check_calls()
+        metrics = registry.get_metrics()
+        timers = {(timer["name"], timer["command"]) for timer in metrics["timers"]}
+        assert ("driver_command", "login") in timers
+        assert ("cli_command", "show board") in timers
+        counters = {
+            (counter["name"], counter["host"]): counter["value"]
+            for counter in metrics["counters"]
+        }
+        assert counters[("device_bytes_received", host)] > 0
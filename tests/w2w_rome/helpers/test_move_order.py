@@ -0,0 +1,39 @@
+import pytest
+
+from w2w_rome.helpers.move_order import RobotMoveModel, order_by_robot_travel
+
+
+def get_moves(pair):
+    return [pair]
+
+
+def test_travel_time():
+    model = RobotMoveModel(port_travel_time=0.1)
+
+    assert model.travel_time(1, 11) == pytest.approx(1)
+    assert model.travel_time(11, 1) == pytest.approx(1)
+
+
+def test_total_time():
+    model = RobotMoveModel(port_travel_time=0.1)
+
+    # E1 -> W4, W4 -> E2 -> W3
+    assert model.total_time([[(1, 4)], [(2, 3)]]) == pytest.approx(0.6)
+
+
+def test_order_by_robot_travel():
+    pairs = [(1, 4), (129, 132), (130, 131), (2, 3), (3, 2), (4, 1)]
+
+    ordered = order_by_robot_travel(pairs, get_moves)
+
+    assert ordered == [(1, 4), (4, 1), (2, 3), (3, 2), (129, 132), (130, 131)]
+    model = RobotMoveModel()
+    assert model.total_time(map(get_moves, ordered)) < model.total_time(
+        map(get_moves, pairs)
+    )
+
+
+def test_order_keeps_order_of_equal_items():
+    pairs = [(5, 5), (3, 3), (5, 5)]
+
+    assert order_by_robot_travel(pairs, get_moves) == [(3, 3), (5, 5), (5, 5)]
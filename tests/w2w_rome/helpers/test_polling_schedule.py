@@ -0,0 +1,58 @@
+import pytest
+
+from w2w_rome.helpers.polling_schedule import AdaptivePollingSchedule
+
+HOST = "192.168.122.10"
+
+
+def learn(schedule, move_times, blade_letter="A", num_ports=2):
+    for move_time in move_times:
+        schedule.add_operation(HOST, blade_letter, move_time * num_ports, num_ports)
+
+
+def test_check_delay_without_statistics():
+    schedule = AdaptivePollingSchedule()
+    learn(schedule, [10, 10])
+
+    assert schedule.get_delay(HOST, "A", 0, 2, 3) == 3
+    assert schedule.get_delay(HOST, "B", 0, 2, 3) == 3
+
+
+def test_check_rarely_before_expected_completion():
+    schedule = AdaptivePollingSchedule()
+    learn(schedule, [10, 10, 10])
+    # expected 20sec, window starts at 16sec
+
+    assert schedule.get_delay(HOST, "A", 0, 2, 3) == pytest.approx(8)
+    assert schedule.get_delay(HOST, "A", 8, 2, 3) == pytest.approx(4)
+    assert schedule.get_delay(HOST, "A", 12, 2, 3) == pytest.approx(4)
+
+
+def test_check_densely_near_expected_completion():
+    schedule = AdaptivePollingSchedule()
+    learn(schedule, [10, 10, 10])
+
+    assert schedule.get_delay(HOST, "A", 17, 2, 3) == pytest.approx(1)
+    assert schedule.get_delay(HOST, "A", 17, 2, 0.5) == pytest.approx(0.5)
+    assert schedule.get_delay(HOST, "A", 25, 2, 3) == 3
+
+
+def test_expected_time_depends_on_num_ports():
+    schedule = AdaptivePollingSchedule()
+    learn(schedule, [10, 10, 10])
+
+    # expected 40sec, window starts at 32sec
+    assert schedule.get_delay(HOST, "A", 0, 4, 3) == pytest.approx(16)
+
+
+def test_get_statistics():
+    schedule = AdaptivePollingSchedule()
+    learn(schedule, [8, 10, 12])
+
+    stats = schedule.get_statistics()
+
+    assert list(stats) == ["{}/A".format(HOST)]
+    assert stats["{}/A".format(HOST)]["count"] == 3
+    assert stats["{}/A".format(HOST)]["mean"] == pytest.approx(10)
+    assert stats["{}/A".format(HOST)]["min"] == pytest.approx(8)
+    assert stats["{}/A".format(HOST)]["max"] == pytest.approx(12)
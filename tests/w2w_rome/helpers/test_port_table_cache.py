@@ -0,0 +1,66 @@
+from mock import MagicMock, patch
+
+from w2w_rome.command_actions.system_actions import SystemActions
+from w2w_rome.helpers.port_table_cache import PortTableCache
+
+from tests.w2w_rome.base import PORT_SHOW_MATRIX_A, SHOW_BOARD
+
+
+def test_get_port_table():
+    cache = PortTableCache()
+    cache.put("192.168.122.10", "7766", "port show output")
+
+    assert cache.get("192.168.122.10", "7766") == "port show output"
+    assert cache.get("192.168.122.10", "7767") is None
+    assert cache.get("192.168.122.11", "7766") is None
+    assert cache.get("192.168.122.10", None) is None
+
+
+def test_do_not_save_without_operation_count():
+    cache = PortTableCache()
+    cache.put("192.168.122.10", None, "port show output")
+
+    assert cache.get("192.168.122.10", None) is None
+
+
+def test_invalidate_host():
+    cache = PortTableCache()
+    cache.put("192.168.122.10", "7766", "first port show output")
+    cache.put("192.168.122.11", "7766", "second port show output")
+
+    cache.invalidate("192.168.122.10")
+
+    assert cache.get("192.168.122.10", "7766") is None
+    assert cache.get("192.168.122.11", "7766") == "second port show output"
+
+
+def test_invalidate_all_hosts():
+    cache = PortTableCache()
+    cache.put("192.168.122.10", "7766", "first port show output")
+    cache.put("192.168.122.11", "7766", "second port show output")
+
+    cache.invalidate()
+
+    assert cache.get("192.168.122.10", "7766") is None
+    assert cache.get("192.168.122.11", "7766") is None
+
+
+def test_cached_port_table_is_not_shared():
+    cli_service = MagicMock()
+    cli_service.session.host = "192.168.122.10"
+    system_actions = SystemActions([cli_service], MagicMock(), PortTableCache())
+
+    with patch(
+        "w2w_rome.command_actions.system_actions.CommandTemplateExecutor"
+    ) as executor_class:
+        executor_class.return_value.execute_command.side_effect = [
+            SHOW_BOARD,
+            PORT_SHOW_MATRIX_A,
+            SHOW_BOARD,
+        ]
+        first_port_table = system_actions.get_port_table()
+        second_port_table = system_actions.get_port_table()
+
+    assert first_port_table is not second_port_table
+    assert first_port_table["A1"] is not second_port_table["A1"]
+    assert executor_class.return_value.execute_command.call_count == 3
@@ -0,0 +1,87 @@
+import re
+
+import pytest
+
+from w2w_rome.helpers.port_table_parser import (
+    PORT_SHOW_V1,
+    PORT_SHOW_V2,
+    PortShowParser,
+)
+
+from tests.w2w_rome.base import (
+    PORT_SHOW_MATRIX_A,
+    PORT_SHOW_MATRIX_A_Q,
+    PORT_SHOW_MATRIX_Q128_1,
+    PORT_SHOW_MATRIX_Q_BROKEN_TABLE_OUTPUT,
+    PORT_SHOW_MATRIX_XY,
+)
+
+V1_ROWS = """E1[1AE1]         Unlocked     Enabled     Connected  2       W2[1AW2]       A1
+E2[1AE2]         Unlocked     Enabled     Disconnected  0                   A2
+"""
+V2_ROWS = """1AE1             Unlocked     Enabled     Connected  17      W2[1AW2]      E1,A1
+1AE2             Unlocked     Enabled     Disconnected  0                   E2,A2
+"""
+
+
+@pytest.mark.parametrize(
+    "output",
+    (
+        PORT_SHOW_MATRIX_A,
+        PORT_SHOW_MATRIX_A_Q,
+        PORT_SHOW_MATRIX_Q128_1,
+        PORT_SHOW_MATRIX_Q_BROKEN_TABLE_OUTPUT,
+        PORT_SHOW_MATRIX_XY,
+    ),
+)
+def test_same_rows_as_full_scan(output):
+    expected_rows = [match.groupdict() for match in PORT_SHOW_V1.row.finditer(output)]
+    expected_rows = expected_rows or [
+        match.groupdict() for match in PORT_SHOW_V2.row.finditer(output)
+    ]
+
+    assert PortShowParser().parse(output, "") == expected_rows
+
+
+def test_format_is_detected_per_host():
+    parser = PortShowParser()
+
+    assert len(parser.parse(V1_ROWS, "host1")) == 2
+    assert len(parser.parse(V2_ROWS, "host2")) == 2
+    assert parser._get_formats("host1")[0] is PORT_SHOW_V1
+    assert parser._get_formats("host2")[0] is PORT_SHOW_V2
+    # firmware of the host is changed
+    assert len(parser.parse(V2_ROWS, "host1")) == 2
+    assert parser._get_formats("host1")[0] is PORT_SHOW_V2
+
+
+def test_row_split_by_log_line():
+    output = """E1[1AE1]         Unlocked     Enabled     Connected  2
+02-05-2020 13:05 Connection P1<->P2 completed successfully
+
+                 W2[1AW2]       A1
+E2[1AE2]         Unlocked     Enabled     Disconnected  0                   A2
+"""
+    rows = PortShowParser().parse(output, "")
+
+    assert [row["logical_name"] for row in rows] == ["A2"]
+
+
+def test_row_split_into_lines():
+    output = """E1[1AE1]         Unlocked     Enabled
+
+     Connected  2       W2[1AW2]       A1
+E2[1AE2]         Unlocked     Enabled     Disconnected  0                   A2
+"""
+    rows = PortShowParser().parse(output, "")
+
+    assert [row["logical_name"] for row in rows] == ["A1", "A2"]
+    assert rows[0]["conn_to_port_id"] == "2"
+
+
+def test_a_few_rows_in_line():
+    output = re.sub(r"A1\n", "A1     ", V1_ROWS)
+
+    rows = PortShowParser().parse(output, "")
+
+    assert [row["logical_name"] for row in rows] == ["A1", "A2"]
@@ -0,0 +1,105 @@
+import os
+import pstats
+import shutil
+import tempfile
+import threading
+import time
+from unittest import TestCase
+
+from mock import MagicMock
+
+from w2w_rome.helpers.profiling import (
+    ProfilingCommandExecutor,
+    StackSampler,
+    bind_request_profile,
+)
+
+
+def parse_port_table():
+    return sum(range(1000))
+
+
+def parse_in_thread():
+    thread = threading.Thread(target=bind_request_profile(parse_port_table))
+    thread.start()
+    thread.join()
+
+
+class TestProfilingCommandExecutor(TestCase):
+    def setUp(self):
+        self.log_dir = tempfile.mkdtemp()
+        self.driver_instance = MagicMock()
+        self.request = MagicMock(command_name="GetStateId")
+
+    def tearDown(self):
+        shutil.rmtree(self.log_dir)
+
+    def test_request_profile(self):
+        self.driver_instance.get_state_id.side_effect = parse_in_thread
+        executor = ProfilingCommandExecutor(
+            self.driver_instance, MagicMock(), self.log_dir
+        )
+
+        responses = executor.execute_commands([self.request])
+
+        self.assertTrue(responses[0].success)
+        (file_name,) = os.listdir(self.log_dir)
+        self.assertTrue(file_name.startswith("GetStateId-"))
+        stats = pstats.Stats(os.path.join(self.log_dir, file_name))
+        functions = {name for _, _, name in stats.stats}
+        self.assertIn("parse_in_thread", functions)
+        # profiled in the other thread
+        self.assertIn("parse_port_table", functions)
+
+    def test_sample_profile(self):
+        def get_state_id():
+            end_time = time.time() + 0.2
+            while time.time() < end_time:
+                parse_port_table()
+
+        self.driver_instance.get_state_id.side_effect = get_state_id
+        executor = ProfilingCommandExecutor(
+            self.driver_instance,
+            MagicMock(),
+            self.log_dir,
+            "sample",
+            sample_interval=0.01,
+        )
+
+        executor.execute_commands([self.request])
+        executor.stop_sampling()
+
+        (file_name,) = os.listdir(self.log_dir)
+        self.assertTrue(file_name.startswith("GetStateId-"))
+        with open(os.path.join(self.log_dir, file_name)) as samples_file:
+            lines = samples_file.read().splitlines()
+        self.assertTrue(any("get_state_id (" in line for line in lines))
+        self.assertTrue(all(line.rsplit(" ", 1)[1].isdigit() for line in lines))
+
+    def test_sampling_stopped_during_command(self):
+        executor = ProfilingCommandExecutor(
+            self.driver_instance, MagicMock(), self.log_dir, "sample"
+        )
+        self.driver_instance.get_state_id.side_effect = executor.stop_sampling
+
+        responses = executor.execute_commands([self.request])
+
+        self.assertTrue(responses[0].success)
+
+    def test_wrong_mode(self):
+        self.assertRaisesRegexp(
+            ValueError,
+            "should be one of REQUEST, SAMPLE",
+            ProfilingCommandExecutor,
+            self.driver_instance,
+            MagicMock(),
+            self.log_dir,
+            "TRACE",
+        )
+
+
+def test_idle_sampler_collects_nothing():
+    sampler = StackSampler()
+    sampler.sample()
+
+    assert sampler.get_command_names() == []
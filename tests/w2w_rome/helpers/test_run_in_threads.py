@@ -0,0 +1,118 @@
+import threading
+import time
+
+import pytest
+from mock import MagicMock
+
+from w2w_rome.helpers.errors import GotErrorInThreads, TaskCancelledError
+from w2w_rome.helpers.run_in_threads import (
+    check_cancelled,
+    get_executor,
+    run_in_threads,
+)
+
+
+def create_cli_service(host):
+    cli_service = MagicMock()
+    cli_service.session.host = host
+    return cli_service
+
+
+def test_returns_results_of_hosts():
+    first, second = create_cli_service("first"), create_cli_service("second")
+    param_map = {first: [[1], {"b": 2}], second: [[3], {"b": 4}]}
+
+    result = run_in_threads(lambda a, b: a + b, MagicMock(), param_map)
+
+    assert result == {first: 3, second: 7}
+
+
+def test_threads_are_reused():
+    cli_service = create_cli_service("host")
+    thread_names = set()
+    for _ in range(3):
+        run_in_threads(
+            lambda: thread_names.add(threading.current_thread().name),
+            MagicMock(),
+            {cli_service: [[], {}]},
+        )
+
+    assert len(thread_names) <= get_executor().get_metrics()["workers"]
+    assert all(name.startswith("RomeWorker") for name in thread_names)
+
+
+def test_error_cancels_other_hosts():
+    failed, waiting = create_cli_service("failed"), create_cli_service("waiting")
+    cancelled = []
+    started = threading.Event()
+
+    def func(fail):
+        if fail:
+            started.wait(5)
+            raise ValueError("failed")
+        started.set()
+        while True:
+            try:
+                check_cancelled()
+            except TaskCancelledError:
+                cancelled.append(True)
+                raise
+            time.sleep(0.01)
+
+    logger = MagicMock()
+    start_time = time.time()
+    with pytest.raises(GotErrorInThreads):
+        run_in_threads(func, logger, {failed: [[True], {}], waiting: [[False], {}]})
+
+    assert time.time() - start_time < 5
+    assert cancelled == [True]
+    logger.error.assert_called_once()
+    assert logger.error.call_args[1]["exc_info"][0] is ValueError
+
+
+def test_host_timeout():
+    slow, fast = create_cli_service("slow"), create_cli_service("fast")
+    event = threading.Event()
+
+    logger = MagicMock()
+    with pytest.raises(GotErrorInThreads):
+        run_in_threads(
+            lambda wait: wait and event.wait(5),
+            logger,
+            {slow: [[True], {}], fast: [[False], {}]},
+            timeout=0.2,
+        )
+    event.set()
+
+    logger.error.assert_called_once()
+    assert "slow" in logger.error.call_args[0][0]
+    # the session is still used by the task, it isn't returned to the pool
+    slow.session.set_active.assert_called_once_with(False)
+    slow.session.disconnect.assert_called_once_with()
+    fast.session.disconnect.assert_not_called()
+
+
+def test_task_is_finished_on_base_exception():
+    def func():
+        raise SystemExit()
+
+    logger = MagicMock()
+    with pytest.raises(GotErrorInThreads):
+        run_in_threads(func, logger, {create_cli_service("host"): [[], {}]})
+
+    assert logger.error.call_args[1]["exc_info"][0] is SystemExit
+
+
+def test_nested_call_runs_in_the_same_thread():
+    outer, inner = create_cli_service("outer"), create_cli_service("inner")
+
+    def func():
+        return run_in_threads(
+            lambda: threading.current_thread().name,
+            MagicMock(),
+            {inner: [[], {}]},
+        )[inner]
+
+    result = run_in_threads(func, MagicMock(), {outer: [[], {}]})
+
+    assert result[outer].startswith("RomeWorker")
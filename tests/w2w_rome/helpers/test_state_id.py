@@ -0,0 +1,185 @@
+import os
+import shutil
+import tempfile
+
+from mock import MagicMock
+
+from w2w_rome.helpers.port_entity import PortTable
+from w2w_rome.helpers.state_id import (
+    NOT_USED_STATE_ID,
+    StateIdTracker,
+    get_mapping_hash,
+    get_mapping_hashes,
+)
+
+from tests.w2w_rome.base import PORT_SHOW_MATRIX_A
+
+HOST = "192.168.122.10"
+SECOND_HOST = "192.168.122.11"
+HOSTS = [HOST]
+CONNECTED_PORT_SHOW = PORT_SHOW_MATRIX_A.replace(
+    "E2[1AE2]         Unlocked     Enabled     Disconnected  0                ",
+    "E2[1AE2]         Unlocked     Enabled     Connected     0       W3[1AW3] ",
+)
+
+
+def create_port_table(output=PORT_SHOW_MATRIX_A, host=HOST):
+    return PortTable.from_output(output, host)
+
+
+def create_dual_host_port_table(first_output, second_output):
+    return PortTable.merge(
+        [
+            create_port_table(first_output, HOST),
+            create_port_table(second_output, SECOND_HOST),
+        ]
+    )
+
+
+def test_mapping_hash_depends_on_connections():
+    assert get_mapping_hash(create_port_table()) == get_mapping_hash(
+        create_port_table()
+    )
+    assert get_mapping_hash(create_port_table()) != get_mapping_hash(
+        create_port_table(CONNECTED_PORT_SHOW)
+    )
+
+
+def test_state_id_is_kept_while_operation_count_is_the_same():
+    tracker = StateIdTracker()
+    tracker.set_state_id(HOSTS, "cs-id", ["10"], create_port_table())
+    get_port_table = MagicMock()
+
+    assert tracker.get_state_id(HOSTS, ["10"], get_port_table) == "cs-id"
+    get_port_table.assert_not_called()
+
+
+def test_state_id_is_kept_if_connections_are_the_same():
+    tracker = StateIdTracker()
+    tracker.set_state_id(HOSTS, "cs-id", ["10"], create_port_table())
+
+    assert tracker.get_state_id(HOSTS, ["12"], create_port_table) == "cs-id"
+    assert tracker.is_unchanged(HOSTS, ["12"])
+
+
+def test_state_id_is_changed_with_connections():
+    tracker = StateIdTracker()
+    tracker.set_state_id(HOSTS, "cs-id", ["10"], create_port_table())
+
+    state_id = tracker.get_state_id(
+        HOSTS, ["12"], lambda: create_port_table(CONNECTED_PORT_SHOW)
+    )
+
+    assert state_id.startswith("12-")
+    assert state_id != "cs-id"
+
+
+def test_own_changes_keep_state_id():
+    tracker = StateIdTracker()
+    port_table = create_port_table()
+    tracker.set_state_id(HOSTS, "cs-id", ["10"], port_table)
+    tracker.add_own_changes(
+        get_mapping_hashes(port_table), create_port_table(CONNECTED_PORT_SHOW)
+    )
+
+    state_id = tracker.get_state_id(
+        HOSTS, ["12"], lambda: create_port_table(CONNECTED_PORT_SHOW)
+    )
+
+    assert state_id == "cs-id"
+    assert tracker.is_unchanged(HOSTS, ["12"])
+
+
+def test_state_id_is_changed_with_other_changes_after_own_changes():
+    tracker = StateIdTracker()
+    port_table = create_port_table()
+    tracker.set_state_id(HOSTS, "cs-id", ["10"], port_table)
+    tracker.add_own_changes(get_mapping_hashes(port_table), port_table)
+
+    # ports were connected by others after the driver's change
+    state_id = tracker.get_state_id(
+        HOSTS, ["13"], lambda: create_port_table(CONNECTED_PORT_SHOW)
+    )
+
+    assert state_id != "cs-id"
+
+
+def test_own_changes_keep_changes_of_others():
+    tracker = StateIdTracker()
+    tracker.set_state_id(HOSTS, "cs-id", ["10"], create_port_table())
+    # ports were connected by others before the driver's change
+    port_table = create_port_table(CONNECTED_PORT_SHOW)
+    tracker.add_own_changes(get_mapping_hashes(port_table), port_table)
+
+    state_id = tracker.get_state_id(HOSTS, ["13"], lambda: port_table)
+
+    assert state_id != "cs-id"
+
+
+def test_state_id_is_not_used_without_operation_count():
+    tracker = StateIdTracker()
+
+    assert tracker.get_state_id(HOSTS, [None], MagicMock()) == NOT_USED_STATE_ID
+
+
+def test_state_id_is_kept_between_restarts():
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(tmp_dir, "state_id.json")
+        StateIdTracker(file_path).set_state_id(
+            HOSTS, "cs-id", ["10"], create_port_table()
+        )
+
+        tracker = StateIdTracker(file_path)
+
+        assert tracker.get_state_id(HOSTS, ["10"], MagicMock()) == "cs-id"
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_mapping_hashes_of_hosts():
+    mapping_hashes = get_mapping_hashes(
+        create_dual_host_port_table(PORT_SHOW_MATRIX_A, CONNECTED_PORT_SHOW)
+    )
+
+    assert mapping_hashes[HOST] == get_mapping_hashes(create_port_table())[HOST]
+    assert mapping_hashes[SECOND_HOST] != mapping_hashes[HOST]
+
+
+def test_own_changes_of_one_host():
+    tracker = StateIdTracker()
+    hosts = [HOST, SECOND_HOST]
+    port_table = create_dual_host_port_table(PORT_SHOW_MATRIX_A, PORT_SHOW_MATRIX_A)
+    tracker.set_state_id(hosts, "cs-id", ["10", "20"], port_table)
+    own_port_table = create_dual_host_port_table(
+        PORT_SHOW_MATRIX_A, CONNECTED_PORT_SHOW
+    )
+    tracker.add_own_changes(get_mapping_hashes(port_table), own_port_table)
+
+    assert tracker.get_state_id(hosts, ["10", "21"], lambda: own_port_table) == (
+        "cs-id"
+    )
+    # the first host is changed by others
+    state_id = tracker.get_state_id(
+        hosts,
+        ["11", "21"],
+        lambda: create_dual_host_port_table(CONNECTED_PORT_SHOW, CONNECTED_PORT_SHOW),
+    )
+    assert state_id != "cs-id"
+
+
+def test_state_id_of_other_hosts_is_not_used():
+    tracker = StateIdTracker()
+    tracker.set_state_id([HOST], "cs-id", ["10"], create_port_table())
+    tracker.set_state_id(
+        [SECOND_HOST], "other-id", ["10"], create_port_table(host=SECOND_HOST)
+    )
+
+    state_id = tracker.get_state_id(
+        [HOST, SECOND_HOST],
+        ["10", "10"],
+        lambda: create_dual_host_port_table(PORT_SHOW_MATRIX_A, PORT_SHOW_MATRIX_A),
+    )
+
+    assert state_id not in ("cs-id", "other-id")
+    assert tracker.get_state_id([HOST], ["10"], MagicMock()) == "cs-id"
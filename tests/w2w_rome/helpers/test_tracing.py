@@ -0,0 +1,69 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import TestCase
+
+import pytest
+
+from w2w_rome.helpers.tracing import Tracer
+
+
+class TestTracer(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "trace.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def load_events(self, tracer):
+        tracer.close()
+        with open(self.file_path) as trace_file:
+            data = trace_file.read()
+        # trace viewers accept the array without the closing bracket
+        events = json.loads(data.rstrip().rstrip(",") + "]")
+        return {event["name"]: event for event in events if event["ph"] == "X"}
+
+    def test_nested_spans(self):
+        tracer = Tracer(self.file_path)
+        with tracer.span("map_bidi", "driver_command"):
+            with tracer.span("port show", "cli_command", host="192.168.1.2"):
+                pass
+            with pytest.raises(ValueError):
+                with tracer.span("expect", "session"):
+                    raise ValueError()
+
+        events = self.load_events(tracer)
+
+        parent_id = events["map_bidi"]["args"]["span_id"]
+        self.assertIsNone(events["map_bidi"]["args"]["parent_id"])
+        self.assertEqual(parent_id, events["port show"]["args"]["parent_id"])
+        self.assertEqual("192.168.1.2", events["port show"]["args"]["host"])
+        self.assertEqual(parent_id, events["expect"]["args"]["parent_id"])
+        self.assertEqual("ValueError", events["expect"]["args"]["error"])
+        self.assertGreaterEqual(events["map_bidi"]["dur"], events["port show"]["dur"])
+
+    def test_bind_keeps_parent_in_other_thread(self):
+        tracer = Tracer(self.file_path)
+        with tracer.span("map_bidi", "driver_command"):
+            func = tracer.bind(lambda: None, "host", "thread", host="192.168.1.2")
+        thread = threading.Thread(target=func)
+        thread.start()
+        thread.join()
+
+        events = self.load_events(tracer)
+
+        self.assertEqual(
+            events["map_bidi"]["args"]["span_id"], events["host"]["args"]["parent_id"]
+        )
+        self.assertNotEqual(events["map_bidi"]["tid"], events["host"]["tid"])
+
+    def test_disabled_tracer_writes_nothing(self):
+        tracer = Tracer()
+        with tracer.span("map_bidi"):
+            func = tracer.bind(len, "host")
+        func("")
+
+        self.assertFalse(os.path.exists(self.file_path))
@@ -6,6 +6,7 @@ from cloudshell.layer_one.core.response.resource_info.entities.port import Port
 from mock import MagicMock, patch
 
 from w2w_rome.helpers.errors import BaseRomeException
+from w2w_rome.helpers.state_id import StateIdTracker
 
 from tests.w2w_rome.base import (
     DEFAULT_PROMPT,
@@ -57,7 +58,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_B,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -129,7 +129,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_A,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -197,7 +196,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_A_CHANGED_PORT,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -265,7 +263,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -330,7 +327,6 @@ class RomeTestAutoload(BaseRomeTestCase):
             [
                 Command("", DEFAULT_PROMPT),
                 Command("port show", PORT_SHOW_MATRIX_Q_BROKEN_TABLE_OUTPUT),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -399,7 +395,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q128_1,
                 ),
-                Command("show board", SHOW_BOARD),
             ],
         )
         emu2 = CliEmulator(
@@ -409,7 +404,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q128_2,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
 
@@ -485,7 +479,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q128_1,
                 ),
-                Command("show board", SHOW_BOARD),
             ],
         )
         emu2 = CliEmulator(
@@ -495,7 +488,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q128_2_CHANGED_PORT,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
 
@@ -570,7 +562,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_XY,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -674,7 +665,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_XY_CHANGED_PORT,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -778,7 +768,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_A_Q,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -853,7 +842,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_A_Q,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -924,7 +912,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q_B,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1001,7 +988,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q_B,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1071,7 +1057,6 @@ class RomeTestAutoload(BaseRomeTestCase):
                     "port show",
                     PORT_SHOW_MATRIX_Q,
                 ),
-                Command("show board", SHOW_BOARD),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1084,3 +1069,43 @@ class RomeTestAutoload(BaseRomeTestCase):
             self.driver_commands.get_resource_description(address)
 
         emu.check_calls()
+
+    def test_autoload_is_skipped_if_device_is_not_changed(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("show board", SHOW_BOARD),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command("", DEFAULT_PROMPT),
+                Command("show board", SHOW_BOARD),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+        self.driver_commands._state_id_tracker = StateIdTracker()
+
+        self.driver_commands.login(address, user, password)
+        info = self.driver_commands.get_resource_description(address)
+        second_info = self.driver_commands.get_resource_description(address)
+
+        self.assertIs(info, second_info)
+        emu.check_calls()
+
+    def test_serial_number_from_login(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+
+        emu = CliEmulator()
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, "user", "password")
+        info = self.driver_commands.get_attribute_value(address, "Serial Number")
+
+        self.assertEqual("9727-4733-2222", info._value)
+        emu.check_calls()
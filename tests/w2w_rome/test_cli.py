@@ -1,6 +1,22 @@
+import re
+from unittest import TestCase
+
+from cloudshell.cli.command_mode_helper import CommandModeHelper
 from mock import MagicMock, patch
 
-from w2w_rome.cli.template_executor import RomeTemplateExecutor
+from w2w_rome.cli.connection_events import (
+    ConnectionCompletionTracker,
+    ConnectionEvent,
+    EventChannel,
+)
+from w2w_rome.cli.l1_cli_handler import L1CliHandler
+from w2w_rome.cli.log_line_filter import LogLineFilter
+from w2w_rome.cli.output_matcher import OutputMatcher
+from w2w_rome.cli.prompt_detector import PromptDetector
+from w2w_rome.cli.rome_command_modes import DefaultCommandMode
+from w2w_rome.cli.rome_sessions import RomeSSHSession
+from w2w_rome.cli.session_pool import RomeSessionPoolManager
+from w2w_rome.helpers import patterns
 from w2w_rome.helpers.port_entity import PortTable
 
 from tests.w2w_rome.base import BaseRomeTestCase
@@ -546,7 +562,7 @@ ROME[TECH]# """  # noqa: W291
 class TestLogInOutput(BaseRomeTestCase):
     def test_log_in_port_show_output(self):
         host = "192.168.1.2"
-        output = RomeTemplateExecutor.remove_logs_from_output(PORT_SHOW_WITH_LOG)
+        output = LogLineFilter().filter_output(PORT_SHOW_WITH_LOG)
         port_table = PortTable.from_output(output, host)
 
         self.assertEqual(128, len(port_table.logical_ports))
@@ -630,6 +646,392 @@ W28[1AW28]       Unlocked     Enabled     Disconnected  6                      P
         ]
 
         for raw_str, fixed_str in str_to_check:
-            self.assertEqual(
-                fixed_str, RomeTemplateExecutor.remove_logs_from_output(raw_str)
+            self.assertEqual(fixed_str, LogLineFilter().filter_output(raw_str))
+
+
+class TestConnectionCompletionTracker(TestCase):
+    def setUp(self):
+        self.tracker = ConnectionCompletionTracker()
+        event_channel = EventChannel()
+        event_channel.subscribe(self.tracker.on_event)
+        self.log_filter = LogLineFilter(event_channel)
+
+    def test_completion_notice(self):
+        self.tracker.expect([("A3", "A4")])
+        self.log_filter.feed("ROME[TECH]# 08-06-2019 09:01 CONNECTING...\n")
+        self.assertFalse(self.tracker.is_completed([("A3", "A4")]))
+
+        self.log_filter.feed(
+            "08-06-2019 09:01 Connection A3<->A4 completed successfully\n"
+        )
+        self.assertTrue(self.tracker.is_completed([("A3", "A4")]))
+        self.assertTrue(self.tracker.is_completed([("a4", "a3")]))
+        self.assertFalse(self.tracker.is_completed([("A3", "A4"), ("A5", "A6")]))
+
+    def test_completion_notice_split_between_chunks(self):
+        self.log_filter.feed("08-06-2019 09:01 Connection A3<->A4 comp")
+        self.assertFalse(self.tracker.is_completed([("A3", "A4")]))
+
+        self.log_filter.feed("leted successfully\nROME[TECH]#")
+        self.assertTrue(self.tracker.is_completed([("A3", "A4")]))
+
+    def test_expect_forgets_previous_notices(self):
+        self.log_filter.feed(
+            "08-06-2019 09:01 Connection A3<->A4 completed successfully\n"
+        )
+
+        self.tracker.expect([("A3", "A4")])
+
+        self.assertFalse(self.tracker.is_completed([("A3", "A4")]))
+
+    def test_completion_time_of_the_last_notice(self):
+        with patch("w2w_rome.cli.connection_events.time") as time_mock:
+            time_mock.time.return_value = 100.0
+            self.log_filter.feed(
+                "08-06-2019 09:01 Connection A3<->A4 completed successfully\n"
+            )
+            self.assertIsNone(
+                self.tracker.get_completion_time([("A3", "A4"), ("A5", "A6")])
             )
+            time_mock.time.return_value = 103.5
+            self.log_filter.feed(
+                "08-06-2019 09:01 Connection A5<->A6 completed successfully\n"
+            )
+
+        self.assertEqual(
+            103.5, self.tracker.get_completion_time([("A3", "A4"), ("A5", "A6")])
+        )
+
+    def test_operation_events_dont_complete_connection(self):
+        self.log_filter.feed(
+            "08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E3[1AE3]<->W4[1AW4] "
+            "OP:connect\n"
+        )
+
+        self.assertFalse(self.tracker.is_completed([("E3[1AE3]", "W4[1AW4]")]))
+
+
+class TestWaitConnectionsCompleted(TestCase):
+    def test_output_is_kept_for_next_read(self):
+        logger = MagicMock()
+        session = RomeSSHSession("192.168.122.10", "user", "password")
+        session.completion_tracker.expect([("A3", "A4")])
+        chunks = [
+            "OK - request added to pending queue (A5-A6)\n",
+            "08-06-2019 09:01 Connection A3<->A4 completed successfully\n"
+            "ROME[TECH]# ",
+        ]
+
+        with patch(
+            "cloudshell.cli.session.ssh_session.SSHSession._receive",
+            side_effect=chunks,
+        ):
+            completed = session.wait_connections_completed([("A3", "A4")], 1, logger)
+            output = session._receive(1, logger)
+
+        self.assertTrue(completed)
+        # the log line is removed with its line break
+        self.assertEqual(
+            "OK - request added to pending queue (A5-A6)ROME[TECH]# ", output
+        )
+
+
+class TestLogLineFilter(TestCase):
+    def setUp(self):
+        self.event_channel = EventChannel()
+        self.log_filter = LogLineFilter(self.event_channel)
+
+    def test_log_lines_are_published(self):
+        output = self.log_filter.filter_output(
+            "ROME[TECH]# connection create A1 to A2\n"
+            "OK - request added to pending queue (A1-A2)\n"
+            "ROME[TECH]# 08-06-2019 09:01 CONNECTING...\n"
+            "08-06-2019 09:01 CONNECTION OPERATION SKIPPED(already done):"
+            "E1[1AE1]<->W2[1AW2] OP:connect\n"
+            "08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] "
+            "OP:connect\n"
+            "08-06-2019 09:01 Connection A1<->A2 completed successfully\n"
+        )
+
+        self.assertEqual(
+            "ROME[TECH]# connection create A1 to A2\n"
+            "OK - request added to pending queue (A1-A2)\n"
+            "ROME[TECH]# 08-06-2019 09:01 CONNECTING...",
+            output,
+        )
+        events = list(self.event_channel.events)
+        self.assertEqual(3, len(events))
+        self.assertEqual(
+            (ConnectionEvent.OPERATION, "E1[1AE1]", "W2[1AW2]", "connect"),
+            (events[0].kind, events[0].src, events[0].dst, events[0].operation),
+        )
+        self.assertEqual("SKIPPED(already done)", events[0].status)
+        self.assertEqual(
+            (ConnectionEvent.COMPLETED, "A1", "A2", "successfully"),
+            (events[2].kind, events[2].src, events[2].dst, events[2].status),
+        )
+        self.assertEqual("08-06-2019 09:01", events[2].time)
+
+    def test_log_line_split_between_chunks(self):
+        chunks = (
+            "W26[1AW26]       Unlocked     Enabled     Disconnected  4     P26\n",
+            "W27[1AW27] \n02-0",
+            "9-2020 10:43 Connection P119<->P24 completed success",
+            "fully\n\n",
+            "      Unlocked     Enabled     Disconnected  4     P27\nROME[TECH]# ",
+        )
+
+        output = "".join(self.log_filter.feed(chunk) for chunk in chunks)
+
+        self.assertEqual(
+            "W26[1AW26]       Unlocked     Enabled     Disconnected  4     P26\n"
+            "W27[1AW27]       Unlocked     Enabled     Disconnected  4     P27\n"
+            "ROME[TECH]# ",
+            output,
+        )
+        self.assertEqual(1, len(self.event_channel.events))
+
+    def test_lines_with_digits_are_not_kept(self):
+        self.assertEqual(
+            "ROME[TECH]# connection show pending\n772     A1",
+            self.log_filter.feed("ROME[TECH]# connection show pending\n772     A1"),
+        )
+        self.assertEqual("\nROME[TECH]# ", self.log_filter.feed("\nROME[TECH]# "))
+
+    def test_log_lines_with_crlf(self):
+        chunks = (
+            "ROME[OPER]# connection create A1 to A2\r\n"
+            "OK - request added to pending queue (A1-A2)\r",
+            "\n08-06-2019 09:01 Connection A1<->A2 completed successfully\r",
+            "\nROME[OPER]# ",
+        )
+
+        output = "".join(self.log_filter.feed(chunk) for chunk in chunks)
+        output += self.log_filter.flush()
+
+        self.assertEqual(
+            "ROME[OPER]# connection create A1 to A2\n"
+            "OK - request added to pending queue (A1-A2)ROME[OPER]# ",
+            output,
+        )
+        events = list(self.event_channel.events)
+        self.assertEqual(1, len(events))
+        self.assertEqual(
+            (ConnectionEvent.COMPLETED, "A1", "A2", "successfully"),
+            (events[0].kind, events[0].src, events[0].dst, events[0].status),
+        )
+
+    def test_log_lines_with_colors(self):
+        output = self.log_filter.filter_output(
+            "ROME[OPER]# connection show pending\r\n"
+            "\x1b[32m08-06-2019 09:01 Connection A1<->A2 completed successfully"
+            "\x1b[0m\r\n"
+            "ROME[OPER]# "
+        )
+
+        self.assertEqual("ROME[OPER]# connection show pendingROME[OPER]# ", output)
+        self.assertEqual(1, len(self.event_channel.events))
+
+    def test_carriage_return_at_the_end_is_kept(self):
+        self.assertEqual("ROME[OPER]# ", self.log_filter.feed("ROME[OPER]# \r"))
+        self.assertEqual("\r", self.log_filter.flush())
+
+
+class TestOutputMatcher(TestCase):
+    PATTERN = r"(?i)Multiple Cross Connect Severe Failure"
+
+    def setUp(self):
+        self.output_matcher = OutputMatcher([self.PATTERN])
+
+    def test_pattern_is_matched_once(self):
+        self.output_matcher.feed("ROME[TECH]# connection show pending\n")
+        self.output_matcher.feed("08-06-2019 09:01 Multiple Cross Connect ")
+        self.output_matcher.feed("Severe Failure\nROME[TECH]# ")
+
+        self.assertEqual({self.PATTERN}, self.output_matcher.pop_matched())
+        self.output_matcher.feed("\n")
+        # the finished line isn't searched again
+        self.assertEqual(set(), self.output_matcher.pop_matched())
+
+    def test_tail_is_bounded(self):
+        self.output_matcher.feed("Multiple Cross " + "a" * OutputMatcher.MAX_TAIL_SIZE)
+        self.output_matcher.feed("Connect Severe Failure\n")
+
+        self.assertEqual(set(), self.output_matcher.pop_matched())
+
+    def test_clear(self):
+        self.output_matcher.feed("08-06-2019 09:01 Multiple Cross ")
+        self.output_matcher.clear()
+        self.output_matcher.feed("Connect Severe Failure\n")
+
+        self.assertEqual(set(), self.output_matcher.pop_matched())
+
+    def test_session_matches_received_data(self):
+        session = RomeSSHSession("192.168.122.10", "user", "password")
+
+        with patch(
+            "cloudshell.cli.session.ssh_session.SSHSession._receive",
+            return_value="08-06-2019 09:01 Multiple Cross Connect Severe Failure\n",
+        ):
+            session._receive(1, MagicMock())
+
+        self.assertEqual(
+            {patterns.CONNECTION_PENDING_SEVERE_FAILURE.pattern},
+            session.output_matcher.pop_matched(),
+        )
+
+
+class TestRomeSessionPoolManager(TestCase):
+    def setUp(self):
+        self.logger = MagicMock()
+        self.new_session = MagicMock()
+
+    def test_warm_up_opens_sessions_till_pool_is_full(self):
+        pool = RomeSessionPoolManager(max_pool_size=2)
+        pool.return_session(
+            pool.get_session([self.new_session], "#", self.logger), self.logger
+        )
+
+        opened = pool.warm_up([self.new_session], "#", self.logger)
+
+        self.assertEqual(opened, 1)
+        self.assertEqual(self.new_session.connect.call_count, 2)
+        self.assertEqual(pool.warm_up([self.new_session], "#", self.logger), 0)
+
+    def test_handlers_have_own_pools(self):
+        first, second = RomeSessionPoolManager(1), RomeSessionPoolManager(1)
+        first.warm_up([MagicMock()], "#", self.logger)
+
+        self.assertEqual(second.warm_up([self.new_session], "#", self.logger), 1)
+
+    def test_keepalive_removes_broken_sessions(self):
+        pool = RomeSessionPoolManager(max_pool_size=1)
+        pool.warm_up([self.new_session], "#", self.logger)
+        self.new_session.hardware_expect.side_effect = EOFError
+
+        pool.keepalive(0, self.logger)
+
+        self.new_session.hardware_expect.assert_called_once_with(
+            "", expected_string="#", logger=self.logger
+        )
+        self.new_session.disconnect.assert_called_once_with()
+        self.assertEqual(pool._session_manager.existing_sessions_count(), 0)
+        self.assertTrue(pool._pool.empty())
+
+    def test_keepalive_skips_recently_used_sessions(self):
+        pool = RomeSessionPoolManager(max_pool_size=1)
+        pool.warm_up([self.new_session], "#", self.logger)
+
+        pool.keepalive(60, self.logger)
+
+        self.new_session.hardware_expect.assert_not_called()
+        self.assertFalse(pool._pool.empty())
+
+
+@patch("w2w_rome.cli.l1_cli_handler.RomeSSHSession")
+@patch("w2w_rome.cli.l1_cli_handler.RuntimeConfiguration")
+class TestL1CliHandler(TestCase):
+    CONFIG = {
+        "CLI.TYPE": ["SSH"],
+        "CLI.PORTS": {"SSH": 22},
+        "CLI.POOL_SIZE": 2,
+        "CLI.KEEPALIVE_INTERVAL": 60,
+    }
+
+    def create_handler(self, runtime_config_class, config):
+        runtime_config_class.return_value.read_key.side_effect = (
+            lambda key, default=None: config.get(key, default)
+        )
+        handler = L1CliHandler(MagicMock())
+        handler.define_session_attributes("192.168.122.10", "user", "password")
+        return handler
+
+    def test_read_only_commands_have_own_session(self, runtime_config_class, _):
+        handler = self.create_handler(runtime_config_class, self.CONFIG)
+        command_mode = CommandModeHelper.create_command_mode()[DefaultCommandMode]
+
+        with patch("w2w_rome.cli.l1_cli_handler.threading") as threading_mock:
+            handler.warm_up(command_mode)
+
+        self.assertEqual(1, handler._session_pool.max_pool_size)
+        self.assertEqual(1, handler._read_only_pool.max_pool_size)
+        self.assertFalse(handler._session_pool._pool.empty())
+        self.assertFalse(handler._read_only_pool._pool.empty())
+        threading_mock.Thread.return_value.start.assert_called_once_with()
+        with patch.object(handler._cli, "get_session") as get_session:
+            handler.get_cli_service(command_mode)
+        get_session.assert_called_once()
+        with patch.object(handler._read_only_cli, "get_session") as get_session:
+            handler.get_cli_service(command_mode, read_only=True)
+        get_session.assert_called_once()
+
+    def test_keepalive_checks_all_pools(self, runtime_config_class, _):
+        handler = self.create_handler(runtime_config_class, self.CONFIG)
+
+        with patch("w2w_rome.cli.l1_cli_handler.time") as time_mock, patch.object(
+            RomeSessionPoolManager, "keepalive"
+        ) as keepalive:
+            time_mock.sleep.side_effect = [None, StopIteration]
+            with self.assertRaises(StopIteration):
+                handler._keepalive()
+
+        self.assertEqual(2, keepalive.call_count)
+        keepalive.assert_called_with(60, handler._logger)
+
+    def test_default_pool_has_one_session(self, runtime_config_class, _):
+        handler = self.create_handler(
+            runtime_config_class, {"CLI.TYPE": ["SSH"], "CLI.PORTS": {"SSH": 22}}
+        )
+        command_mode = CommandModeHelper.create_command_mode()[DefaultCommandMode]
+
+        with patch("w2w_rome.cli.l1_cli_handler.threading") as threading_mock:
+            handler.warm_up(command_mode)
+
+        self.assertEqual(1, handler._session_pool.max_pool_size)
+        self.assertIsNone(handler._read_only_cli)
+        threading_mock.Thread.assert_not_called()
+        with patch.object(handler._cli, "get_session") as get_session:
+            handler.get_cli_service(command_mode, read_only=True)
+        get_session.assert_called_once()
+
+
+class TestPromptDetector(TestCase):
+    OUTPUTS_WITH_PROMPT = (
+        "port show\nE1[1AE1]  Unlocked\nROME[OPER]# ",
+        "ROME[TECH]#",
+        "connection create A1 to A2\n"
+        "OK - request added to pending queue (A1-A2)\n"
+        "ROME[TECH]# 08-06-2019 09:01 CONNECTING...\n"
+        "08-06-2019 09:01 CONNECTION OPERATION SKIPPED(already done):"
+        "E1[1AE1]<->W2[1AW2] OP:connect\n"
+        "08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] "
+        "OP:connect\n"
+        "08-06-2019 09:01 Connection A1<->A2 completed successfully\n",
+        "ROME[TECH]# 08-18-2019 12:37 DISCONNECTING...",
+    )
+    OUTPUTS_WITHOUT_PROMPT = (
+        "",
+        "port show\nE1[1AE1]  Unlocked",
+        "ROME[OPER]# port show\nE1[1AE1]  Unlocked\n",
+        "ROME[TECH]# 08-06-2019 09:01 CONNECTING...\nE1[1AE1]  Unlocked\n",
+        "ROME[TECH]# 08-06-2019 09:0",
+    )
+
+    def test_match_as_prompt_regex(self):
+        detector = PromptDetector()
+        for output in self.OUTPUTS_WITH_PROMPT:
+            self.assertTrue(detector.match(output), output)
+            self.assertTrue(re.search(DefaultCommandMode.PROMPT, output, re.DOTALL))
+        for output in self.OUTPUTS_WITHOUT_PROMPT:
+            self.assertFalse(detector.match(output), output)
+            self.assertFalse(re.search(DefaultCommandMode.PROMPT, output, re.DOTALL))
+
+    def test_session_uses_detector_for_default_prompt(self):
+        session = RomeSSHSession("host", "user", "password")
+        with patch.object(PromptDetector, "match", return_value=True) as match_mock:
+            self.assertTrue(
+                session.match_prompt(DefaultCommandMode.PROMPT, "output", MagicMock())
+            )
+            self.assertFalse(session.match_prompt("other#", "output", MagicMock()))
+
+        match_mock.assert_called_once_with("output")
@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from mock import MagicMock
+
+from w2w_rome.command_executor import RomeCommandExecutor
+from w2w_rome.helpers.errors import ConnectionPortsError
+
+
+def create_request(command_name, **params):
+    return MagicMock(
+        command_name=command_name,
+        command_params={key: [value] for key, value in params.items()},
+    )
+
+
+def create_map_bidi(port_a, port_b):
+    return create_request(
+        "MapBidi",
+        MapPort_A="192.168.122.10:A/1/{}".format(port_a),
+        MapPort_B="192.168.122.10:A/1/{}".format(port_b),
+    )
+
+
+class TestRomeCommandExecutor(TestCase):
+    def setUp(self):
+        self.driver_instance = MagicMock()
+        self.driver_instance.map_bidi_batch.return_value = [None, None]
+        self.executor = RomeCommandExecutor(self.driver_instance, MagicMock())
+
+    def test_map_bidi_commands_in_batch(self):
+        requests = [
+            create_request("GetStateId"),
+            create_map_bidi("001", "002"),
+            create_map_bidi("003", "004"),
+        ]
+
+        responses = self.executor.execute_commands(requests)
+
+        self.assertEqual(requests, [r.command_request for r in responses])
+        self.assertTrue(all(response.success for response in responses))
+        self.driver_instance.get_state_id.assert_called_once_with()
+        self.driver_instance.map_bidi_batch.assert_called_once_with(
+            [
+                ("192.168.122.10:A/1/001", "192.168.122.10:A/1/002"),
+                ("192.168.122.10:A/1/003", "192.168.122.10:A/1/004"),
+            ]
+        )
+        self.driver_instance.map_bidi.assert_not_called()
+
+    def test_map_bidi_with_the_same_port_not_in_batch(self):
+        requests = [create_map_bidi("001", "002"), create_map_bidi("002", "003")]
+
+        self.executor.execute_commands(requests)
+
+        self.driver_instance.map_bidi_batch.assert_not_called()
+        self.assertEqual(2, self.driver_instance.map_bidi.call_count)
+
+    def test_failed_pair_fails_only_its_command(self):
+        self.driver_instance.map_bidi_batch.return_value = [
+            None,
+            ConnectionPortsError("Cannot connect ports A3 to A4 during 120sec"),
+        ]
+        requests = [create_map_bidi("001", "002"), create_map_bidi("003", "004")]
+
+        responses = self.executor.execute_commands(requests)
+
+        self.assertEqual(requests, [r.command_request for r in responses])
+        self.assertTrue(responses[0].success)
+        self.assertFalse(responses[1].success)
+        self.assertEqual("ConnectionPortsError", responses[1].error)
+        self.assertIn("Cannot connect ports A3 to A4", responses[1].log)
+        self.driver_instance.map_bidi.assert_not_called()
+
+    def test_failed_batch_executes_commands_one_by_one(self):
+        self.driver_instance.map_bidi_batch.side_effect = Exception("Session closed")
+        self.driver_instance.map_bidi.side_effect = [
+            None,
+            ConnectionPortsError("Cannot connect port A3 to port A4 during 120sec"),
+        ]
+        requests = [create_map_bidi("001", "002"), create_map_bidi("003", "004")]
+
+        responses = self.executor.execute_commands(requests)
+
+        self.assertEqual(2, self.driver_instance.map_bidi.call_count)
+        self.assertTrue(responses[0].success)
+        self.assertFalse(responses[1].success)
+        self.assertIn("Cannot connect port A3 to port A4", responses[1].log)
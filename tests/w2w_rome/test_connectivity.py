@@ -1,13 +1,20 @@
 import re
+import time
+from unittest import TestCase
 
 from mock import MagicMock, patch
 
+from w2w_rome.command_actions.mapping_actions import (
+    MappingActions,
+    parse_pending_connections,
+)
 from w2w_rome.helpers.errors import (
     BaseRomeException,
     ConnectionPortsError,
     NotSupportedError,
 )
 from w2w_rome.helpers.port_entity import SubPort
+from w2w_rome.helpers.port_table_cache import PortTableCache
 
 from tests.w2w_rome.base import (
     DEFAULT_PROMPT,
@@ -20,6 +27,7 @@ from tests.w2w_rome.base import (
     PORT_SHOW_MATRIX_Q128_2_CHANGED_PORT,
     PORT_SHOW_MATRIX_XY,
     PORT_SHOW_MATRIX_XY_CHANGED_PORT,
+    SHOW_BOARD,
     BaseRomeTestCase,
     CliEmulator,
     Command,
@@ -55,6 +63,22 @@ ROME[TECH]# """.format(
     )
 
 
+PORT_INFO = """ROME[OPER]# port show {port}
+================ ============ =========== ============= ======= ============== ========
+Port             Admin Status Oper Status Port Status   Counter ConnectedTo    Logical
+================ ============ =========== ============= ======= ============== ========
+{rows}
+
+ROME[OPER]# """
+
+
+def get_port_info(logical_name, port_show_output):
+    rows = re.findall(
+        r"^.+\W{}\s*$".format(logical_name), port_show_output, re.MULTILINE
+    )
+    return PORT_INFO.format(port=logical_name, rows="\n".join(rows))
+
+
 def set_port_connected(sub_port_name, connected_to_sub_port_name, port_show_output):
     sub_port_match = re.search(
         r"^{}\[.+$".format(sub_port_name), port_show_output, re.MULTILINE
@@ -198,7 +222,8 @@ ROME[TECH]# 08-05-2019 09:20 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -235,7 +260,8 @@ ROME[TECH]# 08-05-2019 09:20 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show B135", get_port_info("B135", connected_port_show_a)),
+                Command("port show B255", get_port_info("B255", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -270,7 +296,8 @@ ROME[TECH]# 08-05-2019 09:20 CONNECTING...
                     get_connection_pending("E3", "W4"),
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -307,7 +334,8 @@ ROME[TECH]#
 """,  # noqa: W291
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", PORT_SHOW_MATRIX_A),
+                Command("port show A4", get_port_info("A4", PORT_SHOW_MATRIX_A)),
+                Command("port show A6", get_port_info("A6", PORT_SHOW_MATRIX_A)),
             ]
         )
 
@@ -368,7 +396,8 @@ ROME[TECH]# 08-05-2019 09:20 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show X14", get_port_info("X14", connected_port_show_a)),
+                Command("port show Y11", get_port_info("Y11", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -405,6 +434,86 @@ class RomeTestMapBidi(BaseRomeTestCase):
 
         emu.check_calls()
 
+    def test_map_bidi_with_connected_ports_and_port_table_cache(self):
+        host = "192.168.122.10"
+        address = "{}:B".format(host)
+        user = "user"
+        password = "password"
+        src_port = "{}/1/249".format(address)
+        dst_port = "{}/1/253".format(address)
+        self.driver_commands._port_table_cache = PortTableCache()
+
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("show board", SHOW_BOARD),
+                Command("port show", PORT_SHOW_MATRIX_B),
+                Command("", DEFAULT_PROMPT),
+                Command("show board", SHOW_BOARD),
+                Command("", DEFAULT_PROMPT),
+                Command(
+                    "show board",
+                    SHOW_BOARD.replace(
+                        "OPERATION COUNT  7766", "OPERATION COUNT  7767"
+                    ),
+                ),
+                Command("port show", PORT_SHOW_MATRIX_B),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        self.driver_commands.map_bidi(src_port, dst_port)
+        self.driver_commands.map_bidi(src_port, dst_port)
+        self.driver_commands.map_bidi(src_port, dst_port)
+
+        emu.check_calls()
+
+    def test_map_bidi_invalidates_port_table_cache(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+        src_port = "{}/1/003".format(address)
+        dst_port = "{}/1/004".format(address)
+        self.driver_commands._mapping_check_delay = 0.1
+        self.driver_commands._port_table_cache = PortTableCache()
+
+        connected_port_show_a = set_port_connected("E3", "W4", PORT_SHOW_MATRIX_A)
+        connected_port_show_a = set_port_connected("E4", "W3", connected_port_show_a)
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("show board", SHOW_BOARD),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command(
+                    "connection create A3 to A4",
+                    """ROME[TECH]# connection create A3 to A4
+OK - request added to pending queue (A3-A4)
+ROME[TECH]# 08-06-2019 09:01 CONNECTING...
+08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E3[1AE3]<->W4[1AW4] OP:connect
+08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E4[1AE2]<->W3[1AW3] OP:connect
+08-06-2019 09:01 Connection A3<->A4 completed successfully
+""",
+                ),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
+                Command("", DEFAULT_PROMPT),
+                Command("show board", SHOW_BOARD),
+                Command("port show", connected_port_show_a),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        self.driver_commands.map_bidi(src_port, dst_port)
+        self.driver_commands.map_bidi(src_port, dst_port)
+
+        emu.check_calls()
+
     def test_map_bidi_one_connection(self):
         host = "192.168.122.10"
         address = "{}:A".format(host)
@@ -430,16 +539,94 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show A1", get_port_info("A1", connected_port_show_a)),
+                Command("port show A2", get_port_info("A2", connected_port_show_a)),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        self.driver_commands.map_bidi(src_port, dst_port)
+
+        emu.check_calls()
+
+    def test_map_bidi_after_error_handled_by_caller(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+        src_port = "{}/1/001".format(address)
+        dst_port = "{}/1/002".format(address)
+        self.driver_commands._mapping_check_delay = 0.1
+
+        connected_port_show_a = set_port_connected("E2", "W1", PORT_SHOW_MATRIX_A)
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command(
+                    "connection create A1 to A2",
+                    """ROME[TECH]# connection create A1 to A2
+OK - request added to pending queue (A1-A2)
+ROME[TECH]# 08-06-2019 09:01 Connection A1<->A2 completed successfully
+""",
+                ),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command("port show A1", get_port_info("A1", connected_port_show_a)),
+                Command("port show A2", get_port_info("A2", connected_port_show_a)),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        try:
+            self.driver_commands.map_uni(src_port, [dst_port, dst_port])
+        except BaseRomeException:
+            pass
+        # Python 2 keeps the handled exception in sys.exc_info() of this frame
+        self.driver_commands.map_bidi(src_port, dst_port)
+
+        emu.check_calls()
+
+    def test_map_bidi_checks_pending_after_completion_notice(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+        src_port = "{}/1/001".format(address)
+        dst_port = "{}/1/002".format(address)
+        self.driver_commands._mapping_check_delay = 30
+
+        connected_port_show_a = set_port_connected("E2", "W1", PORT_SHOW_MATRIX_A)
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command(
+                    "connection create A1 to A2",
+                    """ROME[TECH]# connection create A1 to A2
+OK - request added to pending queue (A1-A2)
+ROME[TECH]# 08-06-2019 09:01 CONNECTING...
+08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:connect
+08-06-2019 09:01 Connection A1<->A2 completed successfully
+""",
+                ),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command("port show A1", get_port_info("A1", connected_port_show_a)),
+                Command("port show A2", get_port_info("A2", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
         self.receive_all_func_map[host] = emu.receive_all
 
+        start_time = time.time()
         self.driver_commands.login(address, user, password)
         self.driver_commands.map_bidi(src_port, dst_port)
 
         emu.check_calls()
+        self.assertLess(time.time() - start_time, 5)
 
     def test_map_bidi(self):
         host = "192.168.122.10"
@@ -467,6 +654,51 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        self.driver_commands.map_bidi(src_port, dst_port)
+
+        emu.check_calls()
+
+    def test_map_bidi_port_info_is_not_supported(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+        src_port = "{}/1/003".format(address)
+        dst_port = "{}/1/004".format(address)
+        self.driver_commands._mapping_check_delay = 0.1
+
+        connected_port_show_a = set_port_connected("E3", "W4", PORT_SHOW_MATRIX_A)
+        connected_port_show_a = set_port_connected("E4", "W3", connected_port_show_a)
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command(
+                    "connection create A3 to A4",
+                    """ROME[TECH]# connection create A3 to A4
+OK - request added to pending queue (A3-A4)
+ROME[TECH]# 08-06-2019 09:01 CONNECTING...
+08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E3[1AE3]<->W4[1AW4] OP:connect
+08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E4[1AE2]<->W3[1AW3] OP:connect
+08-06-2019 09:01 Connection A3<->A4 completed successfully
+""",
+                ),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command(
+                    "port show A3",
+                    """ROME[OPER]# port show A3
+Error: unknown port A3
+ROME[OPER]# """,
+                ),
+                Command("port show A4", "ROME[OPER]# port show A4\nROME[OPER]# "),
                 Command("port show", connected_port_show_a),
             ]
         )
@@ -502,7 +734,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
                 Command(
                     "connection disconnect A3 from A4",
                     """ROME[TECH]# connection disconnect A3 from A4
@@ -557,7 +790,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
                 Command("connection show pending", get_connection_pending("A3", "A4")),
                 Command("connection show pending", get_connection_pending("A3", "A4")),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -606,7 +840,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show),
+                Command("port show Q3", get_port_info("Q3", connected_port_show)),
+                Command("port show Q4", get_port_info("Q4", connected_port_show)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -653,7 +888,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", port_show_q1),
+                Command("port show P3", get_port_info("P3", port_show_q1)),
+                Command("port show P4", get_port_info("P4", port_show_q1)),
             ]
         )
         emu2 = CliEmulator(
@@ -673,7 +909,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", port_show_q2),
+                Command("port show P3", get_port_info("P3", port_show_q2)),
+                Command("port show P4", get_port_info("P4", port_show_q2)),
             ]
         )
         self.send_line_func_map.update(
@@ -723,7 +960,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", port_show_q1),
+                Command("port show P3", get_port_info("P3", port_show_q1)),
+                Command("port show P4", get_port_info("P4", port_show_q1)),
                 Command(
                     "connection disconnect P3 from P4",
                     """ROME[TECH]# connection disconnect E1 from W2
@@ -744,7 +982,8 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
                 Command("port show", PORT_SHOW_MATRIX_Q128_2),
                 Command("connection create P3 to P4", DEFAULT_PROMPT),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", PORT_SHOW_MATRIX_Q128_2),
+                Command("port show P3", get_port_info("P3", PORT_SHOW_MATRIX_Q128_2)),
+                Command("port show P4", get_port_info("P4", PORT_SHOW_MATRIX_Q128_2)),
                 Command("connection disconnect P3 from P4", DEFAULT_PROMPT),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
             ]
@@ -795,7 +1034,8 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", connected_port_show_a),
+                Command("port show X14", get_port_info("X14", connected_port_show_a)),
+                Command("port show Y13", get_port_info("Y13", connected_port_show_a)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -807,6 +1047,161 @@ ROME[TECH]# 08-06-2019 09:01 CONNECTING...
         emu.check_calls()
 
 
+@patch("cloudshell.cli.session.ssh_session.paramiko", MagicMock())
+@patch(
+    "cloudshell.cli.session.ssh_session.SSHSession._clear_buffer",
+    MagicMock(return_value=""),
+)
+class RomeTestMapBidiBatch(BaseRomeTestCase):
+    def test_map_bidi_batch(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+        port_pairs = [
+            ("{}/1/003".format(address), "{}/1/004".format(address)),
+            ("{}/1/005".format(address), "{}/1/006".format(address)),
+            ("{}/1/001".format(address), "{}/1/002".format(address)),
+        ]
+        self.driver_commands._mapping_check_delay = 0.1
+
+        connected_port_show_a = set_port_connected("E2", "W1", PORT_SHOW_MATRIX_A)
+        connected_port_show_a = set_port_connected("E3", "W4", connected_port_show_a)
+        connected_port_show_a = set_port_connected("E4", "W3", connected_port_show_a)
+        connected_port_show_a = set_port_connected("E5", "W6", connected_port_show_a)
+        connected_port_show_a = set_port_connected("E6", "W5", connected_port_show_a)
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command(
+                    "connection create A1 to A2",
+                    """ROME[TECH]# connection create A1 to A2
+OK - request added to pending queue (A1-A2)
+ROME[TECH]# 08-06-2019 09:01 CONNECTING...
+""",
+                ),
+                Command(
+                    "connection create A3 to A4",
+                    """ROME[TECH]# connection create A3 to A4
+OK - request added to pending queue (A3-A4)
+ROME[TECH]# """,
+                ),
+                Command(
+                    "connection create A5 to A6",
+                    """ROME[TECH]# connection create A5 to A6
+OK - request added to pending queue (A5-A6)
+ROME[TECH]# """,
+                ),
+                Command("connection show pending", get_connection_pending("A3", "A4")),
+                Command("connection show pending", get_connection_pending("A1", "A2")),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command("port show A1", get_port_info("A1", connected_port_show_a)),
+                Command("port show A2", get_port_info("A2", connected_port_show_a)),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
+                Command("port show A5", get_port_info("A5", connected_port_show_a)),
+                Command("port show A6", get_port_info("A6", connected_port_show_a)),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        errors = self.driver_commands.map_bidi_batch(port_pairs)
+
+        self.assertEqual([None, None, None], errors)
+        emu.check_calls()
+
+    def test_map_bidi_batch_with_connected_ports(self):
+        host = "192.168.122.10"
+        address = "{}:B".format(host)
+        user = "user"
+        password = "password"
+        port_pairs = [("{}/1/249".format(address), "{}/1/253".format(address))]
+
+        emu = CliEmulator(
+            [Command("", DEFAULT_PROMPT), Command("port show", PORT_SHOW_MATRIX_B)]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        self.driver_commands.map_bidi_batch(port_pairs)
+
+        emu.check_calls()
+
+    def test_map_bidi_batch_same_port(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        port_pairs = [
+            ("{}/1/003".format(address), "{}/1/004".format(address)),
+            ("{}/1/005".format(address), "{}/1/003".format(address)),
+        ]
+
+        with self.assertRaisesRegexp(
+            BaseRomeException, "Port A3 is used in a few connections"
+        ):
+            self.driver_commands.map_bidi_batch(port_pairs)
+
+    def test_map_bidi_batch_failed_pair(self):
+        host = "192.168.122.10"
+        address = "{}:A".format(host)
+        user = "user"
+        password = "password"
+        port_pairs = [
+            ("{}/1/003".format(address), "{}/1/004".format(address)),
+            ("{}/1/005".format(address), "{}/1/006".format(address)),
+        ]
+        self.driver_commands._mapping_check_delay = 0.1
+
+        connected_port_show_a = set_port_connected("E3", "W4", PORT_SHOW_MATRIX_A)
+        connected_port_show_a = set_port_connected("E4", "W3", connected_port_show_a)
+        connected_port_show_a = set_port_connected("E5", "W6", connected_port_show_a)
+        emu = CliEmulator(
+            [
+                Command("", DEFAULT_PROMPT),
+                Command("port show", PORT_SHOW_MATRIX_A),
+                Command(
+                    "connection create A3 to A4",
+                    """ROME[TECH]# connection create A3 to A4
+OK - request added to pending queue (A3-A4)
+ROME[TECH]# """,
+                ),
+                Command(
+                    "connection create A5 to A6",
+                    """ROME[TECH]# connection create A5 to A6
+OK - request added to pending queue (A5-A6)
+ROME[TECH]# """,
+                ),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+                Command("port show A3", get_port_info("A3", connected_port_show_a)),
+                Command("port show A4", get_port_info("A4", connected_port_show_a)),
+                Command("port show A5", get_port_info("A5", connected_port_show_a)),
+                Command("port show A6", get_port_info("A6", connected_port_show_a)),
+                Command(
+                    "connection disconnect A5 from A6",
+                    """ROME[TECH]# connection disconnect A5 from A6
+OK - request added to pending queue (A5-A6)
+ROME[TECH]# """,
+                ),
+                Command("connection show pending", CONNECTION_PENDING_EMPTY),
+            ]
+        )
+        self.send_line_func_map[host] = emu.send_line
+        self.receive_all_func_map[host] = emu.receive_all
+
+        self.driver_commands.login(address, user, password)
+        errors = self.driver_commands.map_bidi_batch(port_pairs)
+
+        self.assertIsNone(errors[0])
+        self.assertIsInstance(errors[1], ConnectionPortsError)
+        self.assertRegexpMatches(
+            str(errors[1]), r"Cannot connect ports A5 to A6 during"
+        )
+        emu.check_calls()
+
+
 @patch("cloudshell.cli.session.ssh_session.paramiko", MagicMock())
 @patch(
     "cloudshell.cli.session.ssh_session.SSHSession._clear_buffer",
@@ -857,7 +1252,21 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_b),
+                Command(
+                    "port show B218", get_port_info("B218", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B246", get_port_info("B246", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B247", get_port_info("B247", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B249", get_port_info("B249", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B253", get_port_info("B253", disconnected_port_show_b)
+                ),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -918,7 +1327,21 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
                     "connection show pending", get_connection_pending("E253", "W249")
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_b),
+                Command(
+                    "port show B218", get_port_info("B218", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B246", get_port_info("B246", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B247", get_port_info("B247", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B249", get_port_info("B249", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B253", get_port_info("B253", disconnected_port_show_b)
+                ),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -958,36 +1381,12 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,
                 ),
                 Command(
-                    "connection disconnect E129 from W132",
-                    """ROME[TECH]# connection disconnect E129 from W132
-OK - request added to pending queue (E129-W132)
+                    "connection disconnect E4 from W1",
+                    """ROME[TECH]# connection disconnect E4 from W1
+OK - request added to pending queue (E4-W1)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E129[1AE129]<->W2[1AW132] OP:disconnect
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E4[1AE4]<->W1[1AW1] OP:disconnect
 """,
-                ),
-                Command(
-                    "connection disconnect E130 from W131",
-                    """ROME[TECH]# connection disconnect E130 from W131
-OK - request added to pending queue (E130-W131)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1AE130]<->W131[1AW131] OP:disconnect
-""",  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E131 from W130",
-                    """ROME[TECH]# connection disconnect E131 from W130
-OK - request added to pending queue (E131-W130)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E131[1AE131]<->W130[1AW130] OP:disconnect
-""",  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E132 from W129",
-                    """ROME[TECH]# connection disconnect E132 from W129
-OK - request added to pending queue (E132-W129)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E132[1AE132]<->W129[1AW129] OP:disconnect
-""",  # noqa: E501
                 ),
                 Command(
                     "connection disconnect E2 from W3",
@@ -1006,15 +1405,40 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,
                 ),
                 Command(
-                    "connection disconnect E4 from W1",
-                    """ROME[TECH]# connection disconnect E4 from W1
-OK - request added to pending queue (E4-W1)
+                    "connection disconnect E129 from W132",
+                    """ROME[TECH]# connection disconnect E129 from W132
+OK - request added to pending queue (E129-W132)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E4[1AE4]<->W1[1AW1] OP:disconnect
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E129[1AE129]<->W2[1AW132] OP:disconnect
 """,
+                ),
+                Command(
+                    "connection disconnect E132 from W129",
+                    """ROME[TECH]# connection disconnect E132 from W129
+OK - request added to pending queue (E132-W129)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E132[1AE132]<->W129[1AW129] OP:disconnect
+""",  # noqa: E501
+                ),
+                Command(
+                    "connection disconnect E130 from W131",
+                    """ROME[TECH]# connection disconnect E130 from W131
+OK - request added to pending queue (E130-W131)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1AE130]<->W131[1AW131] OP:disconnect
+""",  # noqa: E501
+                ),
+                Command(
+                    "connection disconnect E131 from W130",
+                    """ROME[TECH]# connection disconnect E131 from W130
+OK - request added to pending queue (E131-W130)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E131[1AE131]<->W130[1AW130] OP:disconnect
+""",  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_ports_show),
+                Command("port show Q1", get_port_info("Q1", disconnected_ports_show)),
+                Command("port show Q2", get_port_info("Q2", disconnected_ports_show)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1053,6 +1477,14 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 OK - request added to pending queue (E1-W2)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E1[1AE1]<->W2[1AW2] OP:disconnect
+""",
+                ),
+                Command(
+                    "connection disconnect E2 from W1",
+                    """ROME[TECH]# connection disconnect E2 from W1
+OK - request added to pending queue (E2-W1)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
 """,
                 ),
                 Command(
@@ -1070,17 +1502,10 @@ OK - request added to pending queue (E130-W129)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1BE130]<->W129[1BW129] OP:disconnect
 """,  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E2 from W1",
-                    """ROME[TECH]# connection disconnect E2 from W1
-OK - request added to pending queue (E2-W1)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
-""",
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", ports_show_1),
+                Command("port show P1", get_port_info("P1", ports_show_1)),
+                Command("port show P2", get_port_info("P2", ports_show_1)),
             ]
         )
         emu2 = CliEmulator(
@@ -1093,6 +1518,14 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 OK - request added to pending queue (E1-W2)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E1[1AE1]<->W2[1AW2] OP:disconnect
+""",
+                ),
+                Command(
+                    "connection disconnect E2 from W1",
+                    """ROME[TECH]# connection disconnect E2 from W1
+OK - request added to pending queue (E2-W1)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
 """,
                 ),
                 Command(
@@ -1110,17 +1543,10 @@ OK - request added to pending queue (E130-W129)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1BE130]<->W129[1BW129] OP:disconnect
 """,  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E2 from W1",
-                    """ROME[TECH]# connection disconnect E2 from W1
-OK - request added to pending queue (E2-W1)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
-""",
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", ports_show_2),
+                Command("port show P1", get_port_info("P1", ports_show_2)),
+                Command("port show P2", get_port_info("P2", ports_show_2)),
             ]
         )
 
@@ -1167,6 +1593,14 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 OK - request added to pending queue (E1-W2)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E1[1AE1]<->W2[1AW2] OP:disconnect
+""",
+                ),
+                Command(
+                    "connection disconnect E2 from W1",
+                    """ROME[TECH]# connection disconnect E2 from W1
+OK - request added to pending queue (E2-W1)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
 """,
                 ),
                 Command(
@@ -1184,17 +1618,10 @@ OK - request added to pending queue (E130-W129)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1BE130]<->W129[1BW129] OP:disconnect
 """,  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E2 from W1",
-                    """ROME[TECH]# connection disconnect E2 from W1
-OK - request added to pending queue (E2-W1)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
-""",
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", ports_show_1),
+                Command("port show P1", get_port_info("P1", ports_show_1)),
+                Command("port show P2", get_port_info("P2", ports_show_1)),
             ]
         )
         emu2 = CliEmulator(
@@ -1207,6 +1634,14 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 OK - request added to pending queue (E1-W2)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E1[1AE1]<->W2[1AW2] OP:disconnect
+""",
+                ),
+                Command(
+                    "connection disconnect E2 from W1",
+                    """ROME[TECH]# connection disconnect E2 from W1
+OK - request added to pending queue (E2-W1)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
 """,
                 ),
                 Command(
@@ -1224,17 +1659,10 @@ OK - request added to pending queue (E130-W129)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1BE130]<->W129[1BW129] OP:disconnect
 """,  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E2 from W1",
-                    """ROME[TECH]# connection disconnect E2 from W1
-OK - request added to pending queue (E2-W1)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:disconnect
-""",
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", ports_show_2),
+                Command("port show P1", get_port_info("P1", ports_show_2)),
+                Command("port show P2", get_port_info("P2", ports_show_2)),
             ]
         )
 
@@ -1297,7 +1725,10 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_xy),
+                Command("port show X1", get_port_info("X1", disconnected_port_show_xy)),
+                Command("port show X7", get_port_info("X7", disconnected_port_show_xy)),
+                Command("port show Y1", get_port_info("Y1", disconnected_port_show_xy)),
+                Command("port show Y7", get_port_info("Y7", disconnected_port_show_xy)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1326,14 +1757,6 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
             [
                 Command("", DEFAULT_PROMPT),
                 Command("port show", PORT_SHOW_MATRIX_XY_CHANGED_PORT),
-                Command(
-                    "connection disconnect E130 from W130",
-                    """ROME[TECH]# connection disconnect E130 from W130
-OK - request added to pending queue (E130-W130)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1AE130]<->W130[1AW130] OP:disconnect
-""",  # noqa: E501
-                ),
                 Command(
                     "connection disconnect E2 from W2",
                     """ROME[TECH]# connection disconnect E2 from W2
@@ -1341,9 +1764,18 @@ OK - request added to pending queue (E2-W2)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W2[1AW2] OP:disconnect
 """,
+                ),
+                Command(
+                    "connection disconnect E130 from W130",
+                    """ROME[TECH]# connection disconnect E130 from W130
+OK - request added to pending queue (E130-W130)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1AE130]<->W130[1AW130] OP:disconnect
+""",  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_xy),
+                Command("port show X2", get_port_info("X2", disconnected_port_show_xy)),
+                Command("port show Y2", get_port_info("Y2", disconnected_port_show_xy)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1387,7 +1819,12 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_b),
+                Command(
+                    "port show B249", get_port_info("B249", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B253", get_port_info("B253", disconnected_port_show_b)
+                ),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1428,7 +1865,12 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
                     "connection show pending", get_connection_pending("E249", "W253")
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_b),
+                Command(
+                    "port show B249", get_port_info("B249", disconnected_port_show_b)
+                ),
+                Command(
+                    "port show B253", get_port_info("B253", disconnected_port_show_b)
+                ),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1462,6 +1904,14 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 OK - request added to pending queue (E1-W4)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E1[1AE1]<->W4[1AW4] OP:disconnect
+""",
+                ),
+                Command(
+                    "connection disconnect E2 from W3",
+                    """ROME[TECH]# connection disconnect E2 from W3
+OK - request added to pending queue (E2-W3)
+ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
+08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W3[1AW3] OP:disconnect
 """,
                 ),
                 Command(
@@ -1479,17 +1929,10 @@ OK - request added to pending queue (E130-W131)
 ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E130[1AE130]<->W131[1AW131] OP:disconnect
 """,  # noqa: E501
-                ),
-                Command(
-                    "connection disconnect E2 from W3",
-                    """ROME[TECH]# connection disconnect E2 from W3
-OK - request added to pending queue (E2-W3)
-ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
-08-05-2019 12:19 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W3[1AW3] OP:disconnect
-""",
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_ports_show),
+                Command("port show Q1", get_port_info("Q1", disconnected_ports_show)),
+                Command("port show Q2", get_port_info("Q2", disconnected_ports_show)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1537,7 +1980,8 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", ports_show_1),
+                Command("port show P1", get_port_info("P1", ports_show_1)),
+                Command("port show P2", get_port_info("P2", ports_show_1)),
             ]
         )
         emu2 = CliEmulator(
@@ -1561,7 +2005,8 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,  # noqa: E501
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", ports_show_2),
+                Command("port show P1", get_port_info("P1", ports_show_2)),
+                Command("port show P2", get_port_info("P2", ports_show_2)),
             ]
         )
 
@@ -1602,7 +2047,8 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
 """,
                 ),
                 Command("connection show pending", CONNECTION_PENDING_EMPTY),
-                Command("port show", disconnected_port_show_xy),
+                Command("port show X1", get_port_info("X1", disconnected_port_show_xy)),
+                Command("port show Y1", get_port_info("Y1", disconnected_port_show_xy)),
             ]
         )
         self.send_line_func_map[host] = emu.send_line
@@ -1612,3 +2058,78 @@ ROME[TECH]# 08-05-2019 12:19 DISCONNECTING...
         self.driver_commands.map_clear_to(src_port, dst_ports)
 
         emu.check_calls()
+
+
+class TestParsePendingConnections(TestCase):
+    def test_empty_pending(self):
+        pairs = parse_pending_connections(CONNECTION_PENDING_EMPTY)
+
+        self.assertEqual(set(), pairs)
+
+    def test_in_process_and_pending_requests(self):
+        output = get_connection_pending("e3", "W4").replace(
+            "======= ========= ========= ================== ======= ===================\n"
+            "\n",
+            "======= ========= ========= ================== ======= ===================\n"
+            "772     A1        A2        connect            CLI     admin\n",
+        )
+
+        pairs = parse_pending_connections(output)
+
+        self.assertIn(("E3", "W4"), pairs)
+        self.assertIn(("A1", "A2"), pairs)
+        self.assertNotIn(("A2", "A1"), pairs)
+
+    def test_pending_table_with_header(self):
+        output = CONNECTION_PENDING_EMPTY.replace(
+            "======= ========= ========= ================== ======= ===================\n"
+            "\n",
+            "======= ========= ========= ================== ======= ===================\n"
+            "772     A1        A2        connect            CLI     admin\n"
+            "773     A3        A4        disconnect         TL1     admin\n",
+        )
+
+        pairs = parse_pending_connections(output)
+
+        self.assertEqual({("A1", "A2"), ("A3", "A4")}, pairs)
+
+
+class TestWaitPortsNotInPendingConnections(TestCase):
+    def setUp(self):
+        self.cli_service = MagicMock()
+        self.cli_service.session.host = "192.168.122.10"
+        self.polling_schedule = MagicMock()
+        self.polling_schedule.get_delay.return_value = 3
+        self.mapping_actions = MappingActions(
+            [self.cli_service],
+            MagicMock(),
+            120,
+            3,
+            polling_schedule=self.polling_schedule,
+        )
+        self.mapping_actions.ports_in_pending_connections = MagicMock(
+            return_value=False
+        )
+        self.tracker = self.cli_service.session.completion_tracker
+
+    @patch("w2w_rome.command_actions.mapping_actions.time")
+    def test_learn_time_of_the_notice(self, time_mock):
+        time_mock.time.return_value = 100.0
+        self.tracker.get_completion_time.return_value = 104.5
+
+        self.mapping_actions.wait_ports_not_in_pending_connections(
+            self.cli_service, [("A3", "A4")], 1, "A"
+        )
+
+        self.polling_schedule.add_operation.assert_called_once_with(
+            "192.168.122.10", "A", 4.5, 1
+        )
+
+    def test_do_not_learn_without_notice(self):
+        self.tracker.get_completion_time.return_value = None
+
+        self.mapping_actions.wait_ports_not_in_pending_connections(
+            self.cli_service, [("A3", "A4")], 1, "A"
+        )
+
+        self.polling_schedule.add_operation.assert_not_called()
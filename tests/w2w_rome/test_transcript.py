@@ -0,0 +1,161 @@
+import os
+import shutil
+import tempfile
+import time
+from unittest import TestCase
+
+from mock import MagicMock
+
+from w2w_rome.cli import transcript
+from w2w_rome.cli.rome_sessions import RomeReplaySession
+from w2w_rome.helpers.errors import TranscriptReplayError
+
+PROMPT = r"ROME\[OPER\]#"
+BANNER = "\nWelcome to ROME\n\nROME[OPER]# "
+SHOW_BOARD = "show board\nROME TYPE        ROME500\nROME[OPER]# "
+
+
+def create_transcript(host="192.168.1.2"):
+    transcript_ = transcript.Transcript()
+    connect = transcript.Exchange(None)
+    connect.chunks.append((0.0, BANNER))
+    transcript_.add_exchange(host, connect)
+    show_board = transcript.Exchange("show board")
+    show_board.chunks.extend([(0.1, SHOW_BOARD[:20]), (0.2, SHOW_BOARD[20:])])
+    transcript_.add_exchange(host, show_board)
+    return transcript_
+
+
+class TestTranscript(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.tmp_dir, "rome.jsonl.gz")
+        self.logger = MagicMock()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_record_and_load(self):
+        recorder = transcript.TranscriptRecorder(self.file_path)
+        session_id = recorder.open_session("SSH", "192.168.1.2")
+        recorder.record(session_id, transcript.RECEIVE, BANNER)
+        recorder.record(
+            session_id,
+            transcript.SEND,
+            transcript.get_command_key("password\r", "password"),
+        )
+        recorder.record(session_id, transcript.SEND, "show board\r")
+        recorder.record(session_id, transcript.RECEIVE, SHOW_BOARD)
+        recorder.record(session_id, transcript.CLOSE)
+        recorder.close()
+
+        transcript_ = transcript.Transcript.load(self.file_path)
+
+        self.assertEqual(["192.168.1.2"], transcript_.hosts)
+        connect = transcript_.get_exchange("192.168.1.2", None)
+        self.assertEqual([BANNER], [data for _, data in connect.chunks])
+        password = transcript_.get_exchange("192.168.1.2", transcript.PASSWORD_MASK)
+        self.assertEqual([], password.chunks)
+        show_board = transcript_.get_exchange("192.168.1.2", "show board")
+        self.assertEqual([SHOW_BOARD], [data for _, data in show_board.chunks])
+        self.assertIsNone(transcript_.get_exchange("192.168.1.3", "show board"))
+
+    def test_last_exchange_repeated(self):
+        transcript_ = create_transcript()
+        first = transcript_.get_exchange("192.168.1.2", "show board")
+
+        self.assertIs(first, transcript_.get_exchange("192.168.1.2", "show board"))
+
+    def test_replay_session(self):
+        session = RomeReplaySession(
+            "192.168.1.2",
+            "user",
+            "password",
+            transcript=create_transcript(),
+            time_scale=0,
+        )
+        session.connect(PROMPT, self.logger)
+
+        output = session.hardware_expect("show board", PROMPT, self.logger)
+
+        self.assertIn("ROME TYPE        ROME500", output)
+        self.assertRaisesRegexp(
+            TranscriptReplayError,
+            "doesn't have an answer to 'port show'",
+            session.hardware_expect,
+            "port show",
+            PROMPT,
+            self.logger,
+        )
+
+    def test_replay_session_timing(self):
+        session = RomeReplaySession(
+            "192.168.1.2",
+            "user",
+            "password",
+            transcript=create_transcript(),
+            time_scale=0.5,
+        )
+        session.connect(PROMPT, self.logger)
+
+        start_time = time.time()
+        session.hardware_expect("show board", PROMPT, self.logger)
+
+        self.assertGreaterEqual(time.time() - start_time, 0.1)
+
+    def test_session_records_transcript(self):
+        session = RomeReplaySession(
+            "192.168.1.2",
+            "user",
+            "password",
+            transcript=create_transcript(),
+            time_scale=0,
+        )
+        session.transcript_recorder = transcript.TranscriptRecorder(self.file_path)
+        session.connect(PROMPT, self.logger)
+        session.hardware_expect("show board", PROMPT, self.logger)
+        session.disconnect()
+        session.transcript_recorder.close()
+
+        session = RomeReplaySession(
+            "192.168.1.2",
+            "user",
+            "password",
+            transcript=transcript.Transcript.load(self.file_path),
+            time_scale=0,
+        )
+        session.connect(PROMPT, self.logger)
+        output = session.hardware_expect("show board", PROMPT, self.logger)
+
+        self.assertIn("ROME TYPE        ROME500", output)
+
+    def test_record_not_utf8_data(self):
+        data = "port show\n\xff\xfe E1[1AE1]\nROME[OPER]# "
+        recorder = transcript.TranscriptRecorder(self.file_path)
+        session_id = recorder.open_session("SSH", "192.168.1.2")
+        recorder.record(session_id, transcript.SEND, "port show\r")
+        recorder.record(session_id, transcript.RECEIVE, data)
+        recorder.close()
+
+        transcript_ = transcript.Transcript.load(self.file_path)
+
+        port_show = transcript_.get_exchange("192.168.1.2", "port show")
+        self.assertEqual([data], [data_ for _, data_ in port_show.chunks])
+
+    def test_recorder_error_doesnt_break_session(self):
+        session = RomeReplaySession(
+            "192.168.1.2",
+            "user",
+            "password",
+            transcript=create_transcript(),
+            time_scale=0,
+        )
+        session.transcript_recorder = MagicMock()
+        session.transcript_recorder.record.side_effect = IOError("No space left")
+        session.connect(PROMPT, self.logger)
+
+        output = session.hardware_expect("show board", PROMPT, self.logger)
+
+        self.assertIn("ROME TYPE        ROME500", output)
+        # recording is stopped after the first error
+        session.transcript_recorder.record.assert_called_once()
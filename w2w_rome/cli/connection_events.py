@@ -0,0 +1,167 @@
+import time
+from collections import deque
+from threading import Lock
+
+
+class ConnectionEvent(object):
+    """Connection log line that the device writes into the session.
+
+    "08-06-2019 09:01 Connection A3<->A4 completed successfully" is a completed
+    event of logical ports, "08-06-2019 09:01 CONNECTION OPERATION
+    SUCCEEDED:E3[1AE3]<->W4[1AW4] OP:connect" is an operation event of sub ports.
+    """
+
+    COMPLETED = "completed"
+    OPERATION = "operation"
+
+    __slots__ = ("kind", "time", "src", "dst", "status", "operation", "line")
+
+    def __init__(self, kind, time, src, dst, status, operation=None, line=None):
+        """Connection event.
+
+        :type kind: str
+        :param time: time from the device, e.g. "08-06-2019 09:01"
+        :type time: str
+        :param src: logical port name or sub port name for operation events
+        :type src: str
+        :type dst: str
+        :param status: e.g. "successfully", "SUCCEEDED", "SKIPPED(already done)"
+        :type status: str
+        :param operation: connect or disconnect for operation events
+        :type operation: str
+        :param line: the log line
+        :type line: str
+        """
+        self.kind = kind
+        self.time = time
+        self.src = src
+        self.dst = dst
+        self.status = status
+        self.operation = operation
+        self.line = line
+
+    def __repr__(self):
+        return "<ConnectionEvent {0.kind} {0.src}<->{0.dst} {0.status}>".format(self)
+
+    @classmethod
+    def from_match(cls, match):
+        """Create the event from the match of the log line pattern.
+
+        :type match: typing.Match
+        :rtype: ConnectionEvent
+        """
+        if match.group("src"):
+            return cls(
+                cls.COMPLETED,
+                match.group("time"),
+                match.group("src").upper(),
+                match.group("dst").upper(),
+                match.group("status"),
+                line=match.group(0),
+            )
+        return cls(
+            cls.OPERATION,
+            match.group("time"),
+            match.group("src_sub_port").upper(),
+            match.group("dst_sub_port").upper(),
+            match.group("operation_status"),
+            match.group("operation").lower(),
+            line=match.group(0),
+        )
+
+
+class EventChannel(object):
+    """Deliver connection events of the session to the subscribers.
+
+    The last events are kept for the subscribers that look at them later.
+    """
+
+    MAX_EVENTS = 1000
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self._lock = Lock()
+        self._subscribers = []
+        self.events = deque(maxlen=max_events)
+
+    def subscribe(self, callback):
+        """Call the function with every new event.
+
+        :param callback: takes ConnectionEvent
+        :type callback: function
+        """
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, event):
+        """Send the event to the subscribers.
+
+        :type event: ConnectionEvent
+        """
+        with self._lock:
+            self.events.append(event)
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            callback(event)
+
+
+class ConnectionCompletionTracker(object):
+    """Track "Connection X<->Y completed" events of the session."""
+
+    def __init__(self):
+        self._lock = Lock()
+        self._completed = {}  # <frozenset of port names>: <time received>
+
+    @staticmethod
+    def _key(src_port_name, dst_port_name):
+        return frozenset((src_port_name.upper(), dst_port_name.upper()))
+
+    def on_event(self, event):
+        """Remember ports of the completed connection and when it's notified.
+
+        :type event: ConnectionEvent
+        """
+        if event.kind == ConnectionEvent.COMPLETED:
+            with self._lock:
+                self._completed[self._key(event.src, event.dst)] = time.time()
+
+    def expect(self, port_names):
+        """Forget previous notices for the ports before sending a new request.
+
+        :type port_names: list[tuple[str, str]]
+        """
+        with self._lock:
+            for src, dst in port_names:
+                self._completed.pop(self._key(src, dst), None)
+
+    def is_completed(self, port_names):
+        """Check that notices for all port pairs are received.
+
+        :type port_names: list[tuple[str, str]]
+        :rtype: bool
+        """
+        with self._lock:
+            return all(
+                self._key(src, dst) in self._completed for src, dst in port_names
+            )
+
+    def get_completion_time(self, port_names):
+        """Time when the last notice for the port pairs was received.
+
+        The device writes times to the log lines in minutes, so the time is
+        taken when the notice is received.
+        :type port_names: list[tuple[str, str]]
+        :return: None if not all notices are received
+        :rtype: float|None
+        """
+        with self._lock:
+            times = [
+                self._completed.get(self._key(src, dst)) for src, dst in port_names
+            ]
+        if None in times:
+            return None
+        return max(times)
@@ -1,28 +1,52 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
 
+import threading
+import time
+
 from cloudshell.cli.cli import CLI
-from cloudshell.cli.session_pool_manager import SessionPoolManager
+from cloudshell.cli.command_mode_helper import CommandModeHelper
 from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
 from cloudshell.layer_one.core.layer_one_driver_exception import LayerOneDriverException
 
-from w2w_rome.cli.rome_sessions import RomeSSHSession, RomeTelnetSession
+from w2w_rome.cli.rome_sessions import (
+    RomeReplaySession,
+    RomeSSHSession,
+    RomeTelnetSession,
+)
+from w2w_rome.cli.session_pool import RomeSessionPoolManager
 
 
 class L1CliHandler(object):
     def __init__(self, logger):
         self._logger = logger
-        self._cli = CLI(session_pool=SessionPoolManager(max_pool_size=1))
+        pool_size = RuntimeConfiguration().read_key("CLI.POOL_SIZE", 1)
+        # one session of the bigger pool is kept for the commands that only read
+        # the device, so they don't wait for the mapping in other sessions
+        self._read_only_pool = None
+        self._read_only_cli = None
+        if pool_size > 1:
+            self._read_only_pool = RomeSessionPoolManager()
+            self._read_only_cli = CLI(session_pool=self._read_only_pool)
+            pool_size -= 1
+        self._session_pool = RomeSessionPoolManager(max_pool_size=pool_size)
+        self._cli = CLI(session_pool=self._session_pool)
         self._defined_session_types = {
             "SSH": RomeSSHSession,
             "TELNET": RomeTelnetSession,
+            # answers from the transcript in TRANSCRIPT.REPLAY_FILE
+            "REPLAY": RomeReplaySession,
         }
 
-        self._session_types = (
-            RuntimeConfiguration().read_key("CLI.TYPE")
-            or self._defined_session_types.keys()
-        )
+        self._session_types = RuntimeConfiguration().read_key("CLI.TYPE") or [
+            "SSH",
+            "TELNET",
+        ]
         self._ports = RuntimeConfiguration().read_key("CLI.PORTS")
+        self._keepalive_interval = RuntimeConfiguration().read_key(
+            "CLI.KEEPALIVE_INTERVAL", 0
+        )
+        self._keepalive_thread = None
 
         self._host = None
         self._username = None
@@ -54,11 +78,60 @@ class L1CliHandler(object):
         self._username = username
         self._password = password
 
-    def get_cli_service(self, command_mode):
-        """Create new cli service or get it from pool."""
+    def _check_session_attributes(self):
         if not self._host or not self._username or not self._password:
             raise LayerOneDriverException(
                 self.__class__.__name__,
                 "Cli Attributes is not defined, call Login command first",
             )
-        return self._cli.get_session(self._new_sessions(), command_mode, self._logger)
+
+    @property
+    def _session_pools(self):
+        session_pools = [self._session_pool]
+        if self._read_only_pool is not None:
+            session_pools.append(self._read_only_pool)
+        return session_pools
+
+    def _keepalive(self):
+        while True:
+            time.sleep(self._keepalive_interval)
+            for session_pool in self._session_pools:
+                try:
+                    session_pool.keepalive(self._keepalive_interval, self._logger)
+                except Exception:
+                    self._logger.exception("Failed to keep sessions alive")
+
+    def warm_up(self, command_mode):
+        """Open all sessions of the pool and keep them alive.
+
+        :type command_mode: cloudshell.cli.command_mode.CommandMode
+        """
+        self._check_session_attributes()
+        prompts_re = r"|".join(
+            CommandModeHelper.defined_modes_by_prompt(command_mode).keys()
+        )
+        opened = sum(
+            session_pool.warm_up(self._new_sessions(), prompts_re, self._logger)
+            for session_pool in self._session_pools
+        )
+        self._logger.debug("Opened {} sessions to {}".format(opened, self._host))
+
+        if self._keepalive_interval and self._keepalive_thread is None:
+            self._keepalive_thread = threading.Thread(
+                target=self._keepalive, name="RomeKeepalive-{}".format(self._host)
+            )
+            self._keepalive_thread.daemon = True
+            self._keepalive_thread.start()
+
+    def get_cli_service(self, command_mode, read_only=False):
+        """Create new cli service or get it from pool.
+
+        :param read_only: the commands don't change the device, the session
+            kept for them is used if the pool has it
+        :type read_only: bool
+        """
+        self._check_session_attributes()
+        cli = self._cli
+        if read_only and self._read_only_cli is not None:
+            cli = self._read_only_cli
+        return cli.get_session(self._new_sessions(), command_mode, self._logger)
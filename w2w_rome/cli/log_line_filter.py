@@ -0,0 +1,111 @@
+from cloudshell.cli.helper.normalize_buffer import normalize_buffer
+
+from w2w_rome.cli.connection_events import ConnectionEvent
+from w2w_rome.helpers import patterns
+
+
+class LogLineFilter(object):
+    """Separate connection log lines from the command output as data arrives.
+
+    The device writes log lines at any time, even in the middle of the line of
+    the command output. The log line is removed with the new line before it and
+    the new lines after it, so the broken line is joined back. Removed log
+    lines are published to the event channel.
+
+    The data is normalized as the CLI does it with the whole output, colors
+    are removed and CRLF is replaced with LF, so log lines are matched in the
+    same text as the output patterns.
+    """
+
+    def __init__(self, event_channel=None):
+        """Log line filter.
+
+        :type event_channel: w2w_rome.cli.connection_events.EventChannel
+        """
+        self._event_channel = event_channel
+        # the last line that can be the beginning of the log line, the data
+        # starts from the new line but it isn't added to the output
+        self._pending = "\n"
+        self._skip_new_lines = True
+        # CR at the end of the data can be the first half of CRLF
+        self._carriage_return = ""
+
+    def _normalize(self, data):
+        data = self._carriage_return + data
+        self._carriage_return = ""
+        if data.endswith("\r"):
+            data, self._carriage_return = data[:-1], "\r"
+        return normalize_buffer(data)
+
+    def _publish(self, match):
+        if self._event_channel is not None:
+            self._event_channel.publish(ConnectionEvent.from_match(match))
+
+    def feed(self, data):
+        """Filter the data received from the device.
+
+        The last unfinished line is kept till the next data if it can be the
+        beginning of the log line.
+        :type data: str
+        :return: data without log lines
+        :rtype: str
+        """
+        text = self._pending + self._normalize(data)
+        self._pending = ""
+        pos = text.find("\n")
+        if pos < 0:
+            return text
+
+        output = [text[:pos]]
+        while pos >= 0:
+            end = text.find("\n", pos + 1)
+            if end < 0:
+                line = text[pos + 1 :]
+                if patterns.LOG_LINE_START.match(line):
+                    self._pending = text[pos:]
+                else:
+                    if not self._skip_new_lines:
+                        output.append("\n")
+                    output.append(line)
+                    self._skip_new_lines = False
+                break
+
+            line = text[pos + 1 : end]
+            # log lines start with a date, other lines are not matched
+            match = line[:1].isdigit() and patterns.LOG_LINE.match(line)
+            if match:
+                self._publish(match)
+                self._skip_new_lines = True
+            elif line or not self._skip_new_lines:
+                if not self._skip_new_lines:
+                    output.append("\n")
+                output.append(line)
+                self._skip_new_lines = False
+            pos = end
+        return "".join(output)
+
+    def flush(self):
+        """Return the kept data when no more data is expected.
+
+        :rtype: str
+        """
+        pending, self._pending = self._pending, "\n"
+        line = pending[1:]
+        match = line[:1].isdigit() and patterns.LOG_LINE.match(line)
+        if match:
+            self._publish(match)
+            pending = ""
+        elif self._skip_new_lines:
+            pending = line
+        self._skip_new_lines = True
+        pending += self._carriage_return
+        self._carriage_return = ""
+        return pending
+
+    def filter_output(self, output):
+        """Remove log lines from the whole output.
+
+        :type output: str
+        :rtype: str
+        """
+        return self.feed(output) + self.flush()
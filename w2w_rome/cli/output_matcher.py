@@ -0,0 +1,49 @@
+import re
+
+
+class OutputMatcher(object):
+    """Match patterns in the data received by the session as it arrives.
+
+    Every received chunk is searched once, only the unfinished last line is
+    kept to find patterns split between chunks. Matched patterns are kept till
+    they are taken.
+    """
+
+    # the end of the last line is kept to find patterns split between chunks
+    MAX_TAIL_SIZE = 1024
+
+    def __init__(self, patterns):
+        """Output matcher.
+
+        :param patterns: regex strings, a pattern is returned as given
+        :type patterns: list[str]
+        """
+        self._patterns = [(pattern, re.compile(pattern)) for pattern in patterns]
+        self._tail = ""
+        self._matched = set()
+
+    def feed(self, data):
+        """Search patterns in the received data.
+
+        :type data: str
+        """
+        if not data:
+            return
+
+        text = self._tail + data
+        for pattern, regex in self._patterns:
+            if pattern not in self._matched and regex.search(text):
+                self._matched.add(pattern)
+        self._tail = text[text.rfind("\n") + 1 :][-self.MAX_TAIL_SIZE :]
+
+    def pop_matched(self):
+        """Return patterns matched since the last call.
+
+        :rtype: set[str]
+        """
+        matched, self._matched = self._matched, set()
+        return matched
+
+    def clear(self):
+        self._tail = ""
+        self._matched = set()
@@ -0,0 +1,38 @@
+from w2w_rome.helpers import patterns
+
+
+class PromptDetector(object):
+    """Find the prompt at the end of the output.
+
+    The device can write connection log lines after the prompt. Only the lines
+    at the end of the output are checked: log lines are skipped from the end
+    and the first other line has to be the prompt. Every line is matched
+    separately, so the time doesn't grow with the output.
+    """
+
+    def __init__(
+        self, prompt_line=patterns.PROMPT_LINE, log_line=patterns.LOG_ONLY_LINE
+    ):
+        self._prompt_line = prompt_line
+        self._log_line = log_line
+
+    def match(self, output):
+        """Check that the output ends with the prompt.
+
+        :type output: str
+        :rtype: bool
+        """
+        end = len(output)
+        while end >= 0:
+            start = output.rfind("\n", 0, end) + 1
+            line = output[start:end]
+            # log lines don't have "#", the prompt search is skipped for them
+            if "#" in line and self._prompt_line.search(line):
+                return True
+            if not self._log_line.match(line):
+                return False
+            end = start - 1
+        return False
+
+
+DEFAULT_PROMPT_DETECTOR = PromptDetector()
@@ -15,9 +15,14 @@ class RomeCliHandler(L1CliHandler):
     def _default_mode(self):
         return self.modes[DefaultCommandMode]
 
-    def default_mode_service(self):
+    def default_mode_service(self, read_only=False):
         """Default mode session.
 
+        :type read_only: bool
         :rtype: cloudshell.cli.cli_service.CliService
         """
-        return self.get_cli_service(self._default_mode)
+        return self.get_cli_service(self._default_mode, read_only)
+
+    def warm_up_default_mode(self):
+        """Open all sessions of the pool in default mode."""
+        self.warm_up(self._default_mode)
@@ -1,20 +1,152 @@
+import time
 from collections import OrderedDict
 
+from cloudshell.cli.session.session_exceptions import (
+    SessionReadEmptyData,
+    SessionReadTimeout,
+)
 from cloudshell.cli.session.ssh_session import SSHSession
 from cloudshell.cli.session.telnet_session import TelnetSession
 
+from w2w_rome.cli import transcript
+from w2w_rome.cli.connection_events import ConnectionCompletionTracker, EventChannel
+from w2w_rome.cli.log_line_filter import LogLineFilter
+from w2w_rome.cli.output_matcher import OutputMatcher
+from w2w_rome.cli.prompt_detector import DEFAULT_PROMPT_DETECTOR
+from w2w_rome.cli.rome_command_modes import DefaultCommandMode
+from w2w_rome.helpers import patterns
+from w2w_rome.helpers.metrics import get_metrics
+from w2w_rome.helpers.tracing import get_tracer
 
-class RomeTelnetSession(TelnetSession):
+
+class RomeSessionMixin(object):
+    """Keep data received from the device and watch for connection notices.
+
+    Connection log lines are removed from the received data and published to
+    the event channel. Sent and received data is written to the transcript if
+    recording is enabled.
+    """
+
+    transcript_recorder = None
+    _transcript_session_id = None
+    # patterns of the device failures that are checked between the commands
+    WATCHED_PATTERNS = (patterns.CONNECTION_PENDING_SEVERE_FAILURE.pattern,)
+    MAX_UNREAD_OUTPUT_SIZE = 256 * 1024
+
+    def _init_rome_session(self):
+        self.output_matcher = OutputMatcher(self.WATCHED_PATTERNS)
+        # output read while waiting for notices, it's returned by the next read
+        self._unread_output = ""
+        self.event_channel = EventChannel()
+        self.log_filter = LogLineFilter(self.event_channel)
+        self.completion_tracker = ConnectionCompletionTracker()
+        self.event_channel.subscribe(self.completion_tracker.on_event)
+        self.transcript_recorder = transcript.get_transcript_recorder()
+
+    def _record(self, kind, data=""):
+        if self._transcript_session_id is None:
+            return
+        try:
+            self.transcript_recorder.record(self._transcript_session_id, kind, data)
+        except Exception:
+            # recording never breaks the session, it's stopped for the session
+            self._transcript_session_id = None
+            transcript.logger.exception(
+                "Failed to record the session to {}".format(self.host)
+            )
+
+    def connect(self, prompt, logger):
+        self._unread_output = ""
+        if self.transcript_recorder is not None:
+            try:
+                self._transcript_session_id = self.transcript_recorder.open_session(
+                    self.session_type, self.host
+                )
+            except Exception:
+                transcript.logger.exception(
+                    "Failed to record the session to {}".format(self.host)
+                )
+        super(RomeSessionMixin, self).connect(prompt, logger)
+
+    def disconnect(self):
+        super(RomeSessionMixin, self).disconnect()
+        self._record(transcript.CLOSE)
+        self._transcript_session_id = None
+
+    def _send(self, command, logger):
+        get_metrics().increment("device_round_trips", host=self.host)
+        if self._transcript_session_id is not None:
+            self._record(
+                transcript.SEND, transcript.get_command_key(command, self.password)
+            )
+        super(RomeSessionMixin, self)._send(command, logger)
+
+    def _receive(self, timeout, logger):
+        if self._unread_output:
+            data, self._unread_output = self._unread_output, ""
+            return data
+        return self._receive_from_device(timeout, logger)
+
+    def _receive_from_device(self, timeout, logger):
+        data = super(RomeSessionMixin, self)._receive(timeout, logger)
+        return self._on_data_received(data)
+
+    def hardware_expect(self, command, expected_string, logger, *args, **kwargs):
+        with get_tracer().span("expect", "session", host=self.host, command=command):
+            return super(RomeSessionMixin, self).hardware_expect(
+                command, expected_string, logger, *args, **kwargs
+            )
+
+    def match_prompt(self, prompt, match_string, logger):
+        if prompt == DefaultCommandMode.PROMPT:
+            # the regex of the prompt backtracks a lot on the long outputs
+            return DEFAULT_PROMPT_DETECTOR.match(match_string)
+        return super(RomeSessionMixin, self).match_prompt(prompt, match_string, logger)
+
+    def _on_data_received(self, data):
+        """Match watched patterns in the received data and remove log lines.
+
+        :type data: str
+        :return: data without log lines
+        :rtype: str
+        """
+        self._record(transcript.RECEIVE, data)
+        get_metrics().increment("device_bytes_received", len(data), host=self.host)
+        self.output_matcher.feed(data)
+        return self.log_filter.feed(data)
+
+    def wait_connections_completed(self, port_names, timeout, logger):
+        """Read the session until notices for all port pairs are received.
+
+        Output without the notices is kept for the next command of the session.
+        :type port_names: list[tuple[str, str]]
+        :type timeout: float
+        :type logger: logging.Logger
+        :return: True if the device notified that all connections completed
+        :rtype: bool
+        """
+        end_time = time.time() + timeout
+        with get_tracer().span("wait_notices", "session", host=self.host):
+            while not self.completion_tracker.is_completed(port_names):
+                time_left = end_time - time.time()
+                if time_left <= 0:
+                    return False
+                try:
+                    output = self._receive_from_device(time_left, logger)
+                except (SessionReadTimeout, SessionReadEmptyData):
+                    continue
+                self._unread_output = (self._unread_output + output)[
+                    -self.MAX_UNREAD_OUTPUT_SIZE :
+                ]
+        return True
+
+
+class RomeTelnetSession(RomeSessionMixin, TelnetSession):
     def __init__(self, host, username, password, *args, **kwargs):
         super(RomeTelnetSession, self).__init__(
             host, username, password, *args, **kwargs
         )
-        self.full_buffer = ""
-
-    def _receive(self, timeout, logger):
-        data = super(RomeTelnetSession, self)._receive(timeout, logger)
-        self.full_buffer += data
-        return data
+        self._init_rome_session()
 
     def _connect_actions(self, prompt, logger):
         action_map = OrderedDict()
@@ -36,12 +168,15 @@ class RomeTelnetSession(TelnetSession):
         self._on_session_start(logger)
 
 
-class RomeSSHSession(SSHSession):
+class RomeSSHSession(RomeSessionMixin, SSHSession):
     def __init__(self, host, username, password, *args, **kwargs):
         super(RomeSSHSession, self).__init__(host, username, password, *args, **kwargs)
-        self.full_buffer = ""
+        self._init_rome_session()
 
-    def _receive(self, timeout, logger):
-        data = super(RomeSSHSession, self)._receive(timeout, logger)
-        self.full_buffer += data
-        return data
+
+class RomeReplaySession(RomeSessionMixin, transcript.ReplaySession):
+    def __init__(self, host, username, password, *args, **kwargs):
+        super(RomeReplaySession, self).__init__(
+            host, username, password, *args, **kwargs
+        )
+        self._init_rome_session()
@@ -0,0 +1,93 @@
+import time
+
+from cloudshell.cli.session_manager_impl import SessionManagerImpl
+from cloudshell.cli.session_pool_manager import SessionPoolManager
+from Queue import Empty
+
+
+class RomeSessionPoolManager(SessionPoolManager):
+    """Pool of sessions to one host.
+
+    Sessions can be opened in advance and idle sessions are kept alive, so
+    commands don't wait for the login to the device.
+    """
+
+    def __init__(self, max_pool_size=1):
+        # every pool counts only its own sessions
+        super(RomeSessionPoolManager, self).__init__(
+            session_manager=SessionManagerImpl(), max_pool_size=max_pool_size
+        )
+        self._prompt = None
+
+    @property
+    def max_pool_size(self):
+        return self._max_pool_size
+
+    def get_session(self, new_sessions, prompt, logger):
+        self._prompt = prompt
+        return super(RomeSessionPoolManager, self).get_session(
+            new_sessions, prompt, logger
+        )
+
+    def return_session(self, session, logger):
+        session.last_used = time.time()
+        super(RomeSessionPoolManager, self).return_session(session, logger)
+
+    def warm_up(self, new_sessions, prompt, logger):
+        """Open sessions till the pool is full.
+
+        :type new_sessions: list[cloudshell.cli.session.session.Session]
+        :type prompt: str
+        :type logger: logging.Logger
+        :return: number of opened sessions
+        :rtype: int
+        """
+        self._prompt = prompt
+        opened = 0
+        with self._session_condition:
+            while self._session_manager.existing_sessions_count() < self._pool.maxsize:
+                session = self._new_session(new_sessions, prompt, logger)
+                self.return_session(session, logger)
+                opened += 1
+        return opened
+
+    def _take_idle_sessions(self, idle_time):
+        idle_sessions = []
+        busy_sessions = []
+        with self._session_condition:
+            while True:
+                try:
+                    session = self._pool.get(False)
+                except Empty:
+                    break
+                if time.time() - getattr(session, "last_used", 0) >= idle_time:
+                    idle_sessions.append(session)
+                else:
+                    busy_sessions.append(session)
+            for session in busy_sessions:
+                self._pool.put(session)
+        return idle_sessions
+
+    def keepalive(self, idle_time, logger):
+        """Send an empty line to the sessions that are idle for a long time.
+
+        Sessions that don't respond are closed and removed from the pool.
+        :param idle_time: seconds since the session was used last time
+        :type idle_time: float
+        :type logger: logging.Logger
+        """
+        if self._prompt is None:
+            return
+
+        for session in self._take_idle_sessions(idle_time):
+            try:
+                session.hardware_expect("", expected_string=self._prompt, logger=logger)
+            except Exception:
+                logger.debug("Session to {} is broken".format(session.host))
+                self.remove_session(session, logger)
+                try:
+                    session.disconnect()
+                except Exception:
+                    pass
+            else:
+                self.return_session(session, logger)
@@ -1,26 +1,18 @@
-import re
-
 from cloudshell.cli.command_template.command_template_executor import (
     CommandTemplateExecutor,
 )
 
+from w2w_rome.helpers.metrics import get_metrics
+
 
 class RomeTemplateExecutor(CommandTemplateExecutor):
-    @staticmethod
-    def remove_logs_from_output(output):
-        date_pattern = r"\d+-\d+-\d+\s\d+:\d+"
-        pattern = re.compile(
-            r"\n{}\s"
-            r"("
-            r"(connection \w+<->\w+\scompleted\s\w+ *)"
-            r"|(connection operation [\w( )]+:[\w\[\]]+<->[\w\[\]]+ OP:\w+ *)"
-            r")\n+".format(date_pattern),
-            flags=re.IGNORECASE,
-        )
-        return pattern.sub("", output)
+    # log lines are removed by the session while the output is received
 
-    def execute_command(self, remove_logs=True, **command_kwargs):
-        output = super(RomeTemplateExecutor, self).execute_command(**command_kwargs)
-        if remove_logs:
-            output = self.remove_logs_from_output(output)
-        return output
+    def execute_command(self, **command_kwargs):
+        # labeled by the template, not the command with port names
+        with get_metrics().timer(
+            "cli_command",
+            host=self._cli_service.session.host,
+            command=self._command_template._command,
+        ):
+            return super(RomeTemplateExecutor, self).execute_command(**command_kwargs)
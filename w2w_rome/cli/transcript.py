@@ -0,0 +1,382 @@
+import atexit
+import gzip
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+
+from cloudshell.cli.session.connection_params import ConnectionParams
+from cloudshell.cli.session.expect_session import ExpectSession
+from cloudshell.cli.session.session_exceptions import SessionReadTimeout
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
+
+from w2w_rome.helpers.errors import TranscriptReplayError
+
+# Transcript is a JSON lines file, gzipped if the name ends with .gz. The first
+# line is the header, the next ones are records of the sessions:
+# [<ms since start>, <session id>, <kind>, <data>]
+# Data bytes are written as latin-1 text, the device can send any bytes.
+TRANSCRIPT_VERSION = 2
+# version 1 wrote data as UTF-8
+DATA_ENCODINGS = {1: "utf-8", 2: "latin-1"}
+DATA_ENCODING = DATA_ENCODINGS[TRANSCRIPT_VERSION]
+OPEN = "o"  # data is "<session type> <host>"
+SEND = "s"
+RECEIVE = "r"
+CLOSE = "c"
+PASSWORD_MASK = "<password>"
+
+logger = logging.getLogger("w2w_rome.transcript")
+
+
+def _open_file(file_path, mode):
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, mode)
+    return open(file_path, mode)
+
+
+def get_command_key(command, password=None):
+    """Key of the sent data in the transcript, the password is masked.
+
+    :type command: str
+    :type password: str
+    :rtype: str
+    """
+    command = command.rstrip("\r\n")
+    if password and command == password:
+        return PASSWORD_MASK
+    return command
+
+
+def _get_file_path(file_path):
+    file_path = time.strftime(file_path)
+    if not os.path.isabs(file_path):
+        # relative to the driver folder
+        driver_path = os.path.dirname(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        )
+        file_path = os.path.join(driver_path, file_path)
+    return file_path
+
+
+class TranscriptRecorder(object):
+    """Write data sent to and received from the devices with timestamps."""
+
+    def __init__(self, file_path):
+        """Transcript recorder.
+
+        :param file_path: the file is created with the first record
+        :type file_path: str
+        """
+        self.file_path = file_path
+        self._lock = threading.Lock()
+        self._file = None
+        self._start_time = None
+        self._session_ids = itertools.count(1)
+
+    def _write(self, record):
+        if self._file is None:
+            dir_path = os.path.dirname(self.file_path)
+            if dir_path and not os.path.isdir(dir_path):
+                os.makedirs(dir_path)
+            self._file = _open_file(self.file_path, "wb")
+            self._start_time = time.time()
+            header = {"version": TRANSCRIPT_VERSION, "start": self._start_time}
+            self._file.write(json.dumps(header) + "\n")
+        record[0] = int((record[0] - self._start_time) * 1000)
+        if isinstance(record[3], bytes):
+            record[3] = record[3].decode(DATA_ENCODING)
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def open_session(self, session_type, host):
+        """Add the session to the transcript.
+
+        :type session_type: str
+        :type host: str
+        :return: session ID
+        :rtype: int
+        """
+        with self._lock:
+            session_id = next(self._session_ids)
+            self._write(
+                [time.time(), session_id, OPEN, "{} {}".format(session_type, host)]
+            )
+        return session_id
+
+    def record(self, session_id, kind, data=""):
+        """Add data of the session.
+
+        :type session_id: int
+        :param kind: SEND, RECEIVE or CLOSE
+        :type kind: str
+        :param data: the password should be masked already
+        :type data: str
+        """
+        with self._lock:
+            self._write([time.time(), session_id, kind, data])
+            if kind == CLOSE:
+                self._file.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class Exchange(object):
+    """Data sent to the device and the chunks received after it."""
+
+    __slots__ = ("command", "chunks")
+
+    def __init__(self, command):
+        """Exchange.
+
+        :param command: sent data, None for the data received after connecting
+        :type command: str|None
+        """
+        self.command = command
+        self.chunks = []  # (<seconds since the command>, <data>)
+
+
+class Transcript(object):
+    """Recorded exchanges of the hosts.
+
+    Replay sessions get exchanges for the sent commands in the recorded order.
+    When recorded exchanges of the command end, the last one is repeated.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # <host>: {<command>: deque[<Exchange>]}
+        self._exchanges = {}
+        self._last_exchanges = {}  # (<host>, <command>): <Exchange>
+
+    @property
+    def hosts(self):
+        return list(self._exchanges)
+
+    def add_exchange(self, host, exchange):
+        """Add the exchange of the host.
+
+        :type host: str
+        :type exchange: Exchange
+        """
+        with self._lock:
+            commands = self._exchanges.setdefault(host, {})
+            commands.setdefault(exchange.command, deque()).append(exchange)
+
+    def get_exchange(self, host, command):
+        """Get the next exchange for the command.
+
+        :type host: str
+        :type command: str|None
+        :rtype: Exchange|None
+        """
+        key = (host, command)
+        with self._lock:
+            exchanges = self._exchanges.get(host, {}).get(command)
+            if exchanges:
+                self._last_exchanges[key] = exchanges.popleft()
+            return self._last_exchanges.get(key)
+
+    @staticmethod
+    def _read_lines(transcript_file):
+        """Read full lines, the file can be cut if the driver was stopped."""
+        while True:
+            try:
+                line = transcript_file.readline()
+            except (IOError, EOFError):
+                return
+            if not line.endswith("\n"):
+                return
+            if line.strip():
+                yield line
+
+    @classmethod
+    def load(cls, file_path):
+        """Read the transcript file.
+
+        :type file_path: str
+        :rtype: Transcript
+        """
+        transcript = cls()
+        sessions = {}  # <session id>: (<host>, <last Exchange>, <send time>)
+        with _open_file(file_path, "rb") as transcript_file:
+            header = json.loads(transcript_file.readline())
+            try:
+                encoding = DATA_ENCODINGS[header.get("version")]
+            except KeyError:
+                raise ValueError(
+                    "Unsupported transcript version {}".format(header.get("version"))
+                )
+            for line in cls._read_lines(transcript_file):
+                time_ms, session_id, kind, data = json.loads(line)
+                data = data.encode(encoding)
+                if kind == OPEN:
+                    host = data.split(" ", 1)[1]
+                    exchange = Exchange(None)
+                    transcript.add_exchange(host, exchange)
+                    sessions[session_id] = (host, exchange, time_ms)
+                elif kind == SEND:
+                    host = sessions[session_id][0]
+                    exchange = Exchange(get_command_key(data))
+                    transcript.add_exchange(host, exchange)
+                    sessions[session_id] = (host, exchange, time_ms)
+                elif kind == RECEIVE:
+                    _, exchange, send_time = sessions[session_id]
+                    exchange.chunks.append(((time_ms - send_time) / 1000.0, data))
+        return transcript
+
+
+class ReplaySession(ExpectSession, ConnectionParams):
+    """Session that answers with the data recorded in the transcript.
+
+    Recorded chunks are received with the same delays after the command,
+    multiplied by the time scale, as well as read timeouts.
+    """
+
+    SESSION_TYPE = "REPLAY"
+
+    def __init__(
+        self,
+        host,
+        username,
+        password,
+        port=None,
+        on_session_start=None,
+        transcript=None,
+        time_scale=None,
+        *args,
+        **kwargs
+    ):
+        """Replay session.
+
+        :param transcript: TRANSCRIPT.REPLAY_FILE is read if not set
+        :type transcript: Transcript
+        :param time_scale: 0 answers immediately, TRANSCRIPT.REPLAY_TIME_SCALE
+            if not set
+        :type time_scale: float
+        """
+        ConnectionParams.__init__(
+            self, host, port=port, on_session_start=on_session_start
+        )
+        ExpectSession.__init__(self, *args, **kwargs)
+        self.username = username
+        self.password = password
+        self._transcript = transcript
+        if time_scale is None:
+            time_scale = RuntimeConfiguration().read_key(
+                "TRANSCRIPT.REPLAY_TIME_SCALE", 1.0
+            )
+        self._time_scale = time_scale
+        self._chunks = []  # heap of (<time to receive>, <seq>, <data>)
+        self._chunk_ids = itertools.count()
+
+    def __eq__(self, other):
+        return (
+            ConnectionParams.__eq__(self, other)
+            and self.username == other.username
+            and self.password == other.password
+        )
+
+    def _schedule(self, command):
+        if self._transcript is None:
+            self._transcript = get_replay_transcript()
+        exchange = self._transcript.get_exchange(self.host, command)
+        if exchange is None:
+            raise TranscriptReplayError(
+                "Transcript doesn't have an answer to {!r} for {}".format(
+                    command, self.host
+                )
+            )
+        start_time = time.time()
+        for delay, data in exchange.chunks:
+            heapq.heappush(
+                self._chunks,
+                (start_time + delay * self._time_scale, next(self._chunk_ids), data),
+            )
+
+    def _initialize_session(self, prompt, logger):
+        self._chunks = []
+        self._schedule(None)
+
+    def _connect_actions(self, prompt, logger):
+        self.hardware_expect(
+            None, expected_string=prompt, timeout=self._timeout, logger=logger
+        )
+        self._on_session_start(logger)
+
+    def disconnect(self):
+        self._chunks = []
+        self._active = False
+
+    def _send(self, command, logger):
+        self._schedule(get_command_key(command, self.password))
+
+    def _receive(self, timeout, logger):
+        timeout = timeout if timeout else self._timeout
+        time_left = (self._chunks[0][0] if self._chunks else float("inf")) - time.time()
+        if time_left > timeout:
+            # waiting for the data that doesn't come is compressed too
+            time.sleep(min(time_left, timeout * self._time_scale))
+            raise SessionReadTimeout()
+        if time_left > 0:
+            time.sleep(time_left)
+        return heapq.heappop(self._chunks)[2]
+
+
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def get_transcript_recorder():
+    """Get process-wide recorder if recording is enabled.
+
+    :rtype: TranscriptRecorder|None
+    """
+    global _recorder
+    runtime_config = RuntimeConfiguration()
+    if not runtime_config.read_key("TRANSCRIPT.RECORD", False):
+        return None
+    with _recorder_lock:
+        if _recorder is None:
+            _recorder = TranscriptRecorder(
+                _get_file_path(
+                    runtime_config.read_key(
+                        "TRANSCRIPT.RECORD_FILE",
+                        "Transcripts/rome-%Y%m%d-%H%M%S.jsonl.gz",
+                    )
+                )
+            )
+            atexit.register(_recorder.close)
+    return _recorder
+
+
+_replay_transcripts = {}
+_replay_lock = threading.Lock()
+
+
+def get_replay_transcript(file_path=None):
+    """Get the transcript to replay, read once for the process.
+
+    :param file_path: TRANSCRIPT.REPLAY_FILE if not set
+    :type file_path: str
+    :rtype: Transcript
+    """
+    file_path = _get_file_path(
+        file_path or RuntimeConfiguration().read_key("TRANSCRIPT.REPLAY_FILE")
+    )
+    with _replay_lock:
+        if file_path not in _replay_transcripts:
+            _replay_transcripts[file_path] = Transcript.load(file_path)
+        return _replay_transcripts[file_path]
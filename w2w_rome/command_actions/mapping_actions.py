@@ -1,4 +1,3 @@
-import re
 import time
 from collections import defaultdict
 
@@ -6,8 +5,50 @@ import w2w_rome.command_templates.mapping as command_template
 from w2w_rome.cli.template_executor import (
     RomeTemplateExecutor as CommandTemplateExecutor,
 )
+from w2w_rome.helpers import patterns
 from w2w_rome.helpers.errors import BaseRomeException, NotSupportedError
-from w2w_rome.helpers.run_in_threads import run_in_threads
+from w2w_rome.helpers.metrics import get_metrics
+from w2w_rome.helpers.move_order import order_by_robot_travel
+from w2w_rome.helpers.run_in_threads import check_cancelled, run_in_threads
+from w2w_rome.helpers.tracing import traced
+
+
+def get_logical_ports_moves(logic_port_pair):
+    """Sub port IDs the robot moves to connect logical ports in both directions.
+
+    :type logic_port_pair: tuple[w2w_rome.helpers.port_entity.LogicalPort]
+    :rtype: list[tuple[int, int]]
+    """
+    src_id, dst_id = (
+        min(rome_port.sub_port_number for rome_port in logic_port.rome_ports)
+        for logic_port in logic_port_pair
+    )
+    return [(src_id, dst_id), (dst_id, src_id)]
+
+
+def get_sub_ports_moves(sub_port_pair):
+    """Sub port IDs the robot moves to connect E sub port to W sub port.
+
+    :type sub_port_pair: tuple[w2w_rome.helpers.port_entity.SubPort]
+    :rtype: list[tuple[int, int]]
+    """
+    e_port, w_port = sub_port_pair
+    return [(e_port.sub_port_number, w_port.sub_port_number)]
+
+
+def parse_pending_connections(output):
+    """Get pairs of ports that are in process or pending.
+
+    :param output: "connection show pending" output
+    :type output: str
+    :return: set of (<port1>, <port2>) in upper case
+    :rtype: set[tuple[str, str]]
+    """
+    pairs = set()
+    for pattern in (patterns.CONNECTION_IN_PROCESS, patterns.CONNECTION_PENDING_ROW):
+        for match in pattern.finditer(output):
+            pairs.add((match.group("src").upper(), match.group("dst").upper()))
+    return pairs
 
 
 def reset_connection_pending(session, logger):
@@ -30,10 +71,18 @@ def reset_connection_pending(session, logger):
 
 class MappingActions(object):
     CONNECTION_PENDING_RESET_MAP = {
-        "(?i)Multiple Cross Connect Severe Failure": reset_connection_pending,
+        patterns.CONNECTION_PENDING_SEVERE_FAILURE.pattern: reset_connection_pending,
     }
 
-    def __init__(self, cli_services, logger, mapping_timeout, mapping_check_delay):
+    def __init__(
+        self,
+        cli_services,
+        logger,
+        mapping_timeout,
+        mapping_check_delay,
+        port_table_cache=None,
+        polling_schedule=None,
+    ):
         """Mapping actions.
 
         :param cli_services: default mode cli_services
@@ -41,20 +90,33 @@ class MappingActions(object):
         :type logger: logging.Logger
         :type mapping_timeout: int
         :type mapping_check_delay: int
+        :param port_table_cache: invalidated before changing connections
+        :type port_table_cache: w2w_rome.helpers.port_table_cache.PortTableCache
+        :param polling_schedule: delays between checks of pending connections,
+            the check delay is used if it isn't set
+        :type polling_schedule: w2w_rome.helpers.polling_schedule.AdaptivePollingSchedule  # noqa: E501
         """
         self._mapping_check_delay = mapping_check_delay
         self._mapping_timeout = mapping_timeout
+        self._port_table_cache = port_table_cache
+        self._polling_schedule = polling_schedule
         self._cli_services = cli_services
         self._cli_services_map = {cli.session.host: cli for cli in cli_services}
         self._logger = logger
         self._is_run_in_parallel = len(cli_services) > 1
 
     def check_full_output(self, cli_service):
-        for key, action in self.CONNECTION_PENDING_RESET_MAP.items():
-            if re.search(key, cli_service.session.full_buffer):
+        """Check the patterns matched in the data received since the last check."""
+        output_matcher = cli_service.session.output_matcher
+        matched = output_matcher.pop_matched()
+        for pattern, action in self.CONNECTION_PENDING_RESET_MAP.items():
+            if pattern in matched:
+                output_matcher.clear()
                 action(cli_service.session, self._logger)
 
-        cli_service.session.full_buffer = ""
+    def _invalidate_port_table(self, cli_service):
+        if self._port_table_cache is not None:
+            self._port_table_cache.invalidate(cli_service.session.host)
 
     def _connect(self, cli_service, src_port_name, dst_port_name):
         """Connect ports by name.
@@ -65,6 +127,7 @@ class MappingActions(object):
         :return: output
         :rtype: str
         """
+        self._invalidate_port_table(cli_service)
         return CommandTemplateExecutor(
             cli_service,
             command_template.CONNECT,
@@ -72,22 +135,26 @@ class MappingActions(object):
         ).execute_command(src_port=src_port_name, dst_port=dst_port_name)
 
     def _connect_and_wait(
-        self, cli_service, src_port_name, dst_port_name, num_ports_to_connect
+        self, cli_service, port_names, num_ports_to_connect, blade_letter
     ):
-        """Connect multiple ports.
+        """Connect port names and wait they are not in pending.
 
+        All connect requests are added to the pending queue of the device before
+        waiting for them.
         :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
-        :type src_port_name: str
-        :type dst_port_name: str
+        :type port_names: list[tuple[str, str]]
         :type num_ports_to_connect: int
+        :type blade_letter: str
         """
-        self._connect(cli_service, src_port_name, dst_port_name)
+        cli_service.session.completion_tracker.expect(port_names)
+        for src_port_name, dst_port_name in port_names:
+            self._connect(cli_service, src_port_name, dst_port_name)
+
         self.wait_ports_not_in_pending_connections(
-            cli_service,
-            [(src_port_name, dst_port_name)],
-            num_ports_to_connect,
+            cli_service, port_names, num_ports_to_connect, blade_letter
         )
 
+    @traced
     def connect(self, src_logic_port, dst_logic_port, bidi=True):
         """Connect logical ports.
 
@@ -95,36 +162,67 @@ class MappingActions(object):
         :type dst_logic_port: w2w_rome.helpers.port_entity.LogicalPort
         :type bidi: bool
         """
-        if not bidi:
-            if src_logic_port.is_q_port:
-                raise NotSupportedError("Uni connections not supported for Q ports")
-            if self._is_run_in_parallel:
-                raise NotSupportedError("Not supported multiple host and map uni")
-            e_port = src_logic_port.e_sub_ports[0].sub_port_name
-            w_port = dst_logic_port.w_sub_ports[0].sub_port_name
-            param_map = {
-                cli_service: [[cli_service, e_port, w_port, 2], {}]
-                for cli_service in self._cli_services
-            }
-        else:
+        if bidi:
+            return self.connect_many([(src_logic_port, dst_logic_port)])
+
+        if src_logic_port.is_q_port:
+            raise NotSupportedError("Uni connections not supported for Q ports")
+        if self._is_run_in_parallel:
+            raise NotSupportedError("Not supported multiple host and map uni")
+        e_port = src_logic_port.e_sub_ports[0].sub_port_name
+        w_port = dst_logic_port.w_sub_ports[0].sub_port_name
+        cli_service = self._cli_services[0]
+        self._connect_and_wait(
+            cli_service, [(e_port, w_port)], 2, src_logic_port.blade_letter
+        )
+
+    @traced
+    def connect_many(self, logic_port_pairs):
+        """Connect pairs of logical ports in both directions.
+
+        Connect requests for all pairs are sent at once in the order that minimizes
+        the robot travel and then we wait for all of them.
+        :type logic_port_pairs: list[tuple[w2w_rome.helpers.port_entity.LogicalPort]]
+        """
+        port_names = []
+        num_ports = 0
+        blade_letter = logic_port_pairs[0][0].blade_letter
+        logic_port_pairs = order_by_robot_travel(
+            logic_port_pairs, get_logical_ports_moves
+        )
+        for src_logic_port, dst_logic_port in logic_port_pairs:
             src_logic_name = src_logic_port.original_logical_name
             dst_logic_name = dst_logic_port.original_logical_name
             # connect every E port to W in both directions
-            num_ports_to_connect = 2 * len(src_logic_port.rome_ports)
-            param_map = {
-                cli_service: [
-                    [cli_service, src_logic_name, dst_logic_name, num_ports_to_connect],
-                    {},
-                ]
-                for cli_service in self._cli_services
-            }
+            num_ports += 2 * len(src_logic_port.rome_ports)
+            port_names.append((src_logic_name, dst_logic_name))
+        # for every host connect logical ports
+        param_map = {
+            cli_service: [[cli_service, port_names, num_ports, blade_letter], {}]
+            for cli_service in self._cli_services
+        }
 
         if not self._is_run_in_parallel:
             params = param_map.values()[0]
             args, kwargs = params
             self._connect_and_wait(*args, **kwargs)
         else:
-            run_in_threads(self._connect_and_wait, self._logger, param_map)
+            run_in_threads(
+                self._connect_and_wait,
+                self._logger,
+                param_map,
+                self._get_host_timeout(param_map),
+            )
+
+    def _get_host_timeout(self, param_map):
+        """Deadline for the host to send requests and wait for the robot.
+
+        :param param_map: cli_service: [[cli_service, ports, num_ports, ...], {}]
+        :rtype: int
+        """
+        num_ports = max(args[2] for args, _ in param_map.values())
+        # waiting for pending connections fails earlier, give time to send requests
+        return self._mapping_timeout * (num_ports + 1)
 
     def _disconnect(self, cli_service, src_port, dst_port):
         """Disconnect ports by name.
@@ -135,6 +233,7 @@ class MappingActions(object):
         :return: output
         :rtype: str
         """
+        self._invalidate_port_table(cli_service)
         return CommandTemplateExecutor(
             cli_service,
             command_template.DISCONNECT,
@@ -142,31 +241,49 @@ class MappingActions(object):
         ).execute_command(src_port=src_port, dst_port=dst_port)
 
     def _disconnect_and_wait(
-        self, cli_service, connected_port_names, num_ports_to_disconnect
+        self,
+        cli_service,
+        connected_port_names,
+        num_ports_to_disconnect,
+        blade_letter,
     ):
         """Disconnect connected port names and wait they are not in pending.
 
         :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
         :type connected_port_names: list[tuple[str, str]]
         :type num_ports_to_disconnect: int
+        :type blade_letter: str
         """
+        cli_service.session.completion_tracker.expect(connected_port_names)
         for src, dst in connected_port_names:
             self._disconnect(cli_service, src, dst)
 
         self.wait_ports_not_in_pending_connections(
-            cli_service, connected_port_names, num_ports_to_disconnect
+            cli_service, connected_port_names, num_ports_to_disconnect, blade_letter
         )
 
-    def disconnect(self, connected_logic_ports, bidi=False):
+    @traced
+    def disconnect(self, connected_logic_ports, port_table, bidi=False):
         """Disconnect logical ports.
 
+        Disconnect requests are sent in the order that minimizes the robot travel.
+
         :type connected_logic_ports: set[tuple[w2w_rome.helpers.port_entity.LogicalPort]]  # noqa
+        :param port_table: table the logical ports belong to
+        :type port_table: w2w_rome.helpers.port_entity.PortTable
         :type bidi: bool
         """
+        if not connected_logic_ports:
+            return
+
+        blade_letter = next(iter(connected_logic_ports))[0].blade_letter
         if bidi:
             connected_port_names = []
             num_ports = 0
-            for src_logic_port, dst_logic_port in connected_logic_ports:
+            for src_logic_port, dst_logic_port in order_by_robot_travel(
+                sorted(connected_logic_ports, key=lambda ports: ports[0].name),
+                get_logical_ports_moves,
+            ):
                 src_logic_name = src_logic_port.original_logical_name
                 dst_logic_name = dst_logic_port.original_logical_name
                 # connect every E port to W in both directions
@@ -174,35 +291,52 @@ class MappingActions(object):
                 connected_port_names.append((src_logic_name, dst_logic_name))
             # for every host disconnect logical ports
             param_map = {
-                cli_service: [[cli_service, connected_port_names, num_ports], {}]
+                cli_service: [
+                    [cli_service, connected_port_names, num_ports, blade_letter],
+                    {},
+                ]
                 for cli_service in self._cli_services
             }
         else:
             host_connected_ports_map = defaultdict(list)
             for src_logic_port, dst_logic_port in connected_logic_ports:
-                for e_port, w_port in src_logic_port.get_connected_sub_ports(
-                    dst_logic_port
+                for e_port, w_port in port_table.get_connected_sub_ports(
+                    src_logic_port, dst_logic_port
                 ):
                     cli_service = self._cli_services_map[e_port.port_resource]
-                    host_connected_ports_map[cli_service].append(
-                        (e_port.sub_port_name, w_port.sub_port_name)
+                    host_connected_ports_map[cli_service].append((e_port, w_port))
+
+            param_map = {}
+            for cli, connected_sub_ports in host_connected_ports_map.items():
+                connected_port_names = [
+                    (e_port.sub_port_name, w_port.sub_port_name)
+                    for e_port, w_port in order_by_robot_travel(
+                        sorted(connected_sub_ports), get_sub_ports_moves
                     )
-
-            param_map = {
-                cli: [
-                    [cli, sorted(connected_port_names), len(connected_port_names)],
+                ]
+                param_map[cli] = [
+                    [
+                        cli,
+                        connected_port_names,
+                        len(connected_port_names),
+                        blade_letter,
+                    ],
                     {},
                 ]
-                for cli, connected_port_names in host_connected_ports_map.items()
-            }
 
         if not self._is_run_in_parallel:
             params = param_map.values()[0]
             args, kwargs = params
             self._disconnect_and_wait(*args, **kwargs)
         else:
-            run_in_threads(self._disconnect_and_wait, self._logger, param_map)
+            run_in_threads(
+                self._disconnect_and_wait,
+                self._logger,
+                param_map,
+                self._get_host_timeout(param_map),
+            )
 
+    @traced
     def ports_in_pending_connections(self, cli_service, ports):
         """Check ports in process or pending.
 
@@ -224,32 +358,73 @@ class MappingActions(object):
 
         self.check_full_output(cli_service)
 
-        for src, dst in ports:
-            match = re.search(r"ports:\s+{}-{}\D".format(src, dst), output, re.I)
-            match = match or re.search(
-                r"\w+\s+{}\s+{}\s+\w+".format(src, dst), output, re.I
-            )
-            if match:
-                return True
+        pending_pairs = parse_pending_connections(output)
+        return any((src.upper(), dst.upper()) in pending_pairs for src, dst in ports)
 
-        return False
+    def _get_check_delay(self, host, blade_letter, elapsed, num_ports):
+        if self._polling_schedule is None:
+            return self._mapping_check_delay
+        return self._polling_schedule.get_delay(
+            host, blade_letter, elapsed, num_ports, self._mapping_check_delay
+        )
 
+    def _learn_move_time(self, host, blade_letter, duration, num_ports):
+        if self._polling_schedule is not None:
+            self._polling_schedule.add_operation(
+                host, blade_letter, duration, num_ports
+            )
+            self._logger.debug(
+                "Learned move times: {}".format(self._polling_schedule.get_statistics())
+            )
+
+    @traced
     def wait_ports_not_in_pending_connections(
-        self, cli_service, ports, num_ports_to_connect
+        self, cli_service, ports, num_ports_to_connect, blade_letter=None
     ):
         """Wait for ports go away from pending connections.
 
+        Pending connections are checked when the polling schedule expects
+        the robot to finish (every mapping check delay without the schedule) or
+        as soon as the device notifies that connections of the ports completed.
         :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
         :param ports: src and dst ports that connects
         :type ports: list[tuple[str, str]]
         :param num_ports_to_connect: timeout depends on it
         :type num_ports_to_connect: int
+        :param blade_letter: matrix of the ports, used by the polling schedule
+        :type blade_letter: str
         """
-        end_time = time.time() + (self._mapping_timeout * num_ports_to_connect)
+        session = cli_service.session
+        start_time = time.time()
+        end_time = start_time + (self._mapping_timeout * num_ports_to_connect)
         while time.time() < end_time:
-            time.sleep(self._mapping_check_delay)
+            # stop waiting if mapping failed on the other host
+            check_cancelled()
+            get_metrics().increment("pending_polls", host=session.host)
+            delay = self._get_check_delay(
+                session.host,
+                blade_letter,
+                time.time() - start_time,
+                num_ports_to_connect,
+            )
+            # the device notifies when the connection completed, check pending
+            # connections right after it instead of waiting the whole delay
+            completed = session.wait_connections_completed(ports, delay, self._logger)
             if not self.ports_in_pending_connections(cli_service, ports):
+                # the time of the check depends on the schedule itself, only
+                # the time of the notice is learned
+                completion_time = session.completion_tracker.get_completion_time(ports)
+                if completion_time is not None:
+                    self._learn_move_time(
+                        session.host,
+                        blade_letter,
+                        completion_time - start_time,
+                        num_ports_to_connect,
+                    )
                 break
+            if completed:
+                # notices were left from the previous requests
+                session.completion_tracker.expect(ports)
         else:
             msg = "There are some pending connections after {}sec".format(
                 self._mapping_timeout
@@ -1,32 +1,67 @@
-import re
+from cloudshell.cli.session.session_exceptions import CommandExecutionException
 
 import w2w_rome.command_templates.system as command_template
 from w2w_rome.cli.template_executor import (
     RomeTemplateExecutor as CommandTemplateExecutor,
 )
-from w2w_rome.helpers.port_entity import PortTable
+from w2w_rome.helpers.board_info import BoardInfo
+from w2w_rome.helpers.errors import BaseRomeException
+from w2w_rome.helpers.port_entity import PortTable, SubPort
 from w2w_rome.helpers.run_in_threads import run_in_threads
+from w2w_rome.helpers.tracing import traced
 
 
 class SystemActions(object):
-    def __init__(self, cli_services, logger):
+    def __init__(
+        self, cli_services, logger, port_table_cache=None, board_info_cache=None
+    ):
         """Autoload actions.
 
         :param cli_services: default mode cli_services
         :type cli_services: list[cloudshell.cli.cli_service_impl.CliServiceImpl]
         :type logger: logging.Logger
+        :param port_table_cache: port tables read by previous commands
+        :type port_table_cache: w2w_rome.helpers.port_table_cache.PortTableCache
+        :param board_info_cache: board infos read by previous commands
+        :type board_info_cache: w2w_rome.helpers.board_info.BoardInfoCache
         """
         self._cli_services = cli_services
         self._logger = logger
+        self._port_table_cache = port_table_cache
+        self._board_info_cache = board_info_cache
         self._is_run_in_parallel = len(cli_services) > 1
 
     @staticmethod
-    def _get_port_table(cli_service):
-        port_table_output = CommandTemplateExecutor(
+    def _read_port_table_output(cli_service):
+        return CommandTemplateExecutor(
             cli_service, command_template.PORT_SHOW
         ).execute_command()
-        return PortTable.from_output(port_table_output, cli_service.session.host)
 
+    def _get_port_table(self, cli_service):
+        """Get port table from the cache or read it from the host.
+
+        The operation count is read with show board for every port table, its
+        output is much shorter than the output of port show.
+        :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
+        :rtype: PortTable
+        """
+        host = cli_service.session.host
+        if self._port_table_cache is None:
+            port_table_output = self._read_port_table_output(cli_service)
+            return PortTable.from_output(port_table_output, host)
+
+        operation_count = self._get_board_info(
+            cli_service, refresh=True
+        ).operation_count
+        port_table_output = self._port_table_cache.get(host, operation_count)
+        if port_table_output is None:
+            port_table_output = self._read_port_table_output(cli_service)
+            self._port_table_cache.put(host, operation_count, port_table_output)
+        else:
+            self._logger.debug("Use cached port table of the host {}".format(host))
+        return PortTable.from_output(port_table_output, host)
+
+    @traced
     def get_port_table(self):
         """Get port table from hosts and concatenating it.
 
@@ -39,52 +74,118 @@ class SystemActions(object):
                 cli_service: [[cli_service], {}] for cli_service in self._cli_services
             }
             results_map = run_in_threads(self._get_port_table, self._logger, param_map)
-            port_table = reduce(PortTable.__add__, results_map.values())  # noqa: F821
+            port_table = PortTable.merge(results_map.values())
         return port_table
 
-    @staticmethod
-    def _board_table(cli_service):
-        """Get board table.
+    def _get_sub_ports(self, cli_service, logical_names):
+        """Get sub ports of the logical ports from the host.
 
-        :rtype: dict
+        :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
+        :type logical_names: list[str]
+        :rtype: list[w2w_rome.helpers.port_entity.SubPort]
         """
-        board_table = {}
-        output = CommandTemplateExecutor(
-            cli_service, command_template.SHOW_BOARD
-        ).execute_command()
-        serial_search = re.search(r"BOARD\s+.*S/N\((.+?)\)", output, re.DOTALL)
-        if serial_search:
-            board_table["serial_number"] = serial_search.group(1)
+        host = cli_service.session.host
+        sub_ports = []
+        for logical_name in logical_names:
+            try:
+                output = CommandTemplateExecutor(
+                    cli_service, command_template.PORT_INFO
+                ).execute_command(port=logical_name)
+            except CommandExecutionException:
+                self._logger.debug(
+                    "Cannot get port {} info from the host {}".format(
+                        logical_name, host
+                    )
+                )
+                continue
+            sub_ports.extend(SubPort.parse_sub_ports(output, host))
+        return sub_ports
 
-        model_search = re.search(
-            r"^rome\s+type\s+(.+?)\s*$", output, flags=re.MULTILINE | re.IGNORECASE
+    @traced
+    def refresh_port_table(self, port_table, logical_ports):
+        """Re-read sub ports of the logical ports and update the port table.
+
+        Reads only given logical ports from the hosts, if the device didn't return
+        all sub ports of the logical ports reloads the whole port table.
+        :type port_table: PortTable
+        :type logical_ports: list[w2w_rome.helpers.port_entity.LogicalPort]
+        :rtype: PortTable
+        """
+        logical_names = sorted(
+            {logical_port.original_logical_name for logical_port in logical_ports}
         )
-        if model_search:
-            board_table["model_name"] = model_search.group(1)
+        if not self._is_run_in_parallel:
+            sub_ports = self._get_sub_ports(self._cli_services[0], logical_names)
         else:
-            board_table["model_name"] = "Rome"
+            param_map = {
+                cli_service: [[cli_service, logical_names], {}]
+                for cli_service in self._cli_services
+            }
+            results_map = run_in_threads(self._get_sub_ports, self._logger, param_map)
+            sub_ports = [
+                sub_port for result in results_map.values() for sub_port in result
+            ]
 
-        sw_version_search = re.search(
-            r"ACTIVE\s+SW\s+VER\s+(\d+\.\d+\.\d+\.\d+)", output, re.DOTALL
-        )
-        if sw_version_search:
-            board_table["sw_version"] = sw_version_search.group(1)
+        expected_sub_ports = {
+            (sub_port.port_resource, sub_port.sub_port_name)
+            for logical_port in logical_ports
+            for rome_port in logical_port
+            for sub_port in (rome_port.e_port, rome_port.w_port)
+        }
+        try:
+            updated_sub_ports = port_table.update_sub_ports(sub_ports)
+        except BaseRomeException:
+            updated_sub_ports = set()
 
-        return board_table
+        if not expected_sub_ports.issubset(updated_sub_ports):
+            self._logger.debug(
+                "Not all sub ports of the ports {} are updated, reloading port "
+                "table".format(", ".join(logical_names))
+            )
+            port_table = self.get_port_table()
+        return port_table
 
-    def get_board_tables_map(self):
-        """Get board tables from hosts.
+    def _get_board_info(self, cli_service, refresh=False):
+        """Get board info from the cache or read it from the host.
 
-        :return: dict[cli_service, dict with board table info[
-        :rtype: dict[cloudshell.cli.cli_service_impl.CliServiceImpl, dict]
+        :type cli_service: cloudshell.cli.cli_service_impl.CliServiceImpl
+        :param refresh: read from the host, e.g. to get actual operation count
+        :type refresh: bool
+        :rtype: BoardInfo
+        """
+        host = cli_service.session.host
+        if self._board_info_cache is not None and not refresh:
+            board_info = self._board_info_cache.get(host)
+            if board_info is not None:
+                self._logger.debug("Use cached board info of the host {}".format(host))
+                return board_info
+
+        output = CommandTemplateExecutor(
+            cli_service, command_template.SHOW_BOARD
+        ).execute_command()
+        board_info = BoardInfo.from_output(output)
+        if self._board_info_cache is not None:
+            self._board_info_cache.put(host, board_info)
+        return board_info
+
+    @traced
+    def get_board_info_map(self, refresh=False):
+        """Get board infos of the hosts.
+
+        :param refresh: read from the hosts even if board infos are cached
+        :type refresh: bool
+        :rtype: dict[cloudshell.cli.cli_service_impl.CliServiceImpl, BoardInfo]
         """
         if not self._is_run_in_parallel:
             results_map = {
-                self._cli_services[0]: self._board_table(self._cli_services[0])
+                self._cli_services[0]: self._get_board_info(
+                    self._cli_services[0], refresh
+                )
             }
         else:
             param_map = {
-                cli_service: [[cli_service], {}] for cli_service in self._cli_services
+                cli_service: [[cli_service, refresh], {}]
+                for cli_service in self._cli_services
             }
-            results_map = run_in_threads(self._board_table, self._logger, param_map)
+            results_map = run_in_threads(self._get_board_info, self._logger, param_map)
         return results_map
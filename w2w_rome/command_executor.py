@@ -0,0 +1,103 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+
+from cloudshell.layer_one.core.command_executor import CommandExecutor
+from cloudshell.layer_one.core.response.command_response import CommandResponse
+
+
+class RomeCommandExecutor(CommandExecutor):
+    """Command executor that connects a few MapBidi requests at once.
+
+    Consecutive MapBidi commands of one request are executed with
+    DriverCommands.map_bidi_batch, other commands are executed one by one.
+    """
+
+    MAP_BIDI = "MapBidi"
+
+    @staticmethod
+    def _get_map_bidi_ports(command_request):
+        params = command_request.command_params
+        return params.get("MapPort_A")[0], params.get("MapPort_B")[0]
+
+    def _group_commands(self, command_requests):
+        """Group consecutive MapBidi commands with different ports.
+
+        :type command_requests: list[cloudshell.layer_one.core.entities.command.Command]  # noqa: E501
+        :rtype: list[list[cloudshell.layer_one.core.entities.command.Command]]
+        """
+        groups = []
+        used_ports = set()
+        for command_request in command_requests:
+            if command_request.command_name != self.MAP_BIDI:
+                groups.append([command_request])
+                continue
+
+            ports = set(self._get_map_bidi_ports(command_request))
+            last_group = groups[-1] if groups else None
+            if (
+                last_group is not None
+                and last_group[0].command_name == self.MAP_BIDI
+                and len(ports) == 2
+                and not ports & used_ports
+            ):
+                last_group.append(command_request)
+                used_ports.update(ports)
+            else:
+                groups.append([command_request])
+                used_ports = ports
+        return groups
+
+    def execute_commands(self, command_requests):
+        """Execute list of command requests.
+
+        :type command_requests: list[cloudshell.layer_one.core.entities.command.Command]  # noqa: E501
+        :rtype: list[CommandResponse]
+        """
+        command_responses = []
+        for group in self._group_commands(command_requests):
+            if len(group) > 1:
+                command_responses.extend(
+                    self.map_bidi_batch_executor(group, self.driver_instance())
+                )
+            else:
+                command_responses.extend(
+                    super(RomeCommandExecutor, self).execute_commands(group)
+                )
+        return command_responses
+
+    def map_bidi_batch_executor(self, command_requests, driver_instance):
+        """Execute MapBidi commands in one batch.
+
+        Every command gets the result of its own port pair. If the batch
+        failed as a whole, the commands are executed one by one, so the ports
+        that are connected are reported as connected.
+        :type command_requests: list[cloudshell.layer_one.core.entities.command.Command]  # noqa: E501
+        :param driver_instance
+        :type driver_instance: w2w_rome.driver_commands.DriverCommands
+        :rtype: list[CommandResponse]
+        """
+        self._logger.info(
+            "Executing {} {} commands in batch".format(
+                len(command_requests), self.MAP_BIDI
+            )
+        )
+        port_pairs = [
+            self._get_map_bidi_ports(command_request)
+            for command_request in command_requests
+        ]
+        try:
+            errors = driver_instance.map_bidi_batch(port_pairs)
+        except Exception:
+            self._logger.exception("Batch Execution Error, executing one by one")
+            return super(RomeCommandExecutor, self).execute_commands(command_requests)
+
+        command_responses = []
+        for command_request, error in zip(command_requests, errors):
+            command_response = CommandResponse(command_request)
+            if error is None:
+                command_response.success = True
+            else:
+                command_response.error = type(error).__name__
+                command_response.log = str(error)
+            command_responses.append(command_response)
+        return command_responses
@@ -19,5 +19,4 @@ CONNECT = CommandTemplate(
 DISCONNECT = CommandTemplate(
     "connection disconnect {src_port} from {dst_port}", error_map=ERROR_MAP
 )
-PORT_INFO = CommandTemplate("port show {port}", error_map=ERROR_MAP)
 CONNECTION_SHOW_PENDING = CommandTemplate("connection show pending")
@@ -15,3 +15,4 @@ ERROR_MAP = OrderedDict(
 
 SHOW_BOARD = CommandTemplate("show board", error_map=ERROR_MAP)
 PORT_SHOW = CommandTemplate("port show", error_map=ERROR_MAP)
+PORT_INFO = CommandTemplate("port show {port}", error_map=ERROR_MAP)
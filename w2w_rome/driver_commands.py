@@ -1,5 +1,6 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
+import os
 import re
 import sys
 from contextlib import contextmanager
@@ -15,11 +16,20 @@ from w2w_rome.cli.rome_cli_handler import RomeCliHandler
 from w2w_rome.command_actions.mapping_actions import MappingActions
 from w2w_rome.command_actions.system_actions import SystemActions
 from w2w_rome.helpers.autoload_helper import AutoloadHelper
+from w2w_rome.helpers.board_info import BoardInfoCache
 from w2w_rome.helpers.errors import (
     BaseRomeException,
     ConnectionPortsError,
     NotSupportedError,
 )
+from w2w_rome.helpers.metrics import start_metrics_export, timed
+from w2w_rome.helpers.polling_schedule import AdaptivePollingSchedule
+from w2w_rome.helpers.port_table_cache import PortTableCache
+from w2w_rome.helpers.state_id import (
+    NOT_USED_STATE_ID,
+    StateIdTracker,
+    get_mapping_hashes,
+)
 
 
 class DriverCommands(DriverCommandsInterface):
@@ -45,15 +55,48 @@ class DriverCommands(DriverCommandsInterface):
         self.support_multiple_blades = runtime_config.read_key(
             "SUPPORT_MULTIPLE_BLADES", False
         )
+        if runtime_config.read_key("MAPPING.ADAPTIVE_POLLING", False):
+            self._polling_schedule = AdaptivePollingSchedule()
+        else:
+            self._polling_schedule = None
+        if runtime_config.read_key("CACHE.PORT_TABLE", False):
+            self._port_table_cache = PortTableCache()
+        else:
+            self._port_table_cache = None
+        self._board_info_cache = BoardInfoCache(
+            runtime_config.read_key("CACHE.BOARD_INFO_MAX_AGE", 3600)
+        )
+        if runtime_config.read_key("STATE_ID.ENABLED", False):
+            self._state_id_tracker = StateIdTracker(
+                self._get_state_id_file_path(runtime_config)
+            )
+        else:
+            self._state_id_tracker = None
+        if runtime_config.read_key("METRICS.ENABLED", False):
+            start_metrics_export(
+                logger,
+                runtime_config.read_key("METRICS.INTERVAL", 60),
+                runtime_config.read_key("METRICS.BACKUP_COUNT", 7),
+            )
+        self._autoload_cache = {}  # <address>: (<operation_counts>, <response>)
+        self._address = None
 
         self.__ports_association_table = None
 
+    @staticmethod
+    def _get_state_id_file_path(runtime_config):
+        file_path = runtime_config.read_key("STATE_ID.FILE")
+        if file_path and not os.path.isabs(file_path):
+            # relative to the driver folder
+            driver_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            file_path = os.path.join(driver_path, file_path)
+        return file_path
+
     def _initialize_second_cli_handler(self):
         if self._second_cli_handler is None:
             self._second_cli_handler = RomeCliHandler(self._logger)
-            self._cli_handler._cli._session_pool._pool.maxsize = 2
-            self._second_cli_handler._cli._session_pool._pool.maxsize = 2
 
+    @timed("driver_command")
     def login(self, address, username, password):
         """Perform login operation on the device.
 
@@ -65,6 +108,7 @@ class DriverCommands(DriverCommandsInterface):
         """
         hosts, _ = self._split_addresses_and_letter(address)
         first_host = hosts[0]
+        self._address = address
 
         self._cli_handler.define_session_attributes(first_host, username, password)
         if len(hosts) == 2:
@@ -75,28 +119,52 @@ class DriverCommands(DriverCommandsInterface):
             )
 
         with self._get_cli_services_lst() as cli_services_lst:
-            system_actions = SystemActions(cli_services_lst, self._logger)
-            board_tables_map = system_actions.get_board_tables_map()
-            for cli_service, board_table in board_tables_map.items():
-                model_name = board_table["model_name"]
-                self._logger.info("Connected to {}".format(model_name))
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
+            board_info_map = system_actions.get_board_info_map(refresh=True)
+            for board_info in board_info_map.values():
+                self._logger.info("Connected to {}".format(board_info.model_name))
 
+        # sessions are opened in advance, so commands don't wait for the login
+        self._cli_handler.warm_up_default_mode()
+        if self._second_cli_handler:
+            self._second_cli_handler.warm_up_default_mode()
+
+    @timed("driver_command")
     def get_state_id(self):
         """Check if CS synchronized with the device.
 
+        State ID set by CloudShell is returned while the device isn't changed,
+        new ID is built from the operation counts and the connections otherwise.
         :return: Synchronization ID, GetStateIdResponseInfo(-1) if not used
         :rtype: cloudshell.layer_one.core.response.response_info.GetStateIdResponseInfo
         :raises Exception: if command failed
-
-        Example:
-            # Obtain cli session
-            with self._cli_handler.default_mode_service() as session:
-                # Execute command
-                chassis_name = session.send_command('show chassis sub_port_name')
-                return chassis_name
         """
-        return GetStateIdResponseInfo("-1")
+        if self._state_id_tracker is None or self._address is None:
+            return GetStateIdResponseInfo(NOT_USED_STATE_ID)
+
+        with self._get_cli_services_lst(read_only=True) as cli_services_lst:
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
+            operation_counts = self._get_operation_counts(
+                cli_services_lst, system_actions.get_board_info_map(refresh=True)
+            )
+            state_id = self._state_id_tracker.get_state_id(
+                self._get_hosts(cli_services_lst),
+                operation_counts,
+                system_actions.get_port_table,
+            )
+        return GetStateIdResponseInfo(state_id)
 
+    @timed("driver_command")
     def set_state_id(self, state_id):
         """Set synchronization state id to the device.
 
@@ -106,7 +174,65 @@ class DriverCommands(DriverCommandsInterface):
         :return: None
         :raises Exception: if command failed
         """
-        pass
+        if self._state_id_tracker is None or self._address is None:
+            return
+
+        with self._get_cli_services_lst(read_only=True) as cli_services_lst:
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
+            operation_counts = self._get_operation_counts(
+                cli_services_lst, system_actions.get_board_info_map(refresh=True)
+            )
+            port_table = system_actions.get_port_table()
+        self._state_id_tracker.set_state_id(
+            self._get_hosts(cli_services_lst), state_id, operation_counts, port_table
+        )
+
+    @staticmethod
+    def _get_operation_counts(cli_services_lst, board_info_map):
+        """Operation counts of the hosts in the order of CLI services.
+
+        :type cli_services_lst: list[cloudshell.cli.cli_service_impl.CliServiceImpl]
+        :type board_info_map: dict[cloudshell.cli.cli_service_impl.CliServiceImpl, w2w_rome.helpers.board_info.BoardInfo]  # noqa: E501
+        :rtype: list[str]
+        """
+        return [
+            board_info_map[cli_service].operation_count
+            for cli_service in cli_services_lst
+        ]
+
+    @staticmethod
+    def _get_hosts(cli_services_lst):
+        """Hosts in the order of CLI services.
+
+        :type cli_services_lst: list[cloudshell.cli.cli_service_impl.CliServiceImpl]
+        :rtype: list[str]
+        """
+        return [cli_service.session.host for cli_service in cli_services_lst]
+
+    def _get_mapping_hashes(self, port_table):
+        """Mapping hashes of the hosts before the connections are changed.
+
+        :type port_table: w2w_rome.helpers.port_entity.PortTable
+        :rtype: dict[str, str]|None
+        """
+        if self._state_id_tracker is not None:
+            return get_mapping_hashes(port_table)
+
+    def _add_own_changes(self, mapping_hashes, port_table):
+        """Connections are changed by CloudShell's request.
+
+        :param mapping_hashes: mapping hashes of the hosts before the change
+        :type mapping_hashes: dict[str, str]
+        :param port_table: port table read after the change
+        :type port_table: w2w_rome.helpers.port_entity.PortTable
+        """
+        if self._state_id_tracker is not None:
+            self._state_id_tracker.add_own_changes(mapping_hashes, port_table)
 
     def _convert_cs_port_to_port_name(self, cs_port):
         _, matrix_letter = self._split_addresses_and_letter(cs_port)
@@ -118,6 +244,7 @@ class DriverCommands(DriverCommandsInterface):
             port_name = "{}{}".format(matrix_letter, port_num)
         return port_name
 
+    @timed("driver_command")
     def map_bidi(self, src_port, dst_port):
         """Create a bidirectional connection between source and destination ports.
 
@@ -140,8 +267,15 @@ class DriverCommands(DriverCommandsInterface):
                 self._logger,
                 self._mapping_timeout,
                 self._mapping_check_delay,
+                self._port_table_cache,
+                self._polling_schedule,
+            )
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
             )
-            system_actions = SystemActions(cli_services_lst, self._logger)
             port_table = system_actions.get_port_table()
             src_logic_port = port_table[src_port_name]
             dst_logic_port = port_table[dst_port_name]
@@ -158,10 +292,13 @@ class DriverCommands(DriverCommandsInterface):
                 src_logic_port, dst_logic_port, bidi=True
             )
 
+            mapping_hashes = self._get_mapping_hashes(port_table)
             try:
                 mapping_actions.connect(src_logic_port, dst_logic_port, bidi=True)
 
-                port_table = system_actions.get_port_table()
+                port_table = system_actions.refresh_port_table(
+                    port_table, [src_logic_port, dst_logic_port]
+                )
                 src_logic_port = port_table[src_port_name]
                 dst_logic_port = port_table[dst_port_name]
 
@@ -173,7 +310,7 @@ class DriverCommands(DriverCommandsInterface):
 
             if not is_connected:
                 mapping_actions.disconnect(
-                    {(src_logic_port, dst_logic_port)}, bidi=True
+                    {(src_logic_port, dst_logic_port)}, port_table, bidi=True
                 )
                 raise ConnectionPortsError(
                     "Cannot connect port {} to port {} during {}sec".format(
@@ -182,7 +319,124 @@ class DriverCommands(DriverCommandsInterface):
                         self._mapping_timeout,
                     )
                 )
+            self._add_own_changes(mapping_hashes, port_table)
+
+    @timed("driver_command")
+    def map_bidi_batch(self, port_pairs):
+        """Create bidirectional connections between pairs of ports.
+
+        All connections are added to the device's pending queue at once, waited
+        together and verified by re-reading the ports. A few MapBidi commands of
+        one request are executed with it by RomeCommandExecutor.
+        :param port_pairs: src and dst ports addresses,
+            [('192.168.42.240:A/A/21', '192.168.42.240:A/A/22'), ...]
+        :type port_pairs: list[tuple[str, str]]
+        :return: errors of the port pairs in the same order, None if the ports
+            are connected
+        :rtype: list[Exception|None]
+        :raises Exception: if command failed for all port pairs
+        """
+        self._logger.info(
+            "MapBidi batch, Ports: {}".format(
+                ", ".join(" - ".join(port_pair) for port_pair in port_pairs)
+            )
+        )
+        port_name_pairs = [
+            (
+                self._convert_cs_port_to_port_name(src_port),
+                self._convert_cs_port_to_port_name(dst_port),
+            )
+            for src_port, dst_port in port_pairs
+        ]
+        used_port_names = set()
+        for port_name in (name for pair in port_name_pairs for name in pair):
+            if port_name in used_port_names:
+                raise BaseRomeException(
+                    "Port {} is used in a few connections".format(port_name)
+                )
+            used_port_names.add(port_name)
+
+        errors = [None] * len(port_pairs)
+        with self._get_cli_services_lst() as cli_services_lst:
+            mapping_actions = MappingActions(
+                cli_services_lst,
+                self._logger,
+                self._mapping_timeout,
+                self._mapping_check_delay,
+                self._port_table_cache,
+                self._polling_schedule,
+            )
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
+            port_table = system_actions.get_port_table()
+
+            logic_port_pairs = []
+            pair_indexes = {}  # <(src_logic_port, dst_logic_port)>: <index>
+            for i, (src_port_name, dst_port_name) in enumerate(port_name_pairs):
+                src_logic_port = port_table[src_port_name]
+                dst_logic_port = port_table[dst_port_name]
+                if port_table.is_connected(src_logic_port, dst_logic_port, bidi=True):
+                    self._logger.debug(
+                        "Ports {} and {} already connected".format(
+                            src_port_name, dst_port_name
+                        )
+                    )
+                    continue
+
+                try:
+                    port_table.verify_ports_for_connection(
+                        src_logic_port, dst_logic_port, bidi=True
+                    )
+                except ConnectionPortsError as e:
+                    self._logger.error(str(e))
+                    errors[i] = e
+                    continue
+                logic_port_pairs.append((src_logic_port, dst_logic_port))
+                pair_indexes[(src_logic_port, dst_logic_port)] = i
+
+            if not logic_port_pairs:
+                return errors
+
+            mapping_hashes = self._get_mapping_hashes(port_table)
+            mapping_actions.connect_many(logic_port_pairs)
+
+            port_table = system_actions.refresh_port_table(
+                port_table, [port for pair in logic_port_pairs for port in pair]
+            )
+            not_connected_pairs = set()
+            for src_logic_port, dst_logic_port in logic_port_pairs:
+                try:
+                    is_connected = port_table.is_connected(
+                        port_table[src_logic_port.name],
+                        port_table[dst_logic_port.name],
+                        bidi=True,
+                    )
+                except BaseRomeException:
+                    is_connected = False
+
+                if not is_connected:
+                    not_connected_pairs.add((src_logic_port, dst_logic_port))
+                    error = ConnectionPortsError(
+                        "Cannot connect ports {} to {} during {}sec".format(
+                            src_logic_port.original_logical_name,
+                            dst_logic_port.original_logical_name,
+                            self._mapping_timeout,
+                        )
+                    )
+                    self._logger.error(str(error))
+                    errors[pair_indexes[(src_logic_port, dst_logic_port)]] = error
 
+            if not_connected_pairs:
+                mapping_actions.disconnect(not_connected_pairs, port_table, bidi=True)
+            else:
+                self._add_own_changes(mapping_hashes, port_table)
+        return errors
+
+    @timed("driver_command")
     def map_uni(self, src_port, dst_ports):
         """Unidirectional mapping of two ports.
 
@@ -209,12 +463,19 @@ class DriverCommands(DriverCommandsInterface):
         dst_port_name = self._convert_cs_port_to_port_name(dst_ports[0])
 
         with self._get_cli_services_lst() as cli_services_lst:
-            system_actions = SystemActions(cli_services_lst, self._logger)
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
             mapping_actions = MappingActions(
                 cli_services_lst,
                 self._logger,
                 self._mapping_timeout,
                 self._mapping_check_delay,
+                self._port_table_cache,
+                self._polling_schedule,
             )
             port_table = system_actions.get_port_table()
             src_logic_port = port_table[src_port_name]
@@ -229,9 +490,12 @@ class DriverCommands(DriverCommandsInterface):
                 return
 
             port_table.verify_ports_for_connection(src_logic_port, dst_logic_port)
+            mapping_hashes = self._get_mapping_hashes(port_table)
             mapping_actions.connect(src_logic_port, dst_logic_port, bidi=False)
 
-            port_table = system_actions.get_port_table()
+            port_table = system_actions.refresh_port_table(
+                port_table, [src_logic_port, dst_logic_port]
+            )
             src_logic_port = port_table[src_port_name]
             dst_logic_port = port_table[dst_port_name]
 
@@ -241,6 +505,7 @@ class DriverCommands(DriverCommandsInterface):
                         src_port_name, dst_port_name, self._mapping_timeout
                     )
                 )
+            self._add_own_changes(mapping_hashes, port_table)
 
     def _split_addresses_and_letter(self, address):
         """Extract resources addresses and matrix letter.
@@ -274,10 +539,16 @@ class DriverCommands(DriverCommandsInterface):
         return hosts, letter
 
     @contextmanager
-    def _get_cli_services_lst(self):
-        stacks = [self._cli_handler.default_mode_service()]
+    def _get_cli_services_lst(self, read_only=False):
+        """CLI services of the hosts.
+
+        :param read_only: the commands only read the device, they don't wait
+            for the sessions busy with the mapping
+        :type read_only: bool
+        """
+        stacks = [self._cli_handler.default_mode_service(read_only)]
         if self._second_cli_handler:
-            stacks.append(self._second_cli_handler.default_mode_service())
+            stacks.append(self._second_cli_handler.default_mode_service(read_only))
 
         services = []
         for stack in stacks:
@@ -285,15 +556,21 @@ class DriverCommands(DriverCommandsInterface):
 
         try:
             yield services
-        finally:
+        except BaseException:
+            # sys.exc_info() in finally returns the exception handled by the
+            # caller earlier in Python 2, even if the block succeeded
             not_raise = False
             exc_info = sys.exc_info()
             for stack in stacks:
                 not_raise = stack.__exit__(*exc_info)
 
-            if not not_raise and exc_info[0]:
+            if not not_raise:
                 raise exc_info[1]
+        else:
+            for stack in stacks:
+                stack.__exit__(None, None, None)
 
+    @timed("driver_command")
     def get_resource_description(self, address):
         """Auto-load function to retrieve all information from the device.
 
@@ -306,19 +583,74 @@ class DriverCommands(DriverCommandsInterface):
         """
         _, letter = self._split_addresses_and_letter(address)
 
-        with self._get_cli_services_lst() as cli_services_lst:
-            system_actions = SystemActions(cli_services_lst, self._logger)
+        if self._state_id_tracker is not None:
+            return self._get_resource_description_if_changed(address, letter)
+
+        with self._get_cli_services_lst(read_only=True) as cli_services_lst:
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
             port_table = system_actions.get_port_table()
-            board_tables_map = system_actions.get_board_tables_map()
+            board_info_map = system_actions.get_board_info_map()
 
         autoload_helper = AutoloadHelper(
-            address, board_tables_map.values()[0], port_table, letter, self._logger
+            address,
+            board_info_map[cli_services_lst[0]],
+            port_table,
+            letter,
+            self._logger,
         )
         response_info = ResourceDescriptionResponseInfo(
             autoload_helper.build_structure()
         )
         return response_info
 
+    def _get_resource_description_if_changed(self, address, letter):
+        """Build resource description if the device is changed since last autoload.
+
+        :type address: str
+        :type letter: str
+        :rtype: cloudshell.layer_one.core.response.response_info.ResourceDescriptionResponseInfo  # noqa: E501
+        """
+        with self._get_cli_services_lst(read_only=True) as cli_services_lst:
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
+            )
+            board_info_map = system_actions.get_board_info_map(refresh=True)
+            operation_counts = self._get_operation_counts(
+                cli_services_lst, board_info_map
+            )
+            cached_operation_counts, response_info = self._autoload_cache.get(
+                address, (None, None)
+            )
+            if None not in operation_counts and (
+                cached_operation_counts == operation_counts
+            ):
+                self._logger.info("Device isn't changed since the last autoload")
+                return response_info
+
+            port_table = system_actions.get_port_table()
+
+        autoload_helper = AutoloadHelper(
+            address,
+            board_info_map[cli_services_lst[0]],
+            port_table,
+            letter,
+            self._logger,
+        )
+        response_info = ResourceDescriptionResponseInfo(
+            autoload_helper.build_structure()
+        )
+        self._autoload_cache[address] = (operation_counts, response_info)
+        return response_info
+
+    @timed("driver_command")
     def map_clear(self, ports):
         """Remove simplex/multi-cast/duplex connection ending on the destination port.
 
@@ -336,13 +668,24 @@ class DriverCommands(DriverCommandsInterface):
                 self._logger,
                 self._mapping_timeout,
                 self._mapping_check_delay,
+                self._port_table_cache,
+                self._polling_schedule,
+            )
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
             )
-            system_actions = SystemActions(cli_services_lst, self._logger)
             port_table = system_actions.get_port_table()
             connected_ports = port_table.get_connected_port_pairs(port_names, bidi=True)
-            mapping_actions.disconnect(connected_ports)
+            mapping_hashes = self._get_mapping_hashes(port_table)
+            mapping_actions.disconnect(connected_ports, port_table)
 
-            port_table = system_actions.get_port_table()
+            # peers of the ports are disconnected as well
+            logical_ports = [port_table[port_name] for port_name in port_names]
+            logical_ports.extend(port for pair in connected_ports for port in pair)
+            port_table = system_actions.refresh_port_table(port_table, logical_ports)
             connected_ports = port_table.get_connected_port_pairs(port_names, bidi=True)
             if connected_ports:
                 connected_port_names = [
@@ -353,7 +696,9 @@ class DriverCommands(DriverCommandsInterface):
                         ", ".join(map(" - ".join, connected_port_names))
                     )
                 )
+            self._add_own_changes(mapping_hashes, port_table)
 
+    @timed("driver_command")
     def map_clear_to(self, src_port, dst_ports):
         """Remove simplex/multi-cast/duplex connection ending on the destination port.
 
@@ -383,8 +728,15 @@ class DriverCommands(DriverCommandsInterface):
                 self._logger,
                 self._mapping_timeout,
                 self._mapping_check_delay,
+                self._port_table_cache,
+                self._polling_schedule,
+            )
+            system_actions = SystemActions(
+                cli_services_lst,
+                self._logger,
+                self._port_table_cache,
+                self._board_info_cache,
             )
-            system_actions = SystemActions(cli_services_lst, self._logger)
             port_table = system_actions.get_port_table()
             connected_ports = port_table.get_connected_port_pairs([src_port_name])
 
@@ -399,9 +751,12 @@ class DriverCommands(DriverCommandsInterface):
                         dst_logic_port.name
                     )
                 )
-            mapping_actions.disconnect(connected_ports)
+            mapping_hashes = self._get_mapping_hashes(port_table)
+            mapping_actions.disconnect(connected_ports, port_table)
 
-            port_table = system_actions.get_port_table()
+            port_table = system_actions.refresh_port_table(
+                port_table, [src_logic_port, dst_logic_port]
+            )
             connected_ports = port_table.get_connected_port_pairs([src_port_name])
             if connected_ports:
                 raise BaseRomeException(
@@ -409,7 +764,9 @@ class DriverCommands(DriverCommandsInterface):
                         " - ".join((src_logic_port.name, dst_logic_port.name))
                     )
                 )
+            self._add_own_changes(mapping_hashes, port_table)
 
+    @timed("driver_command")
     def get_attribute_value(self, cs_address, attribute_name):
         """Retrieve attribute value from the device.
 
@@ -423,18 +780,27 @@ class DriverCommands(DriverCommandsInterface):
         """
         serial_number = "Serial Number"
         if len(cs_address.split("/")) == 1 and attribute_name == serial_number:
-            with self._get_cli_services_lst() as cli_services_lst:
-                system_actions = SystemActions(cli_services_lst, self._logger)
-                board_tables_map = system_actions.get_board_tables_map()
-            return AttributeValueResponseInfo(
-                board_tables_map.values()[0].get("serial_number")
-            )
+            hosts, _ = self._split_addresses_and_letter(cs_address)
+            # board info read by login or autoload is enough for the serial number
+            board_info = self._board_info_cache.get(hosts[0])
+            if board_info is None:
+                with self._get_cli_services_lst(read_only=True) as cli_services_lst:
+                    system_actions = SystemActions(
+                        cli_services_lst,
+                        self._logger,
+                        self._port_table_cache,
+                        self._board_info_cache,
+                    )
+                    board_info_map = system_actions.get_board_info_map()
+                board_info = board_info_map[cli_services_lst[0]]
+            return AttributeValueResponseInfo(board_info.serial_number)
         else:
             msg = "Attribute {} for {} is not available".format(
                 attribute_name, cs_address
             )
             raise BaseRomeException(msg)
 
+    @timed("driver_command")
     def set_attribute_value(self, cs_address, attribute_name, attribute_value):
         """Set attribute value to the device.
 
@@ -455,9 +821,11 @@ class DriverCommands(DriverCommandsInterface):
                 "SetAttribute {} is not supported".format(attribute_name)
             )
 
+    @timed("driver_command")
     def map_tap(self, src_port, dst_ports):
         return self.map_uni(src_port, dst_ports)
 
+    @timed("driver_command")
     def set_speed_manual(self, src_port, dst_port, speed, duplex):
         """Set connection speed.
 
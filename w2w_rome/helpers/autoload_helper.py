@@ -6,19 +6,17 @@ from w2w_rome.helpers.errors import BaseRomeException
 
 
 class AutoloadHelper(object):
-    def __init__(
-        self, resource_address, board_table, port_table, matrix_letter, logger
-    ):
+    def __init__(self, resource_address, board_info, port_table, matrix_letter, logger):
         """Autoload helper.
 
         :param resource_address: the address that we got from CS without changes!
         :type resource_address: str
-        :type board_table: dict
+        :type board_info: w2w_rome.helpers.board_info.BoardInfo
         :type port_table: w2w_rome.helpers.port_entity.PortTable
         :type matrix_letter: str
         :type logger: logging.Logger
         """
-        self.board_table = board_table
+        self.board_info = board_info
         self.port_table = port_table
         self.matrix_letter = matrix_letter
         self.resource_address = resource_address
@@ -32,9 +30,9 @@ class AutoloadHelper(object):
         if self._chassis is not None:
             return self._chassis
 
-        serial_number = self.board_table.get("serial_number")
-        model_name = self.board_table.get("model_name")
-        sw_version = self.board_table.get("sw_version")
+        serial_number = self.board_info.serial_number
+        model_name = self.board_info.model_name
+        sw_version = self.board_info.sw_version
         chassis = Chassis(
             self._chassis_id, self.resource_address, "Rome Chassis", serial_number
         )
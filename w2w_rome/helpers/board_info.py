@@ -0,0 +1,133 @@
+import time
+from threading import Lock
+
+from w2w_rome.helpers import patterns
+
+
+class BoardInfo(object):
+    """Information from the "show board" output."""
+
+    __slots__ = (
+        "serial_number",
+        "model_name",
+        "sw_version",
+        "operation_count",
+        "matrix_sizes",
+        "read_time",
+    )
+
+    def __init__(
+        self,
+        serial_number=None,
+        model_name="Rome",
+        sw_version=None,
+        operation_count=None,
+        matrix_sizes=None,
+    ):
+        """Board info.
+
+        :type serial_number: str
+        :type model_name: str
+        :type sw_version: str
+        :param operation_count: changes with every connection on the device
+        :type operation_count: str
+        :param matrix_sizes: <letter>: (<W sub ports>, <E sub ports>)
+        :type matrix_sizes: dict[str, tuple[int, int]]
+        """
+        self.serial_number = serial_number
+        self.model_name = model_name
+        self.sw_version = sw_version
+        self.operation_count = operation_count
+        self.matrix_sizes = matrix_sizes or {}
+        self.read_time = time.time()
+
+    def __repr__(self):
+        return "<BoardInfo {0.model_name} S/N {0.serial_number}>".format(self)
+
+    @classmethod
+    def from_output(cls, output):
+        """Parse "show board" output.
+
+        :type output: str
+        :rtype: BoardInfo
+        """
+
+        def search(pattern, default=None):
+            match = pattern.search(output)
+            return match.group(1) if match else default
+
+        matrix_sizes = {
+            match.group("letter").upper(): (
+                int(match.group("west")),
+                int(match.group("east")),
+            )
+            for match in patterns.MATRIX_SIZE.finditer(output)
+        }
+        return cls(
+            serial_number=search(patterns.SERIAL_NUMBER),
+            model_name=search(patterns.MODEL_NAME, "Rome"),
+            sw_version=search(patterns.SW_VERSION),
+            operation_count=search(patterns.OPERATION_COUNT),
+            matrix_sizes=matrix_sizes,
+        )
+
+    def is_expired(self, max_age):
+        """Check that the info is older than max age.
+
+        :param max_age: seconds, never expires if None
+        :type max_age: float
+        :rtype: bool
+        """
+        return max_age is not None and time.time() - self.read_time > max_age
+
+
+class BoardInfoCache(object):
+    """Board info of the hosts kept between driver commands.
+
+    Serial number, model, SW version and matrix sizes don't change while the
+    driver works with the device, so they are served from the cache till it
+    expires. Operation count changes with every connection, commands that need
+    it read the board info again.
+    """
+
+    def __init__(self, max_age=None):
+        """Board info cache.
+
+        :param max_age: seconds to keep board info, forever if None
+        :type max_age: float
+        """
+        self._max_age = max_age
+        self._lock = Lock()
+        self._board_infos = {}  # <host>: <BoardInfo>
+
+    def get(self, host):
+        """Return board info of the host if it isn't expired.
+
+        :type host: str
+        :rtype: BoardInfo|None
+        """
+        with self._lock:
+            board_info = self._board_infos.get(host)
+        if board_info is None or board_info.is_expired(self._max_age):
+            return None
+        return board_info
+
+    def put(self, host, board_info):
+        """Save board info of the host.
+
+        :type host: str
+        :type board_info: BoardInfo
+        """
+        with self._lock:
+            self._board_infos[host] = board_info
+
+    def invalidate(self, host=None):
+        """Remove board info of the host or of all hosts.
+
+        :type host: str
+        """
+        with self._lock:
+            if host is None:
+                self._board_infos.clear()
+            else:
+                self._board_infos.pop(host, None)
@@ -16,3 +16,15 @@ class NotSupportedError(BaseRomeException):
 
 class GotErrorInThreads(BaseRomeException):
     """Got some error when executing func in a thread."""
+
+
+class TaskCancelledError(BaseRomeException):
+    """Task in a thread is cancelled because of an error in other thread."""
+
+
+class HostTimeoutError(BaseRomeException):
+    """Didn't get result from the host in time."""
+
+
+class TranscriptReplayError(BaseRomeException):
+    """Transcript doesn't have the answer to the command."""
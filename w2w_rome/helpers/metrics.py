@@ -0,0 +1,224 @@
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from logging.handlers import TimedRotatingFileHandler
+
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
+
+from w2w_rome.helpers.run_in_threads import get_executor
+from w2w_rome.helpers.tracing import get_log_dir, get_tracer
+
+
+class MetricsRegistry(object):
+    """Timers and counters of the driver labeled by command and host.
+
+    Nothing is collected if the registry is disabled.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._timers = {}  # (<name>, <labels>): [<count>, <errors>, <total>, <max>]
+        self._counters = {}  # (<name>, <labels>): <value>
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def observe(self, name, duration, error=False, **labels):
+        """Add duration to the timer.
+
+        :type name: str
+        :param duration: seconds
+        :type duration: float
+        :param error: the call failed
+        :type error: bool
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            timer = self._timers.get(key)
+            if timer is None:
+                timer = self._timers[key] = [0, 0, 0.0, 0.0]
+            timer[0] += 1
+            timer[1] += error
+            timer[2] += duration
+            timer[3] = max(timer[3], duration)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the block, failed blocks are counted as errors.
+
+        The block is traced as well, named by the command label.
+        """
+        with get_tracer().span(labels.get("command", name), name, **labels):
+            if not self.enabled:
+                yield
+                return
+            start_time = time.time()
+            try:
+                yield
+            except BaseException:
+                self.observe(name, time.time() - start_time, error=True, **labels)
+                raise
+            self.observe(name, time.time() - start_time, **labels)
+
+    def increment(self, name, value=1, **labels):
+        """Increase the counter.
+
+        :type name: str
+        :type value: int
+        """
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def get_metrics(self):
+        """Get values of all timers and counters since the start.
+
+        :rtype: dict[str, list[dict]]
+        """
+        with self._lock:
+            timers = [
+                dict(
+                    labels,
+                    name=name,
+                    count=count,
+                    errors=errors,
+                    time_total=total,
+                    time_max=max_time,
+                )
+                for (name, labels), (count, errors, total, max_time) in sorted(
+                    self._timers.items()
+                )
+            ]
+            counters = [
+                dict(labels, name=name, value=value)
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {"timers": timers, "counters": counters}
+
+
+class MetricsExporter(object):
+    """Write metrics into the file as JSON lines periodically.
+
+    The file is rotated at midnight.
+    """
+
+    def __init__(self, registry, file_path, logger, interval=60, backup_count=7):
+        """Metrics exporter.
+
+        :type registry: MetricsRegistry
+        :type file_path: str
+        :param logger: errors of the export are logged to it
+        :type logger: logging.Logger
+        :param interval: seconds between writes
+        :type interval: float
+        :param backup_count: rotated files that are kept
+        :type backup_count: int
+        """
+        self._registry = registry
+        self._logger = logger
+        self._interval = interval
+        self._handler = TimedRotatingFileHandler(
+            file_path, when="midnight", backupCount=backup_count
+        )
+        self._handler.setFormatter(logging.Formatter("%(message)s"))
+        self._metrics_logger = logging.getLogger("w2w_rome.metrics")
+        self._metrics_logger.propagate = False
+        self._metrics_logger.setLevel(logging.INFO)
+        self._metrics_logger.addHandler(self._handler)
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="RomeMetrics")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            time.sleep(self._interval)
+            try:
+                self.write()
+            except Exception:
+                self._logger.exception("Failed to write metrics")
+
+    def write(self):
+        metrics = self._registry.get_metrics()
+        metrics["time"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        metrics["threads"] = get_executor().get_metrics()
+        self._metrics_logger.info(json.dumps(metrics, sort_keys=True))
+        self._handler.flush()
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+_exporter = None
+_exporter_lock = threading.Lock()
+
+
+def get_metrics():
+    """Get process-wide metrics registry.
+
+    :rtype: MetricsRegistry
+    """
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                _metrics = MetricsRegistry(
+                    RuntimeConfiguration().read_key("METRICS.ENABLED", False)
+                )
+    return _metrics
+
+
+def start_metrics_export(logger, interval=60, backup_count=7):
+    """Start writing process-wide metrics beside the command logs.
+
+    The export is started once for the process.
+    :param logger: errors of the export are logged to it
+    :type logger: logging.Logger
+    :type interval: float
+    :type backup_count: int
+    :rtype: MetricsExporter
+    """
+    global _exporter
+    with _exporter_lock:
+        if _exporter is None:
+            log_dir = get_log_dir()
+            if not os.path.isdir(log_dir):
+                os.makedirs(log_dir)
+            _exporter = MetricsExporter(
+                get_metrics(),
+                os.path.join(log_dir, "w2w_rome_metrics.jsonl"),
+                logger,
+                interval,
+                backup_count,
+            ).start()
+    return _exporter
+
+
+def timed(name):
+    """Time calls of the method labeled by its name.
+
+    :param name: name of the timer
+    :type name: str
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            with get_metrics().timer(name, command=func.__name__):
+                return func(*args, **kwargs)
+
+        return wrapped
+
+    return decorator
@@ -0,0 +1,86 @@
+class RobotMoveModel(object):
+    """Simplified model of the robot travel.
+
+    Every connection or disconnection is a move of the robot to the E sub port and
+    then to the W sub port. Travel time depends on the distance between sub port
+    IDs. Every move changes the side twice whatever the order is, so the side
+    changes are not counted.
+    """
+
+    # sub port ID
+    START_POSITION = 1
+
+    def __init__(self, port_travel_time=0.05):
+        """Robot move model.
+
+        :param port_travel_time: time to pass one sub port
+        :type port_travel_time: float
+        """
+        self._port_travel_time = port_travel_time
+
+    def travel_time(self, from_position, to_position):
+        """Time to travel between positions.
+
+        :param from_position: sub port ID
+        :type from_position: int
+        :type to_position: int
+        :rtype: float
+        """
+        return abs(from_position - to_position) * self._port_travel_time
+
+    def moves_time(self, position, moves):
+        """Time to make the moves and the position of the robot after them.
+
+        :type position: int
+        :param moves: (<E sub port ID>, <W sub port ID>)
+        :type moves: list[tuple[int, int]]
+        :rtype: tuple[float, int]
+        """
+        total_time = 0
+        for e_id, w_id in moves:
+            total_time += self.travel_time(position, e_id)
+            total_time += self.travel_time(e_id, w_id)
+            position = w_id
+        return total_time, position
+
+    def total_time(self, moves_list):
+        """Time to make all moves in the order.
+
+        :type moves_list: list[list[tuple[int, int]]]
+        :rtype: float
+        """
+        total_time = 0
+        position = self.START_POSITION
+        for moves in moves_list:
+            moves_time, position = self.moves_time(position, moves)
+            total_time += moves_time
+        return total_time
+
+
+def order_by_robot_travel(items, get_moves, model=None):
+    """Order items to minimize the robot travel.
+
+    Takes the item that starts nearest to the current robot position every time.
+    Items with the same travel time keep their order.
+    :type items: list
+    :param get_moves: returns E and W sub port IDs the robot moves for the item
+    :type get_moves: function
+    :type model: RobotMoveModel
+    :rtype: list
+    """
+    model = model or RobotMoveModel()
+    remaining = [(item, get_moves(item)) for item in items]
+    position = model.START_POSITION
+    ordered = []
+
+    while remaining:
+        # travel inside of the item doesn't depend on the order
+        index = min(
+            range(len(remaining)),
+            key=lambda i: model.travel_time(position, remaining[i][1][0][0]),
+        )
+        item, moves = remaining.pop(index)
+        _, position = model.moves_time(position, moves)
+        ordered.append(item)
+
+    return ordered
@@ -0,0 +1,56 @@
+import re
+
+# patterns for parsing the device output are compiled once on import
+
+# show board
+SERIAL_NUMBER = re.compile(r"BOARD\s+.*S/N\((.+?)\)", re.DOTALL)
+MODEL_NAME = re.compile(r"^rome\s+type\s+(.+?)\s*$", re.MULTILINE | re.IGNORECASE)
+SW_VERSION = re.compile(r"ACTIVE\s+SW\s+VER\s+(\d+\.\d+\.\d+\.\d+)")
+OPERATION_COUNT = re.compile(r"OPERATION\s+COUNT\s+(\d+)")
+# Matrix A: Male/West 1..132, Female/East 1..130
+MATRIX_SIZE = re.compile(
+    r"Matrix\s+(?P<letter>\w+):\s*Male/West\s+\d+\.\.(?P<west>\d+),\s*"
+    r"Female/East\s+\d+\.\.(?P<east>\d+)",
+    re.IGNORECASE,
+)
+
+# connection show pending
+# connect, ports: A3-A4, status: in process with payload
+CONNECTION_IN_PROCESS = re.compile(
+    r"ports:\s+(?P<src>\w+)-(?P<dst>\w+)\D", re.IGNORECASE
+)
+# 772     A1        A2        connect            CLI     admin
+# columns are in one line, the header and ===== rows don't start with a number
+CONNECTION_PENDING_ROW = re.compile(
+    r"^[ \t]*\d+[ \t]+(?P<src>\w+)[ \t]+(?P<dst>\w+)[ \t]+\w+",
+    re.MULTILINE | re.IGNORECASE,
+)
+# inline flag, the source is used in the action map of the CLI commands
+CONNECTION_PENDING_SEVERE_FAILURE = re.compile(
+    r"(?i)Multiple Cross Connect Severe Failure"
+)
+
+# log lines that the device writes into the session
+# 08-06-2019 09:01 Connection A3<->A4 completed successfully
+# 08-06-2019 09:01 CONNECTION OPERATION SUCCEEDED:E2[1AE2]<->W1[1AW1] OP:connect
+LOG_LINE = re.compile(
+    r"(?P<time>\d+-\d+-\d+\s\d+:\d+)\s(?:"
+    r"connection\s(?P<src>\w+)<->(?P<dst>\w+)\scompleted\s(?P<status>\w+)"
+    r"|connection operation (?P<operation_status>[\w( )]+):"
+    r"(?P<src_sub_port>[\w\[\]]+)<->(?P<dst_sub_port>[\w\[\]]+) OP:(?P<operation>\w+)"
+    r") *$",
+    re.IGNORECASE,
+)
+# beginning of the log line that isn't received completely yet
+LOG_LINE_START = re.compile(r"(?:\d+(?:-\d*(?:-\d*(?:\s\d*(?::\d*(?:\s.*)?)?)?)?)?)?$")
+
+# prompt with connection log lines that the device writes after it
+# ROME[OPER]# 08-18-2019 12:37 CONNECTING...
+_LOG_DATE_TIME = r"\d{1,2}-\d{1,2}-\d{2,4}\s\d{1,2}:\d{1,2}\s"
+_LOG_ENTRIES = (
+    r"(?:" + _LOG_DATE_TIME + r"(?:(?:dis)?connecting\.{3}"
+    r"|connection operation [\w( )]+:\w+\[\w+\]<->\w+\[\w+\]\sop:\w+)\s*)*"
+    r"(?:" + _LOG_DATE_TIME + r"connection .+ completed .+)?\s*$"
+)
+LOG_ONLY_LINE = re.compile(_LOG_ENTRIES, re.IGNORECASE)
+PROMPT_LINE = re.compile(r"\w+\[\w+\]#\s*" + _LOG_ENTRIES, re.IGNORECASE)
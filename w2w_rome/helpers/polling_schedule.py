@@ -0,0 +1,115 @@
+import math
+from collections import deque
+from threading import Lock
+
+
+class MoveTimeStats(object):
+    """Move times of the robot per port for the last operations."""
+
+    MAX_SAMPLES = 50
+
+    def __init__(self):
+        self._samples = deque(maxlen=self.MAX_SAMPLES)
+
+    def add(self, move_time):
+        """Add move time of one port.
+
+        :type move_time: float
+        """
+        self._samples.append(move_time)
+
+    @property
+    def count(self):
+        return len(self._samples)
+
+    @property
+    def mean(self):
+        return sum(self._samples) / len(self._samples)
+
+    @property
+    def std(self):
+        mean = self.mean
+        variance = sum((sample - mean) ** 2 for sample in self._samples)
+        return math.sqrt(variance / len(self._samples))
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "std": self.std,
+            "min": min(self._samples),
+            "max": max(self._samples),
+        }
+
+
+class AdaptivePollingSchedule(object):
+    """Delays between checks of the pending connections.
+
+    Learns how long the robot moves a port on every host and matrix. Until enough
+    operations completed the check delay is used. Then the first check is close to
+    the expected completion time and checks are dense around it.
+    """
+
+    MIN_SAMPLES = 3
+    MIN_DELAY = 0.2
+
+    def __init__(self):
+        self._lock = Lock()
+        self._stats = {}  # (<host>, <blade_letter>): <MoveTimeStats>
+
+    def add_operation(self, host, blade_letter, duration, num_ports):
+        """Learn from completed operation.
+
+        :type host: str
+        :type blade_letter: str
+        :param duration: time from sending requests to completion
+        :type duration: float
+        :type num_ports: int
+        """
+        with self._lock:
+            stats = self._stats.setdefault((host, blade_letter), MoveTimeStats())
+            stats.add(duration / max(num_ports, 1))
+
+    def get_delay(self, host, blade_letter, elapsed, num_ports, check_delay):
+        """Get delay before the next check of the pending connections.
+
+        :type host: str
+        :type blade_letter: str
+        :param elapsed: time from sending requests
+        :type elapsed: float
+        :type num_ports: int
+        :param check_delay: used when there are not enough statistics
+        :type check_delay: float
+        :rtype: float
+        """
+        with self._lock:
+            stats = self._stats.get((host, blade_letter))
+            if stats is None or stats.count < self.MIN_SAMPLES:
+                return check_delay
+            mean, std = stats.mean, stats.std
+
+        expected = mean * num_ports
+        # ports move one by one so the deviation grows as a square root
+        spread = max(std * math.sqrt(num_ports), expected * 0.1)
+        window_start = expected - 2 * spread
+        window_end = expected + 2 * spread
+
+        if elapsed < window_start:
+            # check rarely before the robot can finish
+            time_left = window_start - elapsed
+            return time_left / 2 if time_left > 2 * check_delay else time_left
+        if elapsed < window_end:
+            return max(min(check_delay, spread / 2), min(self.MIN_DELAY, check_delay))
+        return check_delay
+
+    def get_statistics(self):
+        """Learned move times per port.
+
+        :return: {"<host>/<blade_letter>": {"count", "mean", "std", "min", "max"}}
+        :rtype: dict[str, dict[str, float]]
+        """
+        with self._lock:
+            return {
+                "{}/{}".format(host, blade_letter): stats.to_dict()
+                for (host, blade_letter), stats in self._stats.items()
+            }
@@ -1,7 +1,5 @@
-import itertools
 import random
-import re
-from copy import copy
+from collections import defaultdict
 from typing import List
 
 from w2w_rome.helpers.cached_property import cached_property
@@ -10,34 +8,33 @@ from w2w_rome.helpers.errors import (
     ConnectedToDifferentPortsError,
     ConnectionPortsError,
 )
+from w2w_rome.helpers.port_table_parser import PortShowParser
+
+PORT_SHOW_PARSER = PortShowParser()
+_INTERNED_LETTERS = {}
+
+
+def _intern_letter(letter):
+    """Use the same string object for all equal directions and blade letters."""
+    return _INTERNED_LETTERS.setdefault(letter, letter)
 
 
 class SubPort(object):
     """Sub port that keep fiber port for one direction."""
 
-    PORT_PATTERN = re.compile(
-        r"(?P<direction>[EW])(?P<port_id>\d+)"
-        r"\[(?P<port_full_name>\w+?)]\s+"
-        r"(?P<admin_status>(locked|unlocked))\s+"
-        r"(?P<oper_status>(enabled|disabled))\s+"
-        r"(?P<port_status>((dis)?connected)|in process)\s+"
-        r"\d+\s+"
-        r"((?P<conn_to_direction>[EW])(?P<conn_to_port_id>\d+)"
-        r"\[\w+])?\s+"
-        r"(?P<logical_name>[ABQPXY]\d+)",
-        re.IGNORECASE,
-    )
-    PORT_PATTERN_V2 = re.compile(
-        r"(?P<port_full_name>\w+?)\s+"
-        r"(?P<admin_status>(locked|unlocked))\s+"
-        r"(?P<oper_status>(enabled|disabled))\s+"
-        r"(?P<port_status>((dis)?connected)|in process)\s+"
-        r"\d+\s+"
-        r"((?P<conn_to_direction>[EW])(?P<conn_to_port_id>\d+)"
-        r"\[\w+])?\s+"
-        r"(?P<direction>[EW])(?P<port_id>\d+)\s*,\s*"
-        r"(?P<logical_name>[ABQPXY]\d+)",
-        re.IGNORECASE,
+    __slots__ = (
+        "direction",
+        "sub_port_number",
+        "sub_port_full_name",
+        "blade_letter",
+        "locked",
+        "enabled",
+        "connected",
+        "connected_to_direction",
+        "connected_to_sub_port_id",
+        "logical",
+        "port_resource",
+        "original_logical_name",
     )
 
     def __init__(
@@ -53,26 +50,35 @@ class SubPort(object):
         logical,
         port_resource,
     ):
-        self.direction = direction
-        self.sub_port_id = port_id
+        self.direction = _intern_letter(direction)
+        self.sub_port_number = int(port_id)
         self.sub_port_full_name = port_full_name
-        self.blade_letter = logical[0] if logical[0] != "P" else "Q"
-        self.sub_port_name = "{}{}".format(direction, port_id)  # E12
+        self.blade_letter = _intern_letter(logical[0] if logical[0] != "P" else "Q")
         self.locked = locked
         self.enabled = enabled
         self.connected = connected
-        self.connected_to_direction = connected_to_direction
+        self.connected_to_direction = _intern_letter(connected_to_direction)
         self.connected_to_sub_port_id = connected_to_port_id
         self.logical = logical if logical[0] != "P" else "Q" + logical[1:]
+        self.port_resource = port_resource
+        self.original_logical_name = logical
+
+    @property
+    def sub_port_id(self):
+        return str(self.sub_port_number)
+
+    @property
+    def sub_port_name(self):
+        return "{}{}".format(self.direction, self.sub_port_number)  # E12
+
+    @property
+    def port_name(self):
         if self.blade_letter in "XY":
             # XY ports have sub ports from different blades and different port id for
             # the same logical port name, e.g. X1 - E129B, W1A; Y4 - E4A, W132B
-            self.port_name = logical
-        else:
-            # A13, Q1
-            self.port_name = "{}{}".format(self.blade_letter, self.sub_port_id)
-        self.port_resource = port_resource
-        self.original_logical_name = logical
+            return self.original_logical_name
+        # A13, Q1
+        return "{}{}".format(self.blade_letter, self.sub_port_number)
 
     def __str__(self):
         return "<SubPort {0.port_resource}:{0.sub_port_name}>".format(self)
@@ -117,15 +123,16 @@ class SubPort(object):
     def __eq__(self, other):
         if isinstance(other, type(self)):
             return (
-                self.port_resource == other.port_resource
-                and self.sub_port_name == other.sub_port_name
+                self.sub_port_number == other.sub_port_number
+                and self.direction == other.direction
+                and self.port_resource == other.port_resource
             )
         return False
 
     def __lt__(self, other):
         if isinstance(other, type(self)):
             if self.direction == other.direction:
-                return int(self.sub_port_id) < int(other.sub_port_id)
+                return self.sub_port_number < other.sub_port_number
             return self.direction < other.direction
         raise NotImplementedError
 
@@ -138,15 +145,7 @@ class SubPort(object):
         # type: (str, str) -> List[SubPort]
         sub_ports = []
 
-        port_info_list = list(cls.PORT_PATTERN.finditer(port_table_out))
-        if not port_info_list:
-            port_info_list = list(cls.PORT_PATTERN_V2.finditer(port_table_out))
-
-        for port_match in port_info_list:
-            # port_info = ('E', '20', '1AE20', 'Unlocked', 'Unlocked', 'Enabled',
-            #           'Enabled', 'Connected', 'Connected', '', 'W121[1AW121]', 'W',  # noqa
-            #           '121', 'P20')
-            port_info = port_match.groupdict()
+        for port_info in PORT_SHOW_PARSER.parse(port_table_out, port_resource):
             sub_port = cls(
                 direction=port_info["direction"].upper(),
                 port_id=port_info["port_id"],
@@ -181,13 +180,19 @@ class RomePort(object):
     :type w_port: SubPort
     """
 
+    __slots__ = ("port_resource", "port_name", "sub_port_number", "e_port", "w_port")
+
     def __init__(self, port_resource, port_name):
         self.port_resource = port_resource
         self.port_name = port_name
-        self.sub_port_id = port_name[1:]
+        self.sub_port_number = int(port_name[1:])
         self.e_port = None
         self.w_port = None
 
+    @property
+    def sub_port_id(self):
+        return str(self.sub_port_number)
+
     def __str__(self):
         return "<RomePort {0.port_resource}:{0.port_name}>".format(self)
 
@@ -218,6 +223,20 @@ class RomePort(object):
 
         setattr(self, attr_name, sub_port)
 
+    def replace_sub_port(self, sub_port):
+        """Replace existing sub port with the re-read one.
+
+        :type sub_port: SubPort
+        """
+        if sub_port.port_resource != self.port_resource:
+            raise ValueError(
+                "Sub port ({}) located on a different resource from a "
+                "Rome port ({})".format(sub_port, self)
+            )
+
+        attr_name = "{}_port".format(sub_port.direction.lower())
+        setattr(self, attr_name, sub_port)
+
 
 class LogicalPort(object):
     """Rome logical port.
@@ -226,9 +245,11 @@ class LogicalPort(object):
     :type name: str
     """
 
+    __slots__ = ("name", "blade_letter", "port_id", "_rome_ports_map", "is_q_port")
+
     def __init__(self, name):
         self.name = name
-        self.blade_letter = name[0].upper()
+        self.blade_letter = _intern_letter(name[0].upper())
         self.port_id = name[1:]
         self._rome_ports_map = {}  # (<port_resource>, <port_name>): <rome_port>
         self.is_q_port = self.blade_letter == "Q"
@@ -299,6 +320,21 @@ class LogicalPort(object):
         )
         rome_port.add_sub_port(sub_port)
 
+    def replace_sub_port(self, sub_port):
+        """Replace sub port of the existing Rome port.
+
+        :type sub_port: SubPort
+        """
+        try:
+            rome_port = self._rome_ports_map[
+                (sub_port.port_resource, sub_port.port_name)
+            ]
+        except KeyError:
+            raise BaseRomeException(
+                "Port {} doesn't have sub port {}".format(self.name, sub_port)
+            )
+        rome_port.replace_sub_port(sub_port)
+
     @property
     def connected_to_sub_port_names(self):
         return filter(
@@ -332,22 +368,6 @@ class LogicalPort(object):
     def verify_w_ports_is_not_locked_or_disabled(self):
         map(SubPort.verify_sub_port_is_not_locked_or_disabled, self.w_sub_ports)
 
-    def get_connected_sub_ports(self, dst_logic_port):
-        """Return set with connected sub ports.
-
-        :type dst_logic_port: LogicalPort
-        :rtype: set[tuple[SubPort, SubPort]]
-        """
-        return {
-            (e_port, w_port)
-            for e_port in self.e_sub_ports
-            for w_port in dst_logic_port.w_sub_ports
-            if (
-                e_port.connected_to_sub_port_name == w_port.sub_port_name
-                and e_port.port_resource == w_port.port_resource
-            )
-        }
-
 
 class PortTable(object):
     """Table with Rome ports.
@@ -357,6 +377,9 @@ class PortTable(object):
 
     def __init__(self):
         self._map_ports = {}
+        # <logical_name>: ((<connected_to>, <error>), (<connected_from>, <error>),
+        #                  {<dst_logical_name>: {(<e_sub_port>, <w_sub_port>)}})
+        self._connections_index = None
 
     @classmethod
     def from_output(cls, port_table_output, host):
@@ -371,6 +394,7 @@ class PortTable(object):
             rome_logical_port = port_table.get_or_create(sub_port.logical)
             rome_logical_port.add_sub_port(sub_port)
         port_table.validate(port_table_output)
+        port_table._connections_index = port_table._build_connections_index()
         return port_table
 
     @property
@@ -393,27 +417,49 @@ class PortTable(object):
                 dict_.update({rp.e_port.sub_port_name: lp, rp.w_port.sub_port_name: lp})
         return dict_
 
-    def __add__(self, other):
-        cls = type(self)
-        if not isinstance(other, cls):
-            raise ValueError("Cannot add {} to PortTable".format(type(other)))
+    @classmethod
+    def merge(cls, port_tables):
+        """Combine port tables of the hosts into one table.
+
+        Sub ports are not copied, the tables share them with the combined one.
+        :type port_tables: list[PortTable]
+        :rtype: PortTable
+        """
+        for port_table in port_tables:
+            if not isinstance(port_table, cls):
+                raise ValueError("Cannot add {} to PortTable".format(type(port_table)))
 
-        if set(self._map_ports.keys()) != set(other._map_ports.keys()):
+        port_names = set(port_tables[0]._map_ports)
+        if any(set(port_table._map_ports) != port_names for port_table in port_tables):
             raise ValueError("Port tables have different logical ports")
 
         new_port_table = cls()
-        for port_name, first_logical_port in self._map_ports.items():
-            second_logical_port = other[port_name]
+        for port_name in port_tables[0]._map_ports:
             new_logical_port = new_port_table.get_or_create(port_name)
-
-            for rome_port in itertools.chain(first_logical_port, second_logical_port):
-                new_e_sub_port = copy(rome_port.e_port)
-                new_w_sub_port = copy(rome_port.w_port)
-                new_logical_port.add_sub_port(new_e_sub_port)
-                new_logical_port.add_sub_port(new_w_sub_port)
+            for port_table in port_tables:
+                for rome_port in port_table[port_name]:
+                    new_logical_port.add_sub_port(rome_port.e_port)
+                    new_logical_port.add_sub_port(rome_port.w_port)
 
         return new_port_table
 
+    def __add__(self, other):
+        return self.merge([self, other])
+
+    def update_sub_ports(self, sub_ports):
+        """Replace sub ports in the table with the re-read ones.
+
+        :type sub_ports: list[SubPort]
+        :return: updated sub ports, (<port_resource>, <sub_port_name>)
+        :rtype: set[tuple[str, str]]
+        """
+        updated = set()
+        for sub_port in sub_ports:
+            self[sub_port.logical].replace_sub_port(sub_port)
+            updated.add((sub_port.port_resource, sub_port.sub_port_name))
+        self._connections_index = None
+        return updated
+
     def validate(self, output):
         msg = "Not all sub ports are loaded. Output is:\n{}".format(output)
         for lp in self.logical_ports:
@@ -427,6 +473,7 @@ class PortTable(object):
         except KeyError:
             logical_port = LogicalPort(logical_name)
             self._map_ports[logical_name] = logical_port
+            self._connections_index = None
 
         return logical_port
 
@@ -458,18 +505,74 @@ class PortTable(object):
     def __iter__(self):
         return iter(self._map_ports.values())
 
+    def _find_connected_port(self, logical_port, connected_sub_port_names):
+        """Find a logical port connected with the sub ports.
+
+        :type logical_port: LogicalPort
+        :type connected_sub_port_names: list[str]
+        :return: connected port and an error to raise when it is requested
+        :rtype: tuple[LogicalPort, Exception]
+        """
+        try:
+            connected_ports = map(self.get_by_sub_port_name, connected_sub_port_names)
+            if connected_ports:
+                logical_port.verify_connected_ports(connected_ports)
+                return connected_ports[0], None
+        except (KeyError, ConnectedToDifferentPortsError) as e:
+            return None, e
+        return None, None
+
+    def _find_connected_sub_ports(self, logical_port, w_ports_map):
+        """Group connected E and W sub ports by the logical port of W sub ports.
+
+        :type logical_port: LogicalPort
+        :param w_ports_map: {(<port_resource>, <sub_port_name>): <w_sub_port>}
+        :type w_ports_map: dict[tuple[str, str], SubPort]
+        :rtype: dict[str, set[tuple[SubPort, SubPort]]]
+        """
+        connected_sub_ports = defaultdict(set)
+        for e_port in logical_port.e_sub_ports:
+            w_port = w_ports_map.get(
+                (e_port.port_resource, e_port.connected_to_sub_port_name)
+            )
+            if w_port is not None:
+                connected_sub_ports[w_port.logical].add((e_port, w_port))
+        return connected_sub_ports
+
+    def _build_connections_index(self):
+        w_ports_map = {
+            (w_port.port_resource, w_port.sub_port_name): w_port
+            for logical_port in self.logical_ports
+            for w_port in logical_port.w_sub_ports
+        }
+        return {
+            logical_port.name: (
+                self._find_connected_port(
+                    logical_port, logical_port.connected_to_sub_port_names
+                ),
+                self._find_connected_port(
+                    logical_port, logical_port.connected_from_sub_port_names
+                ),
+                self._find_connected_sub_ports(logical_port, w_ports_map),
+            )
+            for logical_port in self.logical_ports
+        }
+
+    def _get_connections(self, logical_port):
+        if self._connections_index is None:
+            self._connections_index = self._build_connections_index()
+        return self._connections_index[logical_port.name]
+
     def get_connected_to_port(self, logical_port):
         """Return a port that connected to given.
 
         :type logical_port: LogicalPort
         :rtype: LogicalPort
         """
-        connected_to_ports = map(
-            self.get_by_sub_port_name, logical_port.connected_to_sub_port_names
-        )
-        if connected_to_ports:
-            logical_port.verify_connected_ports(connected_to_ports)
-            return connected_to_ports[0]
+        (connected_to_port, error), _, _ = self._get_connections(logical_port)
+        if error is not None:
+            raise error
+        return connected_to_port
 
     def get_connected_from_port(self, logical_port):
         """Return a port from which the logical port connected.
@@ -477,12 +580,20 @@ class PortTable(object):
         :type logical_port: LogicalPort
         :rtype: LogicalPort
         """
-        connected_from_ports = map(
-            self.get_by_sub_port_name, logical_port.connected_from_sub_port_names
-        )
-        if connected_from_ports:
-            logical_port.verify_connected_ports(connected_from_ports)
-            return connected_from_ports[0]
+        _, (connected_from_port, error), _ = self._get_connections(logical_port)
+        if error is not None:
+            raise error
+        return connected_from_port
+
+    def get_connected_sub_ports(self, src_logic_port, dst_logic_port):
+        """Return set with E sub ports of src connected to W sub ports of dst.
+
+        :type src_logic_port: LogicalPort
+        :type dst_logic_port: LogicalPort
+        :rtype: set[tuple[SubPort, SubPort]]
+        """
+        _, _, connected_sub_ports = self._get_connections(src_logic_port)
+        return set(connected_sub_ports.get(dst_logic_port.name, ()))
 
     def is_connected(self, src_logic_port, dst_logic_port, bidi=False):
         """Check that ports are connected.
@@ -0,0 +1,60 @@
+from threading import Lock
+
+
+class PortTableCache(object):
+    """Port tables of the hosts kept between driver commands.
+
+    Port table is valid while the operation count of the host is the same as
+    when the table was read. Our own connect and disconnect commands invalidate it.
+    The output of the port show command is kept, commands change the port
+    tables, so every command builds its own table from it.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._tables = {}  # <host>: (<operation_count>, <port_table_output>)
+
+    def get(self, host, operation_count):
+        """Return cached port table if the host's operation count isn't changed.
+
+        :type host: str
+        :type operation_count: str
+        :return: output of the port show command
+        :rtype: str|None
+        """
+        if operation_count is None:
+            return None
+
+        with self._lock:
+            cached_operation_count, port_table_output = self._tables.get(
+                host, (None, None)
+            )
+
+        if cached_operation_count != operation_count:
+            return None
+        return port_table_output
+
+    def put(self, host, operation_count, port_table_output):
+        """Save port table of the host.
+
+        :type host: str
+        :type operation_count: str
+        :param port_table_output: output of the port show command
+        :type port_table_output: str
+        """
+        if operation_count is None:
+            return
+
+        with self._lock:
+            self._tables[host] = (operation_count, port_table_output)
+
+    def invalidate(self, host=None):
+        """Remove port table of the host or of all hosts.
+
+        :type host: str
+        """
+        with self._lock:
+            if host is None:
+                self._tables.clear()
+            else:
+                self._tables.pop(host, None)
@@ -0,0 +1,134 @@
+import re
+from threading import Lock
+
+
+class PortShowFormat(object):
+    """Format of the rows in the "port show" table.
+
+    :param row_start: matches the first column of the row
+    :param row: matches the whole row
+    """
+
+    def __init__(self, name, row_start, row):
+        self.name = name
+        self.row_start = re.compile(r"\s*" + row_start, re.IGNORECASE)
+        self.row = re.compile(r"\s*" + row, re.IGNORECASE)
+
+    def __repr__(self):
+        return "<PortShowFormat {}>".format(self.name)
+
+
+# E1[1AE1]         Unlocked     Enabled     Connected  2       W2[1AW2]       A1
+PORT_SHOW_V1 = PortShowFormat(
+    "v1",
+    r"[EW]\d+\[\w+?]\s",
+    r"(?P<direction>[EW])(?P<port_id>\d+)"
+    r"\[(?P<port_full_name>\w+?)]\s+"
+    r"(?P<admin_status>(locked|unlocked))\s+"
+    r"(?P<oper_status>(enabled|disabled))\s+"
+    r"(?P<port_status>((dis)?connected)|in process)\s+"
+    r"\d+\s+"
+    r"((?P<conn_to_direction>[EW])(?P<conn_to_port_id>\d+)"
+    r"\[\w+])?\s+"
+    r"(?P<logical_name>[ABQPXY]\d+)",
+)
+# 1AE1             Unlocked     Enabled     Connected  17      W2[1AW2]      E1,A1
+PORT_SHOW_V2 = PortShowFormat(
+    "v2",
+    r"\w+?\s+(locked|unlocked)\s",
+    r"(?P<port_full_name>\w+?)\s+"
+    r"(?P<admin_status>(locked|unlocked))\s+"
+    r"(?P<oper_status>(enabled|disabled))\s+"
+    r"(?P<port_status>((dis)?connected)|in process)\s+"
+    r"\d+\s+"
+    r"((?P<conn_to_direction>[EW])(?P<conn_to_port_id>\d+)"
+    r"\[\w+])?\s+"
+    r"(?P<direction>[EW])(?P<port_id>\d+)\s*,\s*"
+    r"(?P<logical_name>[ABQPXY]\d+)",
+)
+
+
+class PortShowParser(object):
+    """Line oriented parser of the "port show" output.
+
+    Every row is matched with one anchored regex. The table format is detected
+    once per host and the other formats are tried only if nothing is parsed.
+    """
+
+    # a row can be split into a few lines by log lines or broken output
+    MAX_ROW_LINES = 4
+
+    def __init__(self, formats=(PORT_SHOW_V1, PORT_SHOW_V2)):
+        self._formats = formats
+        self._lock = Lock()
+        self._host_formats = {}  # <host>: <PortShowFormat>
+
+    def _get_formats(self, host):
+        with self._lock:
+            host_format = self._host_formats.get(host)
+        if host_format is None:
+            return self._formats
+        return (host_format,) + tuple(
+            format_ for format_ in self._formats if format_ is not host_format
+        )
+
+    @staticmethod
+    def _parse_rows(output, port_show_format):
+        """Parse rows in the output.
+
+        :type output: str
+        :type port_show_format: PortShowFormat
+        :rtype: list[dict[str, str]]
+        """
+        rows = []
+        row_match = port_show_format.row.match
+        row_start_match = port_show_format.row_start.match
+        row_lines = []  # beginning of the row that isn't finished
+
+        for line in output.splitlines():
+            if row_lines:
+                if not line or line.isspace():
+                    continue
+                if (
+                    row_start_match(line)
+                    or len(row_lines) >= PortShowParser.MAX_ROW_LINES
+                ):
+                    row_lines = []
+                else:
+                    row_lines.append(line)
+                    line = " ".join(row_lines)
+
+            match = row_match(line)
+            if match is None:
+                if row_start_match(line) and not row_lines:
+                    row_lines = [line]
+                continue
+
+            rows.append(match.groupdict())
+            row_lines = []
+            line = line[match.end() :]
+            if line and not line.isspace():
+                # broken output can have a few rows in one line
+                match = row_match(line)
+                while match:
+                    rows.append(match.groupdict())
+                    line = line[match.end() :]
+                    match = row_match(line)
+                if row_start_match(line):
+                    row_lines = [line]
+        return rows
+
+    def parse(self, output, host):
+        """Parse rows of the "port show" output.
+
+        :type output: str
+        :type host: str
+        :rtype: list[dict[str, str]]
+        """
+        for port_show_format in self._get_formats(host):
+            rows = self._parse_rows(output, port_show_format)
+            if rows:
+                with self._lock:
+                    self._host_formats[host] = port_show_format
+                return rows
+        return []
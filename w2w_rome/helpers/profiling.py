@@ -0,0 +1,265 @@
+import collections
+import cProfile
+import functools
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+
+from w2w_rome.command_executor import RomeCommandExecutor
+
+REQUEST_MODE = "REQUEST"
+SAMPLE_MODE = "SAMPLE"
+PROFILING_MODES = (REQUEST_MODE, SAMPLE_MODE)
+
+_local = threading.local()
+
+
+class RequestProfile(object):
+    """cProfile stats of the request with the tasks run in other threads.
+
+    A profiler is enabled per thread, so every thread gets its own profiler
+    and their stats are combined on dump.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._profiles = []
+
+    def run(self, func, *args, **kwargs):
+        profile = cProfile.Profile()
+        with self._lock:
+            self._profiles.append(profile)
+        _local.profile = self
+        try:
+            return profile.runcall(func, *args, **kwargs)
+        finally:
+            _local.profile = None
+
+    def dump(self, file_path):
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(file_path)
+
+
+def bind_request_profile(func):
+    """Profile the function run in other thread with the current request.
+
+    :type func: function
+    :rtype: function
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapped(*args, **kwargs):
+        if getattr(_local, "profile", None) is profile:
+            # run in the same thread, it's profiled already
+            return func(*args, **kwargs)
+        return profile.run(func, *args, **kwargs)
+
+    return wrapped
+
+
+class StackSampler(object):
+    """Sample stacks of all threads while driver commands are executed.
+
+    Stacks are counted by the running commands and written as collapsed
+    stacks, the format of the flame graph tools.
+    """
+
+    def __init__(self, interval=0.01):
+        """Stack sampler.
+
+        :param interval: seconds between samples
+        :type interval: float
+        """
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._commands = {}  # <thread ident>: <command name>
+        self._stacks = collections.defaultdict(collections.Counter)
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="RomeSampler")
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def set_command(self, command_name):
+        """Attribute samples to the command while it runs in the thread.
+
+        :param command_name: None when the command ends
+        :type command_name: str|None
+        """
+        thread_id = threading.current_thread().ident
+        with self._lock:
+            if command_name is None:
+                self._commands.pop(thread_id, None)
+            else:
+                self._commands[thread_id] = command_name
+
+    def _run(self):
+        while not self._stopped.wait(self._interval):
+            self.sample()
+
+    def sample(self):
+        with self._lock:
+            if not self._commands:
+                return  # the driver is idle
+            command_name = "+".join(sorted(set(self._commands.values())))
+        own_thread_id = threading.current_thread().ident
+        stacks = self._stacks[command_name]
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_thread_id:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(
+                    "{} ({}:{})".format(
+                        code.co_name, code.co_filename, code.co_firstlineno
+                    )
+                )
+                frame = frame.f_back
+            stacks[";".join(reversed(stack))] += 1
+
+    def get_command_names(self):
+        """Commands that have samples.
+
+        :rtype: list[str]
+        """
+        with self._lock:
+            return sorted(self._stacks)
+
+    def dump(self, command_name, file_path):
+        """Write collapsed stacks of the command.
+
+        :type command_name: str
+        :type file_path: str
+        """
+        with self._lock:
+            stacks = sorted(self._stacks[command_name].items())
+        with open(file_path, "w") as samples_file:
+            for stack, count in stacks:
+                samples_file.write("{} {}\n".format(stack, count))
+
+
+class ProfilingCommandExecutor(RomeCommandExecutor):
+    """Command executor that profiles the driver commands.
+
+    In REQUEST mode every request is profiled with cProfile, in SAMPLE mode
+    stacks of the process are sampled for the window after the start. Results
+    are written to the log folder named by the driver commands.
+    """
+
+    def __init__(
+        self,
+        driver_instance,
+        logger,
+        log_dir,
+        mode=REQUEST_MODE,
+        sample_window=300,
+        sample_interval=0.01,
+    ):
+        """Profiling command executor.
+
+        :type logger: logging.Logger
+        :param log_dir: folder of the results
+        :type log_dir: str
+        :param mode: REQUEST or SAMPLE
+        :type mode: str
+        :param sample_window: seconds of sampling since the start
+        :type sample_window: float
+        :param sample_interval: seconds between samples
+        :type sample_interval: float
+        """
+        super(ProfilingCommandExecutor, self).__init__(driver_instance, logger)
+        mode = mode.upper()
+        if mode not in PROFILING_MODES:
+            raise ValueError(
+                "Profiling mode should be one of {}, not {}".format(
+                    ", ".join(PROFILING_MODES), mode
+                )
+            )
+        self._log_dir = log_dir
+        self._mode = mode
+        self._file_ids = itertools.count(1)
+        self._sampler = None
+        if mode == SAMPLE_MODE:
+            self._sampler = StackSampler(sample_interval).start()
+            timer = threading.Timer(sample_window, self.stop_sampling)
+            timer.daemon = True
+            timer.start()
+        self._logger.info(
+            "Profiling driver commands in {} mode to {}".format(mode, log_dir)
+        )
+
+    def _get_file_path(self, command_name, extension):
+        if not os.path.isdir(self._log_dir):
+            os.makedirs(self._log_dir)
+        return os.path.join(
+            self._log_dir,
+            "{}-{}-{}.{}".format(
+                command_name,
+                time.strftime("%Y%m%d-%H%M%S"),
+                next(self._file_ids),
+                extension,
+            ),
+        )
+
+    @staticmethod
+    def _get_command_name(command_requests):
+        names = []
+        for command_request in command_requests:
+            if command_request.command_name not in names:
+                names.append(command_request.command_name)
+        return "+".join(names) or "Empty"
+
+    def execute_commands(self, command_requests):
+        command_name = self._get_command_name(command_requests)
+        execute = super(ProfilingCommandExecutor, self).execute_commands
+        # stop_sampling can reset the sampler while the command runs
+        sampler = self._sampler
+        if sampler is not None:
+            sampler.set_command(command_name)
+            try:
+                return execute(command_requests)
+            finally:
+                sampler.set_command(None)
+        elif self._mode == SAMPLE_MODE:
+            return execute(command_requests)
+
+        profile = RequestProfile()
+        try:
+            return profile.run(execute, command_requests)
+        finally:
+            try:
+                profile.dump(self._get_file_path(command_name, "prof"))
+            except Exception:
+                self._logger.exception("Failed to write profile")
+
+    def stop_sampling(self):
+        """Stop sampling and write collapsed stacks of every command."""
+        sampler, self._sampler = self._sampler, None
+        if sampler is None:
+            return
+        sampler.stop()
+        for command_name in sampler.get_command_names():
+            try:
+                sampler.dump(command_name, self._get_file_path(command_name, "txt"))
+            except Exception:
+                self._logger.exception("Failed to write samples")
+        self._logger.info("Sampling of driver commands finished")
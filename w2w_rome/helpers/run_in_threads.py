@@ -1,34 +1,284 @@
-from multiprocessing.pool import ThreadPool
+import sys
+import threading
+import time
 
-from w2w_rome.helpers.errors import GotErrorInThreads
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
+from Queue import Queue
 
+from w2w_rome.helpers.errors import (
+    GotErrorInThreads,
+    HostTimeoutError,
+    TaskCancelledError,
+)
+from w2w_rome.helpers.profiling import bind_request_profile
+from w2w_rome.helpers.tracing import get_tracer
 
-def run_in_threads(func, logger, param_map):
+DEFAULT_MAX_WORKERS = 8
+
+
+class _TaskGroup(object):
+    """Tasks that started by one run_in_threads call."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+class _Task(object):
+    def __init__(self, group, func, args, kwargs):
+        self.group = group
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.done = False
+        self.result = None
+        self.exc_info = None
+        self.submitted_at = time.time()
+
+    def finish(self, result=None, exc_info=None):
+        with self.group.condition:
+            self.result = result
+            self.exc_info = exc_info
+            self.done = True
+            self.group.condition.notify_all()
+
+
+class ThreadExecutor(object):
+    """Process-wide pool of threads that run tasks on the hosts.
+
+    Threads are started once and reused by all driver commands.
+    """
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self._max_workers = max_workers
+        self._queue = Queue()
+        self._workers = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._metrics = {
+            "tasks_completed": 0,
+            "tasks_failed": 0,
+            "tasks_cancelled": 0,
+            "wait_time_total": 0.0,
+            "wait_time_max": 0.0,
+            "run_time_total": 0.0,
+            "run_time_max": 0.0,
+        }
+
+    def _start_workers(self):
+        with self._lock:
+            while len(self._workers) < self._max_workers:
+                worker = threading.Thread(
+                    target=self._work,
+                    name="RomeWorker-{}".format(len(self._workers)),
+                )
+                worker.daemon = True
+                worker.start()
+                self._workers.append(worker)
+
+    def _update_metrics(self, status, wait_time, run_time=0.0):
+        with self._lock:
+            self._metrics["tasks_{}".format(status)] += 1
+            self._metrics["wait_time_total"] += wait_time
+            self._metrics["wait_time_max"] = max(
+                self._metrics["wait_time_max"], wait_time
+            )
+            self._metrics["run_time_total"] += run_time
+            self._metrics["run_time_max"] = max(self._metrics["run_time_max"], run_time)
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            started_at = time.time()
+            wait_time = started_at - task.submitted_at
+            if task.group.cancelled.is_set():
+                self._update_metrics("cancelled", wait_time)
+                try:
+                    raise TaskCancelledError("Task is cancelled before start")
+                except TaskCancelledError:
+                    task.finish(exc_info=sys.exc_info())
+                continue
+
+            self._local.task = task
+            try:
+                result = task.func(*task.args, **task.kwargs)
+            except TaskCancelledError:
+                self._update_metrics("cancelled", wait_time, time.time() - started_at)
+                task.finish(exc_info=sys.exc_info())
+            except BaseException:
+                # the caller waits for the task, it's finished on any error
+                self._update_metrics("failed", wait_time, time.time() - started_at)
+                task.finish(exc_info=sys.exc_info())
+            else:
+                self._update_metrics("completed", wait_time, time.time() - started_at)
+                task.finish(result)
+            finally:
+                self._local.task = None
+
+    def submit(self, group, func, args, kwargs):
+        """Add task to the queue.
+
+        :type group: _TaskGroup
+        :rtype: _Task
+        """
+        self._start_workers()
+        task = _Task(group, func, args, kwargs)
+        self._queue.put(task)
+        return task
+
+    @property
+    def current_task(self):
+        """Task that is run in the current thread.
+
+        :rtype: _Task|None
+        """
+        return getattr(self._local, "task", None)
+
+    def get_metrics(self):
+        """Get queue depth and latencies of the tasks.
+
+        :rtype: dict[str, int|float]
+        """
+        with self._lock:
+            metrics = dict(self._metrics)
+            metrics["workers"] = len(self._workers)
+        metrics["queue_depth"] = self._queue.qsize()
+        return metrics
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """Get process-wide executor.
+
+    :rtype: ThreadExecutor
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            max_workers = RuntimeConfiguration().read_key(
+                "THREADS.MAX_WORKERS", DEFAULT_MAX_WORKERS
+            )
+            _executor = ThreadExecutor(max_workers)
+    return _executor
+
+
+def check_cancelled():
+    """Raise an error if other host in run_in_threads failed.
+
+    Long running functions call it to stop as soon as possible.
+    """
+    task = get_executor().current_task
+    if task is not None and task.group.cancelled.is_set():
+        raise TaskCancelledError("Task is cancelled, got error on other host")
+
+
+def _bind_host(func, cli_service):
+    # spans of the host in the worker thread are nested in the caller's span
+    # and the worker is profiled with the caller's request
+    return get_tracer().bind(
+        bind_request_profile(func), "host", "thread", host=cli_service.session.host
+    )
+
+
+def _run_sequentially(func, param_map):
+    tasks = {}
+    group = _TaskGroup()
+    for cli_service, (args, kwargs) in param_map.items():
+        task = _Task(group, func, args, kwargs)
+        try:
+            task.finish(_bind_host(func, cli_service)(*args, **kwargs))
+        except Exception:
+            task.finish(exc_info=sys.exc_info())
+        tasks[cli_service] = task
+    return tasks
+
+
+def _wait_tasks(tasks, group, timeout):
+    """Wait for tasks, cancel other tasks when one of them failed."""
+    end_time = time.time() + timeout if timeout else None
+    with group.condition:
+        while not all(task.done for task in tasks):
+            if any(task.exc_info for task in tasks if task.done):
+                # fail fast, other tasks don't start or stop at the next check
+                group.cancel()
+            wait_time = 1.0
+            if end_time is not None:
+                wait_time = min(wait_time, end_time - time.time())
+                if wait_time <= 0:
+                    break
+            group.condition.wait(wait_time)
+
+
+def _close_session(session, logger):
+    """Close the session that is still used by the timed out task.
+
+    The pool doesn't take back inactive sessions, so the next command opens
+    a new session and the task fails on the closed one.
+    """
+    session.set_active(False)
+    try:
+        session.disconnect()
+    except Exception:
+        logger.debug("Failed to close the session to {}".format(session.host))
+
+
+def run_in_threads(func, logger, param_map, timeout=None):
     """Run function in the threads.
 
     :type func: function
     :type logger: logging.Logger
     :param param_map: cli_service: [args_list, kwargs_dict]
     :type param_map: dict[cloudshell.cli.cli_service_impl.CliServiceImpl, list[list, dict]]  # noqa: E501
+    :param timeout: deadline for every host in seconds, THREADS.HOST_TIMEOUT from
+        the runtime config by default, without a deadline if it isn't set
+    :type timeout: float
     :return: dict with cli_service: result
     :rtype: dict[cloudshell.cli.cli_service_impl.CliServiceImpl, str]
     """
-    pool = ThreadPool(processes=len(param_map))
-    async_results = {
-        cli_service: pool.apply_async(func, args=args, kwds=kwargs)
-        for cli_service, (args, kwargs) in param_map.items()
-    }
+    if timeout is None:
+        timeout = RuntimeConfiguration().read_key("THREADS.HOST_TIMEOUT")
+    executor = get_executor()
+    if executor.current_task is not None:
+        # don't wait for the threads of the pool from the pool's thread
+        tasks_map = _run_sequentially(func, param_map)
+    else:
+        group = _TaskGroup()
+        tasks_map = {
+            cli_service: executor.submit(
+                group, _bind_host(func, cli_service), args, kwargs
+            )
+            for cli_service, (args, kwargs) in param_map.items()
+        }
+        _wait_tasks(tasks_map.values(), group, timeout)
+        group.cancel()
 
     errors = []
     results_map = {}
-    for cli_service, async_result in async_results.items():
-        try:
-            results_map[cli_service] = async_result.get()
-        except Exception as e:
-            errors.append(e)
-            logger.exception(
-                "Got exception on the host {}".format(cli_service.session.host)
+    for cli_service, task in tasks_map.items():
+        host = cli_service.session.host
+        if not task.done:
+            errors.append(HostTimeoutError(host))
+            logger.error(
+                "Didn't get result from the host {} in {}sec".format(host, timeout)
+            )
+            _close_session(cli_service.session, logger)
+        elif task.exc_info is None:
+            results_map[cli_service] = task.result
+        elif issubclass(task.exc_info[0], TaskCancelledError):
+            errors.append(task.exc_info[1])
+            logger.debug("Task is cancelled on the host {}".format(host))
+        else:
+            errors.append(task.exc_info[1])
+            logger.error(
+                "Got exception on the host {}".format(host), exc_info=task.exc_info
             )
+    logger.debug("Threads metrics: {}".format(executor.get_metrics()))
 
     if errors:
         raise GotErrorInThreads("Got exception on the host, look in the logs")
@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+from collections import defaultdict
+from threading import Lock
+
+NOT_USED_STATE_ID = "-1"
+
+
+def _hash_connections(connections):
+    return hashlib.sha1("\n".join(sorted(connections))).hexdigest()[:16]
+
+
+def get_mapping_hashes(port_table):
+    """Hashes of the connections between sub ports of every host.
+
+    :type port_table: w2w_rome.helpers.port_entity.PortTable
+    :return: {<host>: <mapping_hash>}
+    :rtype: dict[str, str]
+    """
+    connections = defaultdict(list)
+    for logical_port in port_table:
+        for rome_port in logical_port:
+            for sub_port in (rome_port.e_port, rome_port.w_port):
+                if sub_port is None:
+                    continue
+                host_connections = connections[sub_port.port_resource]
+                if sub_port.connected:
+                    host_connections.append(
+                        "{}/{}>{}".format(
+                            sub_port.port_resource,
+                            sub_port.sub_port_name,
+                            sub_port.connected_to_sub_port_name,
+                        )
+                    )
+    return {
+        host: _hash_connections(host_connections)
+        for host, host_connections in connections.items()
+    }
+
+
+def get_mapping_hash(port_table):
+    """Hash of the connections between sub ports of all hosts.
+
+    :type port_table: w2w_rome.helpers.port_entity.PortTable
+    :rtype: str
+    """
+    return _hash_connections(
+        "{}:{}".format(host, mapping_hash)
+        for host, mapping_hash in get_mapping_hashes(port_table).items()
+    )
+
+
+class StateIdTracker(object):
+    """State IDs that CloudShell set for the resources.
+
+    The state ID is returned to CloudShell while the device isn't changed
+    since it was set. The device is unchanged if its operation counts are the
+    same or the connections between ports are the same. Connections made by the
+    driver don't change the state, CloudShell knows about them, so the expected
+    connections are updated with them.
+
+    States are kept per host, the state ID of the resource with two hosts is
+    set for both of them.
+    """
+
+    def __init__(self, file_path=None):
+        """State ID tracker.
+
+        :param file_path: JSON file to keep state IDs between driver restarts
+        :type file_path: str
+        """
+        self._file_path = file_path
+        self._lock = Lock()
+        # <host>: {state_id, operation_count, mapping_hash}
+        self._records = self._load()
+
+    def _load(self):
+        if not self._file_path or not os.path.isfile(self._file_path):
+            return {}
+        try:
+            with open(self._file_path) as state_file:
+                records = json.load(state_file)
+        except (IOError, ValueError):
+            return {}
+        # records of the previous versions are skipped
+        return {
+            host: record
+            for host, record in records.items()
+            if isinstance(record, dict) and "operation_count" in record
+        }
+
+    def _save(self):
+        if not self._file_path:
+            return
+        tmp_path = self._file_path + ".tmp"
+        with open(tmp_path, "w") as state_file:
+            json.dump(self._records, state_file, indent=2, sort_keys=True)
+        if os.path.exists(self._file_path):
+            os.remove(self._file_path)
+        os.rename(tmp_path, self._file_path)
+
+    def _get_records(self, hosts):
+        """Records of the hosts if they have the same state ID, called locked.
+
+        :type hosts: list[str]
+        :rtype: list[dict]|None
+        """
+        records = [self._records.get(host) for host in hosts]
+        if None in records or len({record["state_id"] for record in records}) != 1:
+            return None
+        return records
+
+    def is_unchanged(self, hosts, operation_counts):
+        """Check that the operation counts are the same as when state ID was set.
+
+        :type hosts: list[str]
+        :type operation_counts: list[str]
+        :rtype: bool
+        """
+        return self._get_unchanged_state_id(hosts, operation_counts) is not None
+
+    def _get_unchanged_state_id(self, hosts, operation_counts):
+        if None in operation_counts:
+            return None
+        with self._lock:
+            records = self._get_records(hosts)
+            if records is None or any(
+                record["operation_count"] != operation_count
+                for record, operation_count in zip(records, operation_counts)
+            ):
+                return None
+            return records[0]["state_id"]
+
+    def get_state_id(self, hosts, operation_counts, get_port_table):
+        """Get state ID of the resource.
+
+        :param hosts: hosts of the resource
+        :type hosts: list[str]
+        :param operation_counts: operation counts of the hosts
+        :type operation_counts: list[str]
+        :param get_port_table: reads port table if operation counts are changed
+        :type get_port_table: function
+        :rtype: str
+        """
+        if None in operation_counts:
+            return NOT_USED_STATE_ID
+        state_id = self._get_unchanged_state_id(hosts, operation_counts)
+        if state_id is not None:
+            return state_id
+
+        port_table = get_port_table()
+        mapping_hashes = get_mapping_hashes(port_table)
+        with self._lock:
+            records = self._get_records(hosts)
+            if records is not None and all(
+                record["mapping_hash"] == mapping_hashes.get(host)
+                for host, record in zip(hosts, records)
+            ):
+                for record, operation_count in zip(records, operation_counts):
+                    record["operation_count"] = operation_count
+                self._save()
+                return records[0]["state_id"]
+
+        return "{}-{}".format(".".join(operation_counts), get_mapping_hash(port_table))
+
+    def set_state_id(self, hosts, state_id, operation_counts, port_table):
+        """Remember state ID and the state of the device.
+
+        :type hosts: list[str]
+        :type state_id: str
+        :type operation_counts: list[str]
+        :type port_table: w2w_rome.helpers.port_entity.PortTable
+        """
+        mapping_hashes = get_mapping_hashes(port_table)
+        with self._lock:
+            for host, operation_count in zip(hosts, operation_counts):
+                self._records[host] = {
+                    "state_id": state_id,
+                    "operation_count": operation_count,
+                    "mapping_hash": mapping_hashes.get(host),
+                }
+            self._save()
+
+    def add_own_changes(self, mapping_hashes, port_table):
+        """Driver changed connections, CloudShell knows about it.
+
+        The connections after the change are expected on every host that
+        wasn't changed by others before.
+        :param mapping_hashes: mapping hashes of the hosts before the change
+        :type mapping_hashes: dict[str, str]
+        :param port_table: port table read after the change
+        :type port_table: w2w_rome.helpers.port_entity.PortTable
+        """
+        new_mapping_hashes = get_mapping_hashes(port_table)
+        with self._lock:
+            changed = False
+            for host, mapping_hash in mapping_hashes.items():
+                record = self._records.get(host)
+                if record is not None and record["mapping_hash"] == mapping_hash:
+                    record["mapping_hash"] = new_mapping_hashes.get(host)
+                    changed = True
+            if changed:
+                self._save()
@@ -0,0 +1,195 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from cloudshell.layer_one.core.helper.runtime_configuration import RuntimeConfiguration
+
+
+def get_log_dir():
+    """Folder of the driver's logs.
+
+    LOG_PATH is set by the driver's main for the command loggers.
+    :rtype: str
+    """
+    log_path = os.environ.get("LOG_PATH") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "..",
+        "Logs",
+    )
+    return os.path.join(log_path, "w2w_rome")
+
+
+class Tracer(object):
+    """Write nested spans of the driver commands as Chrome trace events.
+
+    Spans are written when they end as complete events, the file is a JSON
+    array without the closing bracket that the trace viewers accept. Spans of
+    the task in other thread keep the span that started the task as parent.
+    """
+
+    def __init__(self, file_path=None):
+        """Tracer.
+
+        :param file_path: nothing is written if not set
+        :type file_path: str
+        """
+        self.file_path = file_path
+        self.enabled = file_path is not None
+        self._lock = threading.Lock()
+        self._file = None
+        self._local = threading.local()
+        self._span_ids = itertools.count(1)
+        self._named_threads = set()
+        self._pid = os.getpid()
+
+    def _get_stack(self):
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def current_span_id(self):
+        """ID of the span in the current thread.
+
+        :rtype: int|None
+        """
+        stack = self._get_stack()
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name, category="driver", parent_id=None, **args):
+        """Trace the block.
+
+        :type name: str
+        :type category: str
+        :param parent_id: the current span of the thread if not set
+        :type parent_id: int
+        :param args: shown with the span, e.g. the host
+        """
+        if not self.enabled:
+            yield
+            return
+        stack = self._get_stack()
+        if parent_id is None and stack:
+            parent_id = stack[-1]
+        span_id = next(self._span_ids)
+        stack.append(span_id)
+        start_time = time.time()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            end_time = time.time()
+            stack.pop()
+            args["span_id"] = span_id
+            args["parent_id"] = parent_id
+            self._write_event(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": int(start_time * 1000000),
+                    "dur": int((end_time - start_time) * 1000000),
+                    "pid": self._pid,
+                    "tid": threading.current_thread().ident,
+                    "args": args,
+                }
+            )
+
+    def bind(self, func, name, category="driver", **args):
+        """Run the function in the span with the current span as parent.
+
+        Used for the functions that run in other threads.
+        :type func: function
+        :type name: str
+        :type category: str
+        :rtype: function
+        """
+        if not self.enabled:
+            return func
+        parent_id = self.current_span_id()
+
+        @functools.wraps(func)
+        def wrapped(*func_args, **func_kwargs):
+            with self.span(name, category, parent_id, **args):
+                return func(*func_args, **func_kwargs)
+
+        return wrapped
+
+    def _write_event(self, event):
+        thread = threading.current_thread()
+        with self._lock:
+            if self._file is None:
+                dir_path = os.path.dirname(self.file_path)
+                if dir_path and not os.path.isdir(dir_path):
+                    os.makedirs(dir_path)
+                self._file = open(self.file_path, "w")
+                self._file.write("[\n")
+            if thread.ident not in self._named_threads:
+                self._named_threads.add(thread.ident)
+                self._write_line(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": self._pid,
+                        "tid": thread.ident,
+                        "args": {"name": thread.name},
+                    }
+                )
+            self._write_line(event)
+            self._file.flush()
+
+    def _write_line(self, event):
+        self._file.write(json.dumps(event, default=str) + ",\n")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Get process-wide tracer, disabled if TRACING.ENABLED isn't set.
+
+    :rtype: Tracer
+    """
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                runtime_config = RuntimeConfiguration()
+                file_path = None
+                if runtime_config.read_key("TRACING.ENABLED", False):
+                    file_path = os.path.join(
+                        get_log_dir(),
+                        time.strftime(
+                            runtime_config.read_key(
+                                "TRACING.FILE", "w2w_rome_trace-%Y%m%d-%H%M%S.json"
+                            )
+                        ),
+                    )
+                _tracer = Tracer(file_path)
+    return _tracer
+
+
+def traced(func):
+    """Trace calls of the method named by its class."""
+
+    @functools.wraps(func)
+    def wrapped(self, *args, **kwargs):
+        name = "{}.{}".format(type(self).__name__, func.__name__)
+        with get_tracer().span(name, "action"):
+            return func(self, *args, **kwargs)
+
+    return wrapped